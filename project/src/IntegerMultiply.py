@@ -0,0 +1,151 @@
+from math import ceil
+from numpy import ndarray, dot, float64, int64, integer, issubdtype, result_type, zeros
+
+FLOAT_MANTISSA_BITS = 53
+"""Integers with magnitude up to 2 ** 53 are exactly representable in float64"""
+
+INTEGER_BITS = 63
+"""Largest magnitude (in bits) of an exact int64 result"""
+
+MAX_PASSES = 16
+"""Largest number of float64 products (i.e. bit-slice pairs) worth computing before falling back to integer dot"""
+
+MAX_MODULUS = 1 << 31
+"""Moduli must be below 2 ** 31, so the product of 2 residues fits in int64"""
+
+def magnitude(matrix: ndarray) -> int:
+    """
+    Largest absolute value in matrix, as a Python int (i.e. no overflow for the most negative int64)
+
+    Args:
+        matrix (ndarray): Integer matrix
+
+    Returns:
+        int: Largest absolute value in matrix (0 if matrix is empty)
+    """
+    return max(-int(matrix.min()), int(matrix.max())) if matrix.size else 0
+
+def bit_slices(matrix: ndarray, bits: int, count: int) -> list[ndarray]:
+    """
+    Split integer matrix into count float64 slices of bits bits each, such that matrix = sum(slice * 2 ** (bits * i));
+    all slices but the last are non-negative, and every slice has magnitude at most 2 ** bits
+
+    Args:
+        matrix (ndarray): Integer matrix
+        bits (int): Number of bits per slice
+        count (int): Number of slices
+
+    Returns:
+        list[ndarray]: Slices, least significant first
+    """
+    if count == 1: return [matrix.astype(float64)]
+
+    mask = (1 << bits) - 1
+    return [((matrix >> (bits * i)) & mask).astype(float64) for i in range(count - 1)] + [(matrix >> (bits * (count - 1))).astype(float64)]
+
+def slice_plan(k: int, max_a: int, max_b: int) -> tuple[int, int, int, int] | None:
+    """
+    Choose how to bit-slice Matrix A and Matrix B so each float64 product is exact (i.e. k * 2 ** bits_a * 2 ** bits_b <= 2 ** 53)
+
+    Args:
+        k (int): Inner dimension
+        max_a (int): Largest absolute value in Matrix A
+        max_b (int): Largest absolute value in Matrix B
+
+    Returns:
+        tuple[int, int, int, int] | None: Bits per slice and number of slices of Matrix A, then of Matrix B; None if slicing is not worthwhile
+    """
+    budget = FLOAT_MANTISSA_BITS - (k - 1).bit_length()
+    if budget < 2: return None
+
+    bits_a, bits_b = max_a.bit_length(), max_b.bit_length()
+
+    # Keep smaller operand whole if possible, and slice only the larger one
+    if min(bits_a, bits_b) < budget:
+        if bits_a <= bits_b: slice_a, slice_b = bits_a, budget - bits_a
+        else: slice_a, slice_b = budget - bits_b, bits_b
+
+    # ...otherwise, slice both evenly
+    else: slice_a, slice_b = budget // 2, budget - budget // 2
+
+    count_a, count_b = max(1, ceil(bits_a / max(slice_a, 1))), max(1, ceil(bits_b / max(slice_b, 1)))
+    if count_a * count_b > MAX_PASSES: return None
+
+    return slice_a, count_a, slice_b, count_b
+
+def integer_dot(matrix_a: ndarray, matrix_b: ndarray) -> ndarray:
+    """
+    Exact product of integer matrices through float64 BLAS (numpy.dot on integers never uses BLAS);
+    uses a single float64 product when value bounds prove it exact, bit-slices the operands when they don't,
+    and falls back to integer numpy.dot when neither is safe (or inputs aren't integers)
+
+    Args:
+        matrix_a (ndarray): Matrix A
+        matrix_b (ndarray): Matrix B
+
+    Returns:
+        ndarray: Product of Matrix A and Matrix B
+    """
+    product_dtype = result_type(matrix_a.dtype, matrix_b.dtype)
+    k = matrix_a.shape[-1]
+
+    if not issubdtype(product_dtype, integer) or k == 0: return dot(matrix_a, matrix_b)
+
+    max_a, max_b = magnitude(matrix_a), magnitude(matrix_b)
+
+    # Fall back to integer dot if the exact result doesn't fit in the integer dtype anyway (i.e. it wraps around, as numpy.dot would)
+    if k * max_a * max_b >= 1 << min(INTEGER_BITS, product_dtype.itemsize * 8 - 1): return dot(matrix_a, matrix_b)
+
+    # Every partial sum is an integer below 2 ** 53, so a single float64 product is exact
+    if k * max_a * max_b <= 1 << FLOAT_MANTISSA_BITS:
+        return dot(matrix_a.astype(float64), matrix_b.astype(float64)).astype(product_dtype)
+
+    # Fall back to integer dot if slicing needs too many passes
+    plan = slice_plan(k, max_a, max_b)
+    if plan is None: return dot(matrix_a, matrix_b)
+
+    slice_a, count_a, slice_b, count_b = plan
+    slices_a, slices_b = bit_slices(matrix_a, slice_a, count_a), bit_slices(matrix_b, slice_b, count_b)
+
+    # Recombine exact partial products (wrap-around of intermediate sums cancels out, since the final result fits)
+    product = None
+    for i, a in enumerate(slices_a):
+        for j, b in enumerate(slices_b):
+            partial = dot(a, b).astype(product_dtype) << (slice_a * i + slice_b * j)
+            if product is None: product = partial
+            else: product += partial
+
+    return product
+
+def modular_dot(matrix_a: ndarray, matrix_b: ndarray, modulus: int) -> ndarray:
+    """
+    Exact product of integer matrices modulo modulus; splits Matrix A's residues into limbs narrow enough
+    that each limb's product fits in int64 (i.e. k * 2 ** bits * largest residue of Matrix B < 2 ** 63), then recombines them modulo modulus
+
+    Args:
+        matrix_a (ndarray): Matrix A
+        matrix_b (ndarray): Matrix B
+        modulus (int): Modulus (below MAX_MODULUS)
+
+    Raises:
+        ValueError: Modulus is not between 2 and MAX_MODULUS
+
+    Returns:
+        ndarray: Product of Matrix A and Matrix B modulo modulus (i.e. each element in [0, modulus))
+    """
+    if not 2 <= modulus < MAX_MODULUS: raise ValueError(f"Modulus ({modulus}) must be between 2 and {MAX_MODULUS - 1}")
+
+    residues_a, residues_b = matrix_a.astype(int64) % modulus, matrix_b.astype(int64) % modulus
+    product = zeros((residues_a.shape[0], residues_b.shape[-1]), dtype = int64)
+
+    # Widest limb whose product with Matrix B's residues can't overflow (i.e. small, non-negative Matrix B needs only one limb)
+    bits = max(1, INTEGER_BITS - (residues_a.shape[-1] * magnitude(residues_b)).bit_length())
+    mask = (1 << bits) - 1
+
+    for shift in range(0, (modulus - 1).bit_length(), bits):
+        partial = integer_dot((residues_a >> shift) & mask, residues_b) % modulus
+
+        # Each partial residue times 2 ** shift (mod modulus) is below 2 ** 62
+        product = (product + partial * pow(2, shift, modulus)) % modulus
+
+    return product
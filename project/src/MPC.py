@@ -1,44 +1,124 @@
 from mpyc.runtime import mpc
-from numpy import random, vectorize
+from numpy import ndarray, zeros
+from project.src.Shared import MIN, MAX, LENGTH, generate_matrix
+from project.src.client.Shared import MATRIX_B_WIDTH
 
-MIN = 0                           # Min value in the matrix
-MAX = 5                           # Max value in the matrix
-VALUES_SIZE = 2 ** 8              # Number of bits in secure integers
-SECINT = mpc.SecInt(VALUES_SIZE)  # Secure VALUES_SIZE-bit integer for secret values
+def secure_bit_length(k: int, minimum: int = MIN, maximum: int = MAX) -> int:
+    """
+    Smallest bit length of secure integers that holds every element of a product (i.e. sum of k products of elements in [minimum, maximum]), sign included
+
+    Args:
+        k (int): Inner dimension (i.e. Matrix A's width)
+        minimum (int, optional): Smallest element of Matrix A and Matrix B; defaults to MIN
+        maximum (int, optional): Largest element of Matrix A and Matrix B; defaults to MAX
+
+    Returns:
+        int: Bit length
+    """
+    magnitude = max(abs(minimum), abs(maximum))
+    return max(1, k * magnitude * magnitude).bit_length() + 1
+
+def within_bounds(matrix: ndarray, minimum: int = MIN, maximum: int = MAX) -> bool:
+    """
+    Check every element of matrix lies in [minimum, maximum] (i.e. secure_bit_length's bit length holds its products)
+
+    Args:
+        matrix (ndarray): Matrix
+        minimum (int, optional): Smallest element allowed; defaults to MIN
+        maximum (int, optional): Largest element allowed; defaults to MAX
+
+    Returns:
+        bool: True if every element is within bounds (or matrix is empty), else False
+    """
+    return matrix.size == 0 or (minimum <= matrix.min() and matrix.max() <= maximum)
+
+def share_matrix(secint: type, matrix: ndarray | None, shape: tuple[int, int], sender: int):
+    """
+    Secret-share sender's matrix with every party, as a single secure array (i.e. one bulk message rather than one per element)
+
+    Args:
+        secint (type): Secure integer type
+        matrix (ndarray | None): Matrix (only used by sender; other parties may pass None)
+        shape (tuple[int, int]): Shape of matrix
+        sender (int): Party that owns matrix
+
+    Returns:
+        Secure array of secint
+    """
+    # Parties other than sender only need the shape, to receive their shares into
+    if mpc.pid != sender or matrix is None: matrix = zeros(shape, dtype = int)
+
+    return mpc.input(secint.array(matrix), senders = sender)
 
-@mpc.coroutine
-async def generate_random_secure_matrix(length: int, width: int, senders: int = 0):
+async def secure_multiply(matrix_a: ndarray | None, matrix_b: ndarray | None, sender_a: int = 0, sender_b: int = 0,
+                          minimum: int = MIN, maximum: int = MAX) -> ndarray:
     """
-    Generates a random, encrypted matrix of size length * width
+    Multiply 2 matrices held by (possibly different) parties, without revealing either to the other parties (mpc runtime must be started)
 
     Args:
-        length (int): Length of matrix
-        width (int): Width of matrix
-        senders (int): Number of senders; defaults to 0
-    """
-    U = random.randint(MIN, MAX, size = (length, width), dtype = int)
-    print(f"Pre-encrypted Matrix =\n{U}\n")
-    
-    U = vectorize(lambda a: SECINT(int(a)))(U).tolist()
-    print(f"Encrypted Matrix =\n{U}\n")
-    
-    U = await mpc.transfer(U, senders = senders)
-    return U
-
-async def main():
-    await mpc.start()
-
-    print(f"\nMATRIX A:\n")
-    A = generate_random_secure_matrix(8, 8)
-
-    print(f"MATRIX B:\n")
-    B = generate_random_secure_matrix(8, 2)
-        
-    L = mpc.matrix_prod(A, B)
-    print(f"Matrix A * Matrix B =\n{L}\n")
-    
-    await mpc.shutdown()
+        matrix_a (ndarray | None): Matrix A (only used by sender_a)
+        matrix_b (ndarray | None): Matrix B (only used by sender_b)
+        sender_a (int, optional): Party that owns Matrix A; defaults to 0
+        sender_b (int, optional): Party that owns Matrix B; defaults to 0
+        minimum (int, optional): Smallest element of Matrix A and Matrix B; defaults to MIN
+        maximum (int, optional): Largest element of Matrix A and Matrix B; defaults to MAX
+
+    Raises:
+        ValueError: Matrix A's width doesn't match Matrix B's length, or either matrix has an element outside [minimum, maximum]
+
+    Returns:
+        ndarray: Product of Matrix A and Matrix B (revealed to every party)
+    """
+    # Shapes are public, so owners send them in the clear, along with whether their matrix is within bounds
+    # (i.e. every party refuses together, rather than silently wrapping around a product too wide for secint)
+    shape_a, bounded_a = await mpc.transfer((matrix_a.shape, within_bounds(matrix_a, minimum, maximum)) if mpc.pid == sender_a else None, senders = sender_a)
+    shape_b, bounded_b = await mpc.transfer((matrix_b.shape, within_bounds(matrix_b, minimum, maximum)) if mpc.pid == sender_b else None, senders = sender_b)
+    if shape_a[1] != shape_b[0]: raise ValueError(f"Matrix A's width ({shape_a[1]}) must equal Matrix B's length ({shape_b[0]})")
+
+    for name, bounded in [("Matrix A", bounded_a), ("Matrix B", bounded_b)]:
+        if not bounded: raise ValueError(f"{name} has an element outside [{minimum}, {maximum}]")
+
+    # Secure integers just wide enough for the product, derived from the bounds and inner dimension
+    secint = mpc.SecInt(secure_bit_length(shape_a[1], minimum, maximum))
+
+    secure_a, secure_b = share_matrix(secint, matrix_a, shape_a, sender_a), share_matrix(secint, matrix_b, shape_b, sender_b)
+
+    return await mpc.output(secure_a @ secure_b)
+
+def multiply(matrix_a: ndarray | None, matrix_b: ndarray | None, sender_a: int = 0, sender_b: int = 0,
+             minimum: int = MIN, maximum: int = MAX) -> ndarray:
+    """
+    Start mpc runtime, securely multiply 2 matrices, then shut runtime down (e.g. for clients, which aren't coroutines)
+
+    Args:
+        matrix_a (ndarray | None): Matrix A (only used by sender_a)
+        matrix_b (ndarray | None): Matrix B (only used by sender_b)
+        sender_a (int, optional): Party that owns Matrix A; defaults to 0
+        sender_b (int, optional): Party that owns Matrix B; defaults to 0
+        minimum (int, optional): Smallest element of Matrix A and Matrix B; defaults to MIN
+        maximum (int, optional): Largest element of Matrix A and Matrix B; defaults to MAX
+
+    Raises:
+        ValueError: Matrix A's width doesn't match Matrix B's length, or either matrix has an element outside [minimum, maximum]
+
+    Returns:
+        ndarray: Product of Matrix A and Matrix B
+    """
+    async def run() -> ndarray:
+        await mpc.start()
+        product = await secure_multiply(matrix_a, matrix_b, sender_a, sender_b, minimum, maximum)
+        await mpc.shutdown()
+
+        return product
+
+    return mpc.run(run())
 
 if __name__ == "__main__":
-    mpc.run(main())
+    # Generate example matrices for testing
+    matrix_a = generate_matrix(LENGTH, LENGTH)
+    matrix_b = generate_matrix(LENGTH, MATRIX_B_WIDTH)
+
+    print(f"Matrix A: {matrix_a}\n")
+    print(f"Matrix B: {matrix_b}\n")
 
+    print(f"Matrix A * Matrix B =\n{multiply(matrix_a, matrix_b)}\n")
@@ -0,0 +1,95 @@
+from sqlite3 import connect, Connection
+from contextlib import closing
+from time import time
+from project.src.Shared import Address, SERVER_REGISTRY_PATH
+
+HEARTBEAT_INTERVAL = 5
+"""Time (seconds) between a server's heartbeats"""
+
+SERVER_TTL = 3 * HEARTBEAT_INTERVAL
+"""Time (seconds) since its last heartbeat after which a server is considered gone (i.e. several missed heartbeats)"""
+
+LOCK_TIMEOUT = 10
+"""Time (seconds) to wait for another process to release the registry"""
+
+class ServerRegistry():
+    def __init__(self, filepath: str = SERVER_REGISTRY_PATH, ttl: float = SERVER_TTL):
+        # Path of SQLite file holding one record per server
+        self._filepath = filepath
+
+        # Time (seconds) since its last heartbeat after which a server's record expires
+        self._ttl = ttl
+
+        with closing(self._connect()) as connection, connection:
+            connection.execute("""CREATE TABLE IF NOT EXISTS servers (ip TEXT NOT NULL, port INTEGER NOT NULL, cpu INTEGER NOT NULL, ram REAL NOT NULL,
+                                  os TEXT NOT NULL, heartbeat REAL NOT NULL, PRIMARY KEY (ip, port))""")
+            connection.execute("CREATE INDEX IF NOT EXISTS servers_heartbeat ON servers (heartbeat)")
+
+    def _connect(self) -> Connection:
+        """
+        Open a connection to the registry (i.e. one per call, so servers' heartbeat threads and clients never share one)
+
+        Returns:
+            Connection: SQLite connection
+        """
+        connection = connect(self._filepath, timeout = LOCK_TIMEOUT)
+
+        # Let clients read while a server writes its heartbeat
+        connection.execute("PRAGMA journal_mode = WAL")
+
+        return connection
+
+    def register(self, address: Address, cpu: int, ram: float, os: str) -> None:
+        """
+        Add server's record, or replace it if address was already registered (e.g. server restarted on the same port)
+
+        Args:
+            address (Address): Server's address
+            cpu (int): Number of cores
+            ram (float): Available RAM (GB)
+            os (str): Operating system
+        """
+        with closing(self._connect()) as connection, connection:
+            connection.execute("""INSERT INTO servers VALUES (?, ?, ?, ?, ?, ?)
+                                  ON CONFLICT (ip, port) DO UPDATE SET cpu = excluded.cpu, ram = excluded.ram, os = excluded.os, heartbeat = excluded.heartbeat""",
+                               (address.ip, address.port, cpu, ram, os, time()))
+
+    def heartbeat(self, address: Address, ram: float) -> bool:
+        """
+        Refresh server's record with its current available RAM
+
+        Args:
+            address (Address): Server's address
+            ram (float): Available RAM (GB)
+
+        Returns:
+            bool: True if server's record was refreshed, else False (i.e. it expired and must be registered again)
+        """
+        with closing(self._connect()) as connection, connection:
+            return connection.execute("UPDATE servers SET ram = ?, heartbeat = ? WHERE ip = ? AND port = ?",
+                                      (ram, time(), address.ip, address.port)).rowcount > 0
+
+    def unregister(self, address: Address) -> None:
+        """
+        Remove server's record (e.g. server is shutting down)
+
+        Args:
+            address (Address): Server's address
+        """
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM servers WHERE ip = ? AND port = ?", (address.ip, address.port))
+
+    def live_servers(self) -> dict[Address, tuple[int, float]]:
+        """
+        Get servers with a recent heartbeat and their CPU, available RAM, after removing expired records
+
+        Returns:
+            dict[Address, tuple[int, float]]: Dictionary of live servers and their CPU, available RAM
+        """
+        oldest = time() - self._ttl
+
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM servers WHERE heartbeat < ?", (oldest,))
+            rows = connection.execute("SELECT ip, port, cpu, ram FROM servers WHERE heartbeat >= ?", (oldest,)).fetchall()
+
+        return { Address(ip, port): (cpu, ram) for ip, port, cpu, ram in rows }
@@ -1,6 +1,11 @@
 from socket import socket
-from typing import NamedTuple
-from numpy import ndarray, random
+from asyncio import StreamReader, StreamWriter, IncompleteReadError
+from struct import Struct
+from collections.abc import Iterator
+from pickle import loads, dumps, HIGHEST_PROTOCOL
+from hashlib import blake2b
+from typing import Any, NamedTuple
+from numpy import ndarray, dtype, empty, random, uint8
 from os import getcwd, path
 from logging import Logger, shutdown
 from logging.config import fileConfig
@@ -17,21 +22,54 @@ LENGTH = 8
 SIG_FIGS = 5
 """Number of significant figures in timing"""
 
-HORIZONTAL_PARTITIONS = 2
-"""Number of horizontal partitions in matrix"""
-
-VERTICAL_PARTITIONS = 2
-"""Number of vertical partitions in matrix"""
-
 BUFFER = 4096
 """Socket buffer size"""
 
+MAX_BUFFER = 4194304
+"""Largest chunk size requested per recv_into call (i.e. adaptive chunk size never grows beyond 4 MiB)"""
+
 HEADERSIZE = 10
 """Socket header size"""
 
 ACKNOWLEDGEMENT = "ACK"
 """Socket acknowledgement message"""
 
+FRAME_MAGIC = b"QSEC"
+"""Marker at the start of every binary frame"""
+
+FRAME_VERSION = 1
+"""Binary frame format version"""
+
+MAX_DIMENSIONS = 4
+"""Largest number of dimensions an array frame can describe"""
+
+FRAME_HEADER = Struct(f"!4sBBBxq8sB{MAX_DIMENSIONS}q{MAX_DIMENSIONS}qQ")
+"""Fixed frame header (i.e. magic, version, kind, flags, job index, dtype, number of dimensions, shape, strides, payload size)"""
+
+ARRAY_FRAME = 0
+"""Frame kind whose payload is a raw ndarray buffer"""
+
+PICKLE_FRAME = 1
+"""Frame kind whose payload is pickled (i.e. fallback for non-numeric payloads, such as SymPy matrices)"""
+
+REFERENCE_FRAME = 2
+"""Frame kind whose payload is the content hash of an operand already cached by the server (i.e. sent instead of the operand itself)"""
+
+PING_FRAME = 3
+"""Frame kind with no payload, used to check that a server is up and handling messages"""
+
+KEEP_FRAME = 4
+"""Frame kind whose payload is the key a job's result is to be kept under on the server (i.e. sent back instead of the result itself)"""
+
+ACCUMULATE_FRAME = 5
+"""Frame kind whose payload is the key and number of partitions of a tile whose products the server is to sum (i.e. sent back once every product is added)"""
+
+FINAL_FRAME = 0b1
+"""Frame flag marking the last frame of a message"""
+
+DIGEST_SIZE = 16
+"""Size (bytes) of an operand's content hash"""
+
 FILE_DIRECTORY_PATH = path.join(getcwd(), "project", "file")
 """Parent directory path"""
 
@@ -42,7 +80,13 @@ MAX_NUM_FILES = 10
 """Maximum number of log files"""
 
 SERVER_INFO_PATH = path.join(FILE_DIRECTORY_PATH, "server_info", "server_info.txt")
-"""Server info file path"""
+"""Server info file path (i.e. legacy append-only log of server starts)"""
+
+SERVER_REGISTRY_PATH = path.join(FILE_DIRECTORY_PATH, "server_info", "server_registry.db")
+"""Server registry path (i.e. one record per live server, refreshed by heartbeats)"""
+
+STRASSEN_CALIBRATION_PATH = path.join(FILE_DIRECTORY_PATH, "calibration", "strassen.json")
+"""Strassen-Winograd calibration path (i.e. crossovers and timings recorded by project.test.benchmark_strassen)"""
 
 class Address(NamedTuple):
     """
@@ -77,7 +121,7 @@ def send(sock: socket, data: bytes) -> None:
     # Send data packet to socket
     sock.sendall(data_with_header)
 
-def receive(sock: socket) -> bytes:
+def receive(sock: socket) -> bytearray:
     """
     Receive data from socket
 
@@ -85,28 +129,375 @@ def receive(sock: socket) -> bytes:
         sock (socket): Connected socket
 
     Returns:
-        bytes: Received data
+        bytearray: Received data
     """
-    data, new_data, msg_length = b"", True, 0
-    
-    # Receive result from socket
+    # Read header first, then fill a buffer of the exact message size
+    data = bytearray(receive_header(sock))
+    receive_into(sock, memoryview(data))
+
+    return data
+
+def receive_stream(sock: socket, buffer_size: int = MAX_BUFFER) -> Iterator[memoryview]:
+    """
+    Receive data from socket chunk by chunk, as it arrives
+
+    Args:
+        sock (socket): Connected socket
+        buffer_size (int, optional): Size of the reusable chunk buffer; defaults to MAX_BUFFER
+
+    Raises:
+        ConnectionError: Socket was closed part way through
+
+    Yields:
+        Iterator[memoryview]: Received chunk(s); each view is only valid until the next one is requested
+    """
+    remaining = receive_header(sock)
+    view = memoryview(bytearray(min(buffer_size, remaining)))
+
+    while remaining > 0:
+        count = sock.recv_into(view, min(view.nbytes, remaining))
+        if count == 0: raise ConnectionError(f"Socket closed with {remaining} bytes left to receive")
+
+        remaining -= count
+        yield view[:count]
+
+def receive_header(sock: socket) -> int:
+    """
+    Receive message header (i.e. message length) from socket
+
+    Args:
+        sock (socket): Connected socket
+
+    Returns:
+        int: Length of the message that follows
+    """
+    header = bytearray(HEADERSIZE)
+    receive_into(sock, memoryview(header))
+
+    return int(header)
+
+class Reference(NamedTuple):
+    """
+    Tuple defining a reference to an operand by its content hash
+
+    Args:
+        NamedTuple (bytes): Content hash
+    """
+    digest: bytes
+
+class Keep(NamedTuple):
+    """
+    Tuple defining a request to keep a job's result on the server (i.e. cached as an operand of later jobs), or the server's confirmation that it did
+
+    Args:
+        NamedTuple (bytes): Key to cache result under
+    """
+    digest: bytes
+
+class Accumulate(NamedTuple):
+    """
+    Tuple defining a request to add a job's result to the other products of its tile on the server (i.e. only the finished sum is sent back),
+    or the server's confirmation that it did
+
+    Args:
+        NamedTuple (bytes, int): Key of tile, and number of products in it
+    """
+    digest: bytes
+    count: int
+
+class Ping(NamedTuple):
+    """
+    Tuple defining a health check message (i.e. server replies with a ping of its own)
+    """
+
+class FrameHeader(NamedTuple):
+    """
+    Tuple defining a decoded frame header
+
+    Args:
+        NamedTuple (int, int, int, str, tuple[int, ...], tuple[int, ...], int): Kind, flags, job index, dtype, shape, strides, and payload size
+    """
+    kind: int
+    flags: int
+    index: int
+    dtype: str
+    shape: tuple[int, ...]
+    strides: tuple[int, ...]
+    nbytes: int
+
+def pack_frame(index: int, payload: Any, flags: int = 0) -> tuple[bytes, memoryview]:
+    """
+    Build a frame's header and payload buffer without copying array data
+
+    Args:
+        index (int): Job index
+        payload (Any): Payload; ndarrays are sent raw, anything else is pickled
+        flags (int, optional): Frame flags; defaults to 0
+
+    Returns:
+        tuple[bytes, memoryview]: Frame header and payload buffer
+    """
+    # Send pings as a bare header
+    if isinstance(payload, Ping):
+        kind, dtype_str, shape, strides = PING_FRAME, "", (), ()
+        buffer = memoryview(b"")
+
+    # Send references as their content hash alone
+    elif isinstance(payload, Reference):
+        kind, dtype_str, shape, strides = REFERENCE_FRAME, "", (), ()
+        buffer = memoryview(payload.digest)
+
+    # Send keep requests as their key alone
+    elif isinstance(payload, Keep):
+        kind, dtype_str, shape, strides = KEEP_FRAME, "", (), ()
+        buffer = memoryview(payload.digest)
+
+    # Send accumulate requests as their key followed by their number of products
+    elif isinstance(payload, Accumulate):
+        kind, dtype_str, shape, strides = ACCUMULATE_FRAME, "", (), ()
+        buffer = memoryview(payload.digest + payload.count.to_bytes(8, "big"))
+
+    # Send numeric arrays as raw buffers (non-contiguous views, e.g. column partitions, are compacted first)
+    elif isinstance(payload, ndarray) and not payload.dtype.hasobject and payload.ndim <= MAX_DIMENSIONS:
+        if not (payload.flags.c_contiguous or payload.flags.f_contiguous): payload = payload.copy()
+
+        kind, dtype_str, shape, strides = ARRAY_FRAME, payload.dtype.str, payload.shape, payload.strides
+        buffer = memoryview(payload.reshape(-1, order = "A")).cast("B")
+
+    # Fall back to pickle for everything else (e.g. SymPy matrices)
+    else:
+        kind, dtype_str, shape, strides = PICKLE_FRAME, "", (), ()
+        buffer = memoryview(dumps(payload, protocol = HIGHEST_PROTOCOL))
+
+    padding = (0,) * (MAX_DIMENSIONS - len(shape))
+    header = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, kind, flags, index, dtype_str.encode("ascii"),
+                               len(shape), *shape, *padding, *strides, *padding, buffer.nbytes)
+
+    return header, buffer
+
+def content_hash(payload: Any) -> bytes:
+    """
+    Hash payload exactly as it would be framed (i.e. kind, dtype, shape, strides, and raw buffer or pickled bytes)
+
+    Args:
+        payload (Any): Payload (e.g. partition of Matrix B)
+
+    Returns:
+        bytes: Content hash of payload
+    """
+    header, buffer = pack_frame(0, payload)
+
+    digest = blake2b(header, digest_size = DIGEST_SIZE)
+    digest.update(buffer)
+
+    return digest.digest()
+
+def unpack_frame_header(header: bytes | bytearray | memoryview) -> FrameHeader:
+    """
+    Decode and validate a frame header
+
+    Args:
+        header (bytes | bytearray | memoryview): Raw frame header
+
+    Raises:
+        ValueError: Invalid frame marker or unsupported frame version
+
+    Returns:
+        FrameHeader: Decoded frame header
+    """
+    magic, version, kind, flags, index, dtype_str, ndim, *rest = FRAME_HEADER.unpack(header)
+
+    if magic != FRAME_MAGIC: raise ValueError(f"Invalid frame marker {magic!r}")
+    if version != FRAME_VERSION: raise ValueError(f"Unsupported frame version {version}")
+
+    shape, strides, nbytes = tuple(rest[:ndim]), tuple(rest[MAX_DIMENSIONS:MAX_DIMENSIONS + ndim]), rest[-1]
+
+    return FrameHeader(kind, flags, index, dtype_str.rstrip(b"\0").decode("ascii"), shape, strides, nbytes)
+
+def unpack_payload(header: FrameHeader, buffer: Any) -> Any:
+    """
+    Rebuild a frame's payload from its (already received) buffer
+
+    Args:
+        header (FrameHeader): Decoded frame header
+        buffer (Any): Object exposing the received payload bytes
+
+    Returns:
+        Any: Payload (i.e. ndarray viewing buffer, reference, keep or accumulate request, ping, or unpickled object)
+    """
+    if header.kind == ARRAY_FRAME:
+        return ndarray(header.shape, dtype(header.dtype), buffer = buffer, strides = header.strides)
+
+    if header.kind == REFERENCE_FRAME: return Reference(bytes(buffer))
+    if header.kind == KEEP_FRAME: return Keep(bytes(buffer))
+    if header.kind == ACCUMULATE_FRAME: return Accumulate(bytes(buffer[:DIGEST_SIZE]), int.from_bytes(buffer[DIGEST_SIZE:], "big"))
+    if header.kind == PING_FRAME: return Ping()
+
+    return loads(buffer)
+
+def receive_into(sock: socket, view: memoryview) -> int:
+    """
+    Fill view with data from socket, using chunk sizes that adapt to how quickly data arrives
+
+    Args:
+        sock (socket): Connected socket
+        view (memoryview): Writable buffer to fill
+
+    Raises:
+        EOFError: Socket was closed before any data was received
+        ConnectionError: Socket was closed part way through
+
+    Returns:
+        int: Number of bytes received (i.e. size of view)
+    """
+    received, size, chunk = 0, view.nbytes, BUFFER
+
+    while received < size:
+        count = sock.recv_into(view[received:], min(chunk, size - received))
+
+        if count == 0:
+            if received == 0: raise EOFError("Socket closed")
+            raise ConnectionError(f"Socket closed after {received} of {size} bytes")
+
+        received += count
+
+        # Request larger chunks while the socket keeps filling them
+        if count == chunk and chunk < MAX_BUFFER: chunk <<= 1
+
+    return received
+
+def send_frame(sock: socket, index: int, payload: Any, flags: int = 0) -> None:
+    """
+    Send payload to socket as a single binary frame
+
+    Args:
+        sock (socket): Connected socket
+        index (int): Job index
+        payload (Any): Payload; ndarrays are sent raw, anything else is pickled
+        flags (int, optional): Frame flags; defaults to 0
+    """
+    header, buffer = pack_frame(index, payload, flags)
+
+    # Send header, then array buffer directly (i.e. no intermediate bytes object)
+    sock.sendall(header)
+    if buffer.nbytes: sock.sendall(buffer)
+
+def receive_frame(sock: socket) -> tuple[FrameHeader, Any]:
+    """
+    Receive a single binary frame from socket
+
+    Args:
+        sock (socket): Connected socket
+
+    Returns:
+        tuple[FrameHeader, Any]: Frame header and payload
+    """
+    header = bytearray(FRAME_HEADER.size)
+    receive_into(sock, memoryview(header))
+    header = unpack_frame_header(header)
+
+    # Receive payload directly into a preallocated buffer
+    buffer = empty(header.nbytes, dtype = uint8)
+    if header.nbytes:
+        try: receive_into(sock, memoryview(buffer))
+        except EOFError as exception: raise ConnectionError("Socket closed before frame payload") from exception
+
+    return header, unpack_payload(header, buffer)
+
+def send_message(sock: socket, index: int, *payloads: Any) -> None:
+    """
+    Send payload(s) to socket as a message (i.e. one frame per payload, with the last one flagged)
+
+    Args:
+        sock (socket): Connected socket
+        index (int): Job index
+        *payloads (Any): Payload(s) to send
+    """
+    for i, payload in enumerate(payloads):
+        send_frame(sock, index, payload, FINAL_FRAME if i == len(payloads) - 1 else 0)
+
+def receive_message(sock: socket) -> tuple[int, list[Any]]:
+    """
+    Receive a message (i.e. frames up to and including the one flagged as final) from socket
+
+    Args:
+        sock (socket): Connected socket
+
+    Returns:
+        tuple[int, list[Any]]: Job index and payload(s)
+    """
+    payloads = [ ]
+
     while True:
-        packet = sock.recv(BUFFER)
+        header, payload = receive_frame(sock)
+        payloads.append(payload)
+
+        if header.flags & FINAL_FRAME: return header.index, payloads
+
+def send_async(writer: StreamWriter, data: bytes) -> None:
+    """
+    Queue data (with header) on stream; caller is responsible for draining writer
+
+    Args:
+        writer (StreamWriter): Connected stream writer
+        data (bytes): Data to be sent
+    """
+    writer.write(bytes(f"{len(data):<{HEADERSIZE}}", "utf-8") + data)
+
+async def send_message_async(writer: StreamWriter, index: int, *payloads: Any) -> None:
+    """
+    Send payload(s) to stream as a message (i.e. one frame per payload, with the last one flagged)
+
+    Args:
+        writer (StreamWriter): Connected stream writer
+        index (int): Job index
+        *payloads (Any): Payload(s) to send
+    """
+    for i, payload in enumerate(payloads):
+        header, buffer = pack_frame(index, payload, FINAL_FRAME if i == len(payloads) - 1 else 0)
+        writer.write(header)
+        if buffer.nbytes: writer.write(buffer)
+
+        # Wait for buffer to flush before queueing the next (possibly large) frame
+        await writer.drain()
+
+async def receive_frame_async(reader: StreamReader) -> tuple[FrameHeader, Any]:
+    """
+    Receive a single binary frame from stream
+
+    Args:
+        reader (StreamReader): Connected stream reader
 
-        if not packet:
-            break
-        data += packet
+    Raises:
+        EOFError: Stream was closed before a frame started
 
-        # Check if entire message has been received
-        if new_data:
-            msg_length = int(data[:HEADERSIZE])
-            new_data = False
+    Returns:
+        tuple[FrameHeader, Any]: Frame header and payload
+    """
+    try: header = unpack_frame_header(await reader.readexactly(FRAME_HEADER.size))
+    except IncompleteReadError as exception:
+        if not exception.partial: raise EOFError("Stream closed") from exception
+        raise
+
+    return header, unpack_payload(header, await reader.readexactly(header.nbytes))
 
-        if len(data) - HEADERSIZE >= msg_length:
-            break
+async def receive_message_async(reader: StreamReader) -> tuple[int, list[Any]]:
+    """
+    Receive a message (i.e. frames up to and including the one flagged as final) from stream
+
+    Args:
+        reader (StreamReader): Connected stream reader
+
+    Returns:
+        tuple[int, list[Any]]: Job index and payload(s)
+    """
+    payloads = [ ]
+
+    while True:
+        header, payload = await receive_frame_async(reader)
+        payloads.append(payload)
 
-    # Remove header from data packet, then return
-    return (data[HEADERSIZE:HEADERSIZE + msg_length])
+        if header.flags & FINAL_FRAME: return header.index, payloads
 
 def timing(end: float, start: float) -> float:
     """
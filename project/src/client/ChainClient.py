@@ -0,0 +1,188 @@
+from numpy import ndarray, result_type
+from threading import Lock
+from typing import Any
+from time import perf_counter
+from logging import getLogger, Logger
+from project.src.client.Shared import get_result, select_servers, print_outcome
+from project.src.ExceptionHandler import handle_exceptions
+from project.src.client.ChainPlanner import ChainPlanner, ChainNode
+from project.src.client.ChainScheduler import ChainScheduler
+from project.src.client.ConnectionPool import ConnectionPool
+from project.src.client.PartitionPlanner import PartitionPlanner
+from project.src.client.ResultAssembler import ResultAssembler
+from project.src.client.Scheduler import WorkerStatistics
+from project.src.client.FreivaldsVerifier import FreivaldsVerifier
+from project.src.Shared import Address, LENGTH, cleanup, create_logger, generate_matrix
+
+CLIENT_LOGGER = getLogger(__name__)
+"""Client logger"""
+
+def validate_chain(matrices: list[ndarray], logger: Logger) -> None:
+    """
+    Ensure matrices form a chain (i.e. at least 2 matrices, each one's width equal to the next one's length)
+
+    Args:
+        matrices (list[ndarray]): Matrices
+        logger (Logger): Logger
+
+    Raises:
+        ValueError: Invalid chain
+    """
+    exception_msg = None
+
+    if len(matrices) < 2: exception_msg = f"Chain must have at least 2 matrices (got {len(matrices)})"
+    elif any(matrix.ndim != 2 for matrix in matrices): exception_msg = "Every matrix in chain must be 2-dimensional"
+
+    else:
+        for i in range(len(matrices) - 1):
+            if matrices[i].shape[1] != matrices[i + 1].shape[0]:
+                exception_msg = f"Width of matrix {i} ({matrices[i].shape[1]}) must equal length of matrix {i + 1} ({matrices[i + 1].shape[0]})"
+                break
+
+    if exception_msg is not None:
+        logger.exception(exception_msg)
+        cleanup(logger)
+        raise ValueError(exception_msg)
+
+class ChainClient():
+    def __init__(self, matrices: list[ndarray], chain_planner: ChainPlanner | None = None, planner: PartitionPlanner | None = None,
+                 verifier: FreivaldsVerifier | None = None):
+        create_logger("client.log")
+        CLIENT_LOGGER.info("Starting Chain Client...\n")
+
+        # Ensure matrices form a chain
+        validate_chain(matrices, CLIENT_LOGGER)
+        self._matrices = matrices
+
+        # Checks the final result (i.e. product of every matrix) without recomputing it; intermediate row bands kept on server(s) are covered by it
+        self._verifier, self._factors = verifier or FreivaldsVerifier(), matrices
+
+        # Server(s) to send jobs to and their CPU, available RAM
+        self._servers: dict[Address, tuple[int, float]] = select_servers(CLIENT_LOGGER)
+        self._server_addresses: list[Address] = list(self._servers)
+        CLIENT_LOGGER.info(f"Sending jobs to {self._server_addresses}\n")
+
+        # Products to compute (i.e. Key = positions of first and last matrix), in an order where each comes after its operands (whole chain last)
+        itemsize = max(matrix.itemsize for matrix in matrices)
+        order = (chain_planner or ChainPlanner()).plan([matrix.shape for matrix in matrices], itemsize, len(self._servers), CLIENT_LOGGER)
+        self._nodes: dict[tuple[int, int], ChainNode] = { (node.first, node.last): node for node in order }
+        self._position: dict[tuple[int, int], int] = { product: i for i, product in enumerate(self._nodes) }
+
+        # Whether or not to distribute each product, and number of row bands of each product with the same first matrix
+        # (i.e. products along a chain of left operands share row bands, so each row band stays where it was computed)
+        self._distribute: dict[tuple[int, int], bool] = { }
+        self._bands: dict[int, int] = { }
+        planner = planner or PartitionPlanner()
+
+        for product, node in self._nodes.items():
+            plan = planner.plan((matrices[node.first].shape[0], matrices[node.split].shape[1]), (matrices[node.split + 1].shape[0], matrices[node.last].shape[1]),
+                                itemsize, self._servers, CLIENT_LOGGER)
+
+            self._distribute[product] = plan.distribute
+            self._bands[node.first] = max(self._bands.get(node.first, 1), plan.horizontal)
+
+        # Products that are the left operand of a distributed product, which are kept by the server(s) computing them rather than sent back
+        # (each row band of the next product only needs the same row band of its left operand); a product multiplied on client needs its operands there
+        self._kept_products: set[tuple[int, int]] = { node.left for product, node in self._nodes.items() if node.left in self._nodes and self._distribute[product] }
+
+        # Products sent back to client (i.e. right operands, and whole chain), accumulated as their row bands arrive
+        self._results: dict[tuple[int, int], ResultAssembler] = { }
+        self._result: ResultAssembler | None = None
+        self._dtype = result_type(*matrices)
+
+        # Row bands completed and busy, idle time of client and each server during the last call to answer()
+        self._statistics: dict[Address | str, WorkerStatistics] = { }
+
+        # Persistent connections to server(s), reused across row bands and calls to answer()
+        self._connection_pool = ConnectionPool(CLIENT_LOGGER)
+
+        # Right operands prepared for sending and their content hash (i.e. Key = position of their first matrix, which no other right operand starts at)
+        self._operands: dict[int, tuple[Any, bytes]] = { }
+        self._operand_lock = Lock()
+
+    def _band_count(self, product: tuple[int, int]) -> int:
+        """
+        Number of row bands product is computed in
+
+        Args:
+            product (tuple[int, int]): Positions of first and last matrix in product
+
+        Returns:
+            int: Number of row bands
+        """
+        return self._bands[product[0]]
+
+    def _row_offsets(self, product: tuple[int, int]) -> list[int]:
+        """
+        First row of each row band of product (same split as numpy.array_split), plus the row after the last one
+
+        Args:
+            product (tuple[int, int]): Positions of first and last matrix in product
+
+        Returns:
+            list[int]: Row offsets
+        """
+        length, bands = self._matrices[product[0]].shape[0], self._band_count(product)
+        size, extra = divmod(length, bands)
+
+        return [i * size + min(i, extra) for i in range(bands + 1)]
+
+    def answer(self) -> ndarray:
+        """
+        Use client and server(s) to multiply chain of matrices, then get result
+
+        Returns:
+            ndarray: Product of every matrix in chain
+        """
+        return get_result(self, CLIENT_LOGGER)
+
+    @property
+    def statistics(self) -> dict[Address | str, WorkerStatistics]:
+        """
+        Row bands completed and busy, idle time of client and each server during the last call to answer()
+
+        Returns:
+            dict[Address | str, WorkerStatistics]: Statistics of each worker
+        """
+        return self._statistics
+
+    def close(self) -> None:
+        """
+        Close persistent connections to server(s)
+        """
+        self._connection_pool.close()
+
+    @handle_exceptions(CLIENT_LOGGER)
+    def _work(self) -> None:
+        """
+        Multiply every product in the chain with client and server(s), running independent products concurrently
+        and keeping intermediate row bands on the server(s) that computed them
+        """
+        # Fresh results, so calling answer() again doesn't accumulate into the previous ones
+        self._results = { product: ResultAssembler(self._matrices[node.first].shape[0], self._matrices[node.last].shape[1], self._band_count(product), 1, self._dtype)
+                          for product, node in self._nodes.items() if product not in self._kept_products }
+        self._result = self._results[(0, len(self._matrices) - 1)]
+
+        self._statistics = ChainScheduler(self, self._servers if any(self._distribute.values()) else { }, CLIENT_LOGGER).run()
+
+if __name__ == "__main__":
+    # Generate example chain of matrices (of varying shapes, so the order they're multiplied in matters)
+    widths = [LENGTH, 2 * LENGTH, LENGTH // 2, 3 * LENGTH, LENGTH]
+    matrices = [generate_matrix(length, width) for length, width in zip(widths, widths[1:])]
+
+    for i, matrix in enumerate(matrices): print(f"Matrix {i}: {matrix}\n")
+    start = perf_counter()
+
+    # Create Chain Client to multiply matrices
+    # (Example matrices are tiny, so distribute them regardless of size)
+    chain_client = ChainClient(matrices, planner = PartitionPlanner(local_cutoff = 0))
+
+    # Get result and print it
+    answer = chain_client.answer()
+    chain_client.close()
+    end = perf_counter()
+    print(f"Final Result Matrix = {answer}\n")
+    print(f"Chain Client ran for {end - start} seconds\n")
+
+    # Print outcome (i.e. answer's correctness)
+    print_outcome(answer, *matrices)
@@ -0,0 +1,107 @@
+from time import perf_counter
+from logging import Logger
+from typing import NamedTuple
+from project.src.Shared import timing
+
+BYTE_COST = 80
+"""Number of multiply-adds a server does in the time it takes to move one byte over the network (i.e. ~10 GFLOPS over 1 Gbps)"""
+
+class ChainNode(NamedTuple):
+    """
+    Tuple defining a product of consecutive matrices in a chain, computed as (matrices first to split) * (matrices split + 1 to last)
+
+    Args:
+        NamedTuple (int, int, int): Position of first and last matrix (inclusive), and of last matrix in left operand
+    """
+    first: int
+    last: int
+    split: int
+
+    @property
+    def left(self) -> tuple[int, int]:
+        """
+        Positions of first and last matrix in left operand
+
+        Returns:
+            tuple[int, int]: Positions of first and last matrix (inclusive)
+        """
+        return self.first, self.split
+
+    @property
+    def right(self) -> tuple[int, int]:
+        """
+        Positions of first and last matrix in right operand
+
+        Returns:
+            tuple[int, int]: Positions of first and last matrix (inclusive)
+        """
+        return self.split + 1, self.last
+
+class ChainPlanner():
+    def __init__(self, byte_cost: float = BYTE_COST):
+        # Multiply-adds each byte moved is worth
+        self._byte_cost = byte_cost
+
+    def _cost(self, length: int, inner: int, width: int, itemsize: int, servers: int) -> float:
+        """
+        Cost of multiplying a length * inner matrix by an inner * width matrix (i.e. multiply-adds, plus bytes moved at most:
+        left operand sent once, right operand sent to every server, product sent back once)
+
+        Args:
+            length (int): Left operand's length
+            inner (int): Left operand's width (i.e. right operand's length)
+            width (int): Right operand's width
+            itemsize (int): Size (bytes) of each element
+            servers (int): Number of servers
+
+        Returns:
+            float: Cost (multiply-adds)
+        """
+        moved = (length * inner + max(servers, 1) * inner * width + length * width) * itemsize if servers else 0
+        return length * inner * width + self._byte_cost * moved
+
+    def plan(self, shapes: list[tuple[int, int]], itemsize: int, servers: int, logger: Logger) -> list[ChainNode]:
+        """
+        Choose order to multiply a chain of matrices in (i.e. matrix-chain ordering, minimizing multiply-adds and bytes moved)
+
+        Args:
+            shapes (list[tuple[int, int]]): Shape of each matrix in chain
+            itemsize (int): Size (bytes) of each element
+            servers (int): Number of servers products are distributed across (0 if multiplied locally)
+            logger (Logger): Logger
+
+        Returns:
+            list[ChainNode]: Products to compute, each after the products it depends on (i.e. last one is the whole chain)
+        """
+        start = perf_counter()
+        count = len(shapes)
+
+        # Dimensions of chain (i.e. matrix i is dimensions[i] * dimensions[i + 1])
+        dimensions = [shapes[0][0], *(width for _, width in shapes)]
+
+        # Cheapest cost of, and best split for, each product of matrices i to j
+        costs = [[0.0] * count for _ in range(count)]
+        splits = [[0] * count for _ in range(count)]
+
+        for span in range(1, count):
+            for i in range(count - span):
+                j = i + span
+                costs[i][j], splits[i][j] = min((costs[i][k] + costs[k + 1][j] + self._cost(dimensions[i], dimensions[k + 1], dimensions[j + 1], itemsize, servers), k)
+                                                for k in range(i, j))
+
+        # Walk splits from whole chain down, then reverse so every product comes after its operands
+        nodes, stack = [ ], [(0, count - 1)]
+        while stack:
+            first, last = stack.pop()
+            if first == last: continue
+
+            node = ChainNode(first, last, splits[first][last])
+            nodes.append(node)
+            stack.extend((node.left, node.right))
+
+        nodes.reverse()
+
+        end = perf_counter()
+        logger.info(f"Planned {len(nodes)} product(s) for chain of {count} matrices (cost {costs[0][count - 1]}) in {timing(end, start)} seconds\n")
+
+        return nodes
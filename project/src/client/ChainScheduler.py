@@ -0,0 +1,336 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from threading import Condition
+from collections.abc import Callable
+from time import perf_counter
+from logging import Logger
+from secrets import token_bytes
+from socket import error
+from typing import Any, NamedTuple
+from numpy import ndarray
+from project.src.IntegerMultiply import integer_dot
+from project.src.client.HealthCheck import HEALTH_CHECKER
+from project.src.client.Scheduler import WorkerStatistics, LOCAL_WORKER, PIPELINE_DEPTH
+from project.src.client.Shared import get_operand
+from project.src.Shared import Address, Keep, Reference, DIGEST_SIZE, timing
+
+class ChainJob(NamedTuple):
+    """
+    Tuple defining a row band of a product in a chain (i.e. row band of its left operand * its whole right operand)
+
+    Args:
+        NamedTuple (tuple[int, int], int): Positions of first and last matrix in product, and row band
+    """
+    product: tuple[int, int]
+    band: int
+
+class ChainScheduler():
+    def __init__(self, client, servers: dict[Address, tuple[int, float]], logger: Logger, pipeline_depth: int = PIPELINE_DEPTH):
+        self._client = client
+        self._servers = servers
+        self._logger = logger
+        self._pipeline_depth = pipeline_depth
+
+        # Jobs waiting for their operands or a worker, and jobs running (i.e. Key = job, Value = worker running it)
+        self._pending: set[ChainJob] = { ChainJob(product, band) for product in client._nodes for band in range(client._band_count(product)) }
+        self._running: dict[ChainJob, Address | str] = { }
+
+        # Jobs whose row band is available, i.e. received by client or kept by a worker
+        self._done: set[ChainJob] = set()
+
+        # Row bands of products that are left operands of another product, and where they are (i.e. ndarray if on client, else server and key it's kept under)
+        self._kept: dict[ChainJob, ndarray | tuple[Address, Keep]] = { }
+
+        # Whether or not a worker stopped on an unexpected error (i.e. every other worker stops too, rather than waiting for jobs it can't run)
+        self._failed = False
+
+        # Guards the above, and wakes workers waiting for a job whenever one finishes or is put back
+        self._condition = Condition()
+
+        self.statistics: dict[Address | str, WorkerStatistics] = { worker: WorkerStatistics() for worker in [LOCAL_WORKER, *servers] }
+
+    def _inputs(self, job: ChainJob) -> list[ChainJob]:
+        """
+        Jobs whose row bands job needs (i.e. same row band of left operand, and every row band of right operand, if they're products)
+
+        Args:
+            job (ChainJob): Job
+
+        Returns:
+            list[ChainJob]: Jobs job depends on
+        """
+        node, inputs = self._client._nodes[job.product], [ ]
+
+        if node.left in self._client._nodes: inputs.append(ChainJob(node.left, job.band))
+        if node.right in self._client._nodes: inputs.extend(ChainJob(node.right, band) for band in range(self._client._band_count(node.right)))
+
+        return inputs
+
+    def _home(self, job: ChainJob) -> Address | str | None:
+        """
+        Worker job must run on (i.e. client if its product isn't distributed, or server keeping its row band of left operand)
+
+        Args:
+            job (ChainJob): Job
+
+        Returns:
+            Address | str | None: Worker; None if any worker may run it
+        """
+        if not self._client._distribute[job.product]: return LOCAL_WORKER
+
+        left = self._kept.get(ChainJob(self._client._nodes[job.product].left, job.band))
+        return left[0] if isinstance(left, tuple) else None
+
+    def _take(self, worker: Address | str, block: bool) -> ChainJob | None:
+        """
+        Get worker's next job: one whose operands are available, preferring one whose left operand is already on worker, then the earliest product in the chain
+
+        Args:
+            worker (Address | str): Worker
+            block (bool): Wait for a job to become available, rather than returning None straight away
+
+        Returns:
+            ChainJob | None: Job; None if there's nothing worker can run (i.e. everything is finished, or another worker failed, if block)
+        """
+        with self._condition:
+            while True:
+                if self._failed: return None
+
+                candidates = [job for job in self._pending
+                              if all(dependency in self._done for dependency in self._inputs(job)) and self._home(job) in (None, worker)]
+
+                if candidates:
+                    job = min(candidates, key = lambda job: (self._home(job) != worker, self._client._position[job.product], job.band))
+                    self._pending.discard(job)
+                    self._running[job] = worker
+
+                    return job
+
+                if not block or not (self._pending or self._running): return None
+                self._condition.wait()
+
+    def _need(self, job: ChainJob) -> None:
+        """
+        Make sure job's row band will be (re)computed, along with any of its operands' row bands that were lost (call while holding condition)
+
+        Args:
+            job (ChainJob): Job
+        """
+        if job in self._done or job in self._pending or job in self._running: return
+
+        self._pending.add(job)
+        for dependency in self._inputs(job): self._need(dependency)
+
+    def _put_back(self, job: ChainJob) -> None:
+        """
+        Put job back (e.g. its server failed), recomputing any of its operands' row bands that were lost
+
+        Args:
+            job (ChainJob): Job
+        """
+        with self._condition:
+            self._running.pop(job, None)
+            self._need(job)
+
+            self._condition.notify_all()
+
+    def _lose(self, job: ChainJob) -> None:
+        """
+        Forget row band kept by a server (e.g. server evicted it, or can no longer be reached), so jobs still needing it recompute it
+
+        Args:
+            job (ChainJob): Job whose row band was lost
+        """
+        with self._condition:
+            self._kept.pop(job, None)
+            self._done.discard(job)
+
+            for waiting in [*self._pending, *self._running]:
+                for dependency in self._inputs(waiting): self._need(dependency)
+
+            self._condition.notify_all()
+
+    def _finish(self, job: ChainJob, worker: Address | str, result: ndarray | Keep) -> None:
+        """
+        Record job's row band: where it's kept (if its product is a left operand), else add it to its product
+
+        Args:
+            job (ChainJob): Job
+            worker (Address | str): Worker that ran job
+            result (ndarray | Keep): Row band, or key it's kept under on server
+        """
+        if job.product not in self._client._kept_products: self._client._results[job.product].add(job.band, result)
+
+        with self._condition:
+            if job.product in self._client._kept_products: self._kept[job] = (worker, result) if isinstance(result, Keep) else result
+
+            self._running.pop(job, None)
+            self._done.add(job)
+
+            self._condition.notify_all()
+
+    def _operands(self, job: ChainJob) -> tuple[Any, ndarray]:
+        """
+        Get job's row band of left operand (ndarray, or reference to where it's kept on a server) and whole right operand
+
+        Args:
+            job (ChainJob): Job
+
+        Returns:
+            tuple[Any, ndarray]: Row band of left operand and right operand
+        """
+        node = self._client._nodes[job.product]
+        start, stop = self._client._row_offsets(job.product)[job.band:job.band + 2]
+
+        # Left operand is kept (on client or a server) if its product is distributed, else it was sent back to client
+        if node.left in self._client._kept_products:
+            with self._condition: left = self._kept[ChainJob(node.left, job.band)]
+            if isinstance(left, tuple): left = Reference(left[1].digest)
+
+        elif node.left in self._client._nodes: left = self._client._results[node.left].matrix[start:stop]
+
+        else: left = self._client._matrices[node.first][start:stop]
+
+        if node.right in self._client._nodes: right = self._client._results[node.right].matrix
+        else: right = self._client._matrices[node.split + 1]
+
+        return left, right
+
+    def _work_locally(self) -> bool:
+        """
+        Multiply row bands on the client itself until everything is finished
+
+        Returns:
+            bool: True (i.e. client is always reachable)
+        """
+        statistics = self.statistics[LOCAL_WORKER]
+
+        while (job := self._take(LOCAL_WORKER, block = True)) is not None:
+            start = perf_counter()
+
+            self._finish(job, LOCAL_WORKER, integer_dot(*self._operands(job)))
+
+            statistics.blocks += 1
+            statistics.busy += perf_counter() - start
+
+        return True
+
+    def _work_with_server(self, server_address: Address) -> bool:
+        """
+        Send row bands to a single server until everything is finished, keeping up to pipeline_depth jobs in flight;
+        row bands of left operands are kept on server, so the next product in the chain is sent there instead of fetching them
+
+        Args:
+            server_address (Address): Server address
+
+        Returns:
+            bool: True if server stayed reachable, else False
+        """
+        statistics = self.statistics[server_address]
+
+        # Jobs in flight (i.e. Key = response from server, Value = job, content hash of its right operand, and time sent)
+        jobs: dict[Future, tuple[ChainJob, bytes, float]] = { }
+        reachable = True
+
+        while True:
+            # Top up jobs in flight (waiting for one to become available only when there's nothing else to wait for)
+            while reachable and len(jobs) < self._pipeline_depth and (job := self._take(server_address, block = not jobs)) is not None:
+                try:
+                    left, right = self._operands(job)
+                    right, digest = get_operand(self._client, self._client._nodes[job.product].split + 1, right)
+                    keep = Keep(token_bytes(DIGEST_SIZE)) if job.product in self._client._kept_products else None
+
+                    jobs[self._client._connection_pool.submit_cached(server_address, (left,), right, digest, keep)] = (job, digest, perf_counter())
+
+                except (ConnectionError, error):
+                    self._logger.exception(f"Unable to send row band to Server at {server_address}; leaving it for other worker(s)...\n")
+                    self._put_back(job)
+                    reachable = False
+
+                    # Probe server again the next time it's considered
+                    HEALTH_CHECKER.invalidate(server_address)
+
+            if not jobs: break
+
+            # Wait for any job in flight to finish
+            done, _ = wait(jobs, return_when = FIRST_COMPLETED)
+
+            for response in done:
+                job, digest, sent = jobs.pop(response)
+
+                try: result = response.result()[0]
+
+                except ConnectionError:
+                    self._logger.exception(f"Lost connection to Server at {server_address}\n")
+                    result = None
+
+                # Server no longer has right operand cached (it's uploaded next time), or no longer keeps row band of left operand (it's recomputed)
+                if isinstance(result, Reference):
+                    self._logger.info(f"Server at {server_address} no longer has operand {result.digest.hex()}; retrying {job} later...\n")
+                    if result.digest != digest: self._lose(ChainJob(self._client._nodes[job.product].left, job.band))
+                    self._put_back(job)
+
+                elif result is not None:
+                    self._logger.info(f"Successfully received {'kept ' if isinstance(result, Keep) else ''}row band {job} from Server at {server_address}\n")
+                    self._finish(job, server_address, result)
+
+                    statistics.blocks += 1
+                    statistics.busy += perf_counter() - sent
+
+                else:
+                    self._logger.error(f"Failed to receive valid result from Server at {server_address}; retrying later...\n")
+                    self._put_back(job)
+
+        # Row bands kept by an unreachable server are gone
+        if not reachable:
+            with self._condition: lost = [job for job, kept in self._kept.items() if isinstance(kept, tuple) and kept[0] == server_address]
+            for job in lost: self._lose(job)
+
+        return reachable
+
+    def _guard(self, work: Callable[..., bool], *args: Any) -> bool:
+        """
+        Run a worker, stopping every other worker if it raises an unexpected error (i.e. none is left waiting for a job only it could have run)
+
+        Args:
+            work (Callable[..., bool]): Worker
+            *args (Any): Its arguments
+
+        Returns:
+            bool: Worker's result
+        """
+        try: return work(*args)
+
+        except BaseException:
+            with self._condition:
+                self._failed = True
+                self._condition.notify_all()
+
+            raise
+
+    def run(self) -> dict[Address | str, WorkerStatistics]:
+        """
+        Multiply every row band of every product in the chain with the client and server(s) concurrently, each running its next job as soon as its operands are available
+        (i.e. independent products run at the same time)
+
+        Returns:
+            dict[Address | str, WorkerStatistics]: Row bands completed and busy, idle time of each worker
+        """
+        start = perf_counter()
+
+        with ThreadPoolExecutor(max_workers = len(self._servers) + 1, thread_name_prefix = "ChainScheduler") as executor:
+            workers = { executor.submit(self._guard, self._work_locally): LOCAL_WORKER }
+            workers.update({ executor.submit(self._guard, self._work_with_server, server_address): server_address for server_address in self._servers })
+
+            # Record when each worker ran out of work
+            finished = { }
+            for worker in workers: worker.add_done_callback(lambda done: finished.__setitem__(workers[done], perf_counter()))
+
+        end = perf_counter()
+        for worker, time in finished.items(): self.statistics[worker].idle += end - time
+
+        # Surface any unexpected error from a worker
+        for worker in workers: worker.result()
+
+        self._logger.info(f"Chain scheduler ran for {timing(end, start)} seconds: {self.statistics}\n")
+
+        return self.statistics
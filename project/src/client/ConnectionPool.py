@@ -0,0 +1,329 @@
+from socket import socket, SOL_SOCKET, SO_REUSEADDR, SHUT_RDWR, error
+from concurrent.futures import Future
+from threading import Thread, Lock
+from itertools import count
+from time import perf_counter
+from logging import Logger
+from typing import Any
+from project.src.Shared import Address, Accumulate, Keep, Reference, ACKNOWLEDGEMENT, receive, send_message, receive_message, timing
+
+class Connection():
+    def __init__(self, server_address: Address, logger: Logger):
+        self._server_address = server_address
+        self._logger = logger
+
+        # Jobs sent over this connection that are still waiting for a response (i.e. Key = job ID, Value = response)
+        self._pending: dict[int, Future] = { }
+        self._pending_lock = Lock()
+
+        # Jobs whose response is no longer wanted (i.e. it's ignored when it arrives)
+        self._cancelled: set[int] = set()
+
+        # Requests from different threads must not interleave their frames
+        self._send_lock = Lock()
+        self._job_ids = count()
+        self._closed = False
+
+        # Content hashes of operands sent over this connection, which the server is assumed to have cached
+        self._uploaded: set[bytes] = set()
+        self._uploaded_lock = Lock()
+
+        start = perf_counter()
+
+        # Connect to server
+        self._socket = socket()
+        self._socket.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+        self._socket.connect(server_address)
+
+        end = perf_counter()
+        logger.info(f"Connected to Server at {server_address} in {timing(end, start)} seconds\n")
+
+        # Read responses in the background, so several jobs can be in flight at once
+        self._reader = Thread(target = self._read, name = f"Connection-{server_address.port}", daemon = True)
+        self._reader.start()
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether or not connection has been closed
+
+        Returns:
+            bool: True if closed, else False
+        """
+        return self._closed
+
+    def submit(self, *data: Any) -> Future:
+        """
+        Send job (i.e. data tagged with a new job ID) to server without waiting for its response
+
+        Args:
+            *data (Any): Data (e.g. partitions of Matrix A and Matrix B) to be sent
+
+        Raises:
+            ConnectionError: Connection is closed
+
+        Returns:
+            Future: Data received from server, as a list of payloads
+        """
+        job_id, future = self._register()
+
+        try:
+            with self._send_lock: send_message(self._socket, job_id, *data)
+
+        except (error, ValueError) as exception:
+            self._fail(exception)
+            raise
+
+        return future
+
+    def submit_cached(self, matrix_a: tuple[Any, ...], matrix_b: Any, digest: bytes, keep: Keep | Accumulate | None = None) -> Future:
+        """
+        Send job to server, referencing partition of Matrix B by its content hash if it was already sent over this connection
+        (i.e. partition of Matrix B is only sent on its first use, or after server reported it missing)
+
+        Args:
+            matrix_a (tuple[Any, ...]): Partition of Matrix A (followed by its mask, if redacted numerically), or a reference to a result kept on server
+            matrix_b (Any): Partition of Matrix B
+            digest (bytes): Content hash of partition of Matrix B
+            keep (Keep | Accumulate | None, optional): Ask server to keep result under this key, or add it to the other products of its tile,
+            instead of sending it back; defaults to None
+
+        Raises:
+            ConnectionError: Connection is closed
+
+        Returns:
+            Future: Data received from server, as a list of payloads (i.e. result, keep or accumulate request if server kept or accumulated result,
+            or reference if server no longer has an operand)
+        """
+        job_id, future = self._register()
+        keep = (keep,) if keep is not None else ()
+
+        try:
+            # Decide whether to upload under the send lock, so an upload is always sent before the references relying on it
+            with self._send_lock:
+                with self._uploaded_lock:
+                    upload = digest not in self._uploaded
+                    self._uploaded.add(digest)
+
+                if upload: send_message(self._socket, job_id, *keep, *matrix_a, Reference(digest), matrix_b)
+                else: send_message(self._socket, job_id, *keep, *matrix_a, Reference(digest))
+
+        except (error, ValueError) as exception:
+            self._fail(exception)
+            raise
+
+        return future
+
+    def cancel(self, future: Future) -> bool:
+        """
+        Stop waiting for a job's response (e.g. another server finished the same partitions first), waking anyone waiting on it
+
+        Args:
+            future (Future): Response to job sent over this connection
+
+        Returns:
+            bool: True if job was cancelled, else False (i.e. its response already arrived, or connection failed)
+        """
+        with self._pending_lock:
+            job_id = next((job_id for job_id, pending in self._pending.items() if pending is future), None)
+            if job_id is None: return False
+
+            del self._pending[job_id]
+            self._cancelled.add(job_id)
+
+        # Cancelling alone doesn't wake concurrent.futures.wait()
+        future.cancel()
+        future.set_running_or_notify_cancel()
+
+        return True
+
+    def _register(self) -> tuple[int, Future]:
+        """
+        Create a new job ID and the future its response will be delivered to
+
+        Raises:
+            ConnectionError: Connection is closed
+
+        Returns:
+            tuple[int, Future]: Job ID and response
+        """
+        future = Future()
+
+        with self._pending_lock:
+            if self._closed: raise ConnectionError(f"Connection to Server at {self._server_address} is closed")
+
+            job_id = next(self._job_ids)
+            self._pending[job_id] = future
+
+        return job_id, future
+
+    def _read(self) -> None:
+        """
+        Receive responses from server and match them (in any order) to their job
+        """
+        try:
+            while True:
+                # Receive and verify acknowledgment from server
+                acknowledgement_msg = receive(self._socket).decode("utf-8").strip()
+                if acknowledgement_msg != ACKNOWLEDGEMENT:
+                    raise ValueError(f"Invalid acknowledgment \"{acknowledgement_msg}\"")
+
+                # Receive data frame(s) from server
+                job_id, data = receive_message(self._socket)
+
+                # Server no longer has referenced operand, so upload it again next time
+                if data and isinstance(data[0], Reference):
+                    with self._uploaded_lock: self._uploaded.discard(data[0].digest)
+
+                # Server couldn't cache uploaded operand (i.e. larger than its cache's budget), so keep sending it in full rather than referencing it
+                elif len(data) > 1 and isinstance(data[-1], Reference):
+                    with self._uploaded_lock: self._uploaded.discard(data[-1].digest)
+                    data = data[:-1]
+
+                with self._pending_lock:
+                    future = self._pending.pop(job_id, None)
+
+                    # Response to a cancelled job
+                    if future is None and job_id in self._cancelled:
+                        self._cancelled.discard(job_id)
+                        continue
+
+                if future is None: self._logger.error(f"Server at {self._server_address} sent response for unknown job {job_id}\n")
+                else: future.set_result(data)
+
+        except (EOFError, error, ValueError) as exception:
+            if not self._closed: self._logger.error(f"Lost connection to Server at {self._server_address}: {exception}\n")
+            self._fail(exception)
+
+    def _fail(self, exception: BaseException) -> None:
+        """
+        Close connection and fail every job still waiting for a response
+
+        Args:
+            exception (BaseException): Reason for failure
+        """
+        with self._pending_lock:
+            self._closed = True
+            pending, self._pending = self._pending, { }
+
+        for future in pending.values():
+            connection_error = ConnectionError(f"Connection to Server at {self._server_address} failed")
+            connection_error.__cause__ = exception
+            future.set_exception(connection_error)
+
+        self._shutdown()
+
+    def _shutdown(self) -> None:
+        """
+        Shutdown and close socket
+        """
+        try: self._socket.shutdown(SHUT_RDWR)
+        except error: pass
+        self._socket.close()
+
+    def close(self) -> None:
+        """
+        Close connection
+        """
+        with self._pending_lock: self._closed = True
+        self._shutdown()
+
+class ConnectionPool():
+    def __init__(self, logger: Logger):
+        self._logger = logger
+
+        # Open connections (i.e. Key = server address, Value = connection)
+        self._connections: dict[Address, Connection] = { }
+        self._lock = Lock()
+
+    def get(self, server_address: Address) -> Connection:
+        """
+        Get open connection to server, connecting if there isn't one
+
+        Args:
+            server_address (Address): Server address
+
+        Returns:
+            Connection: Open connection to server
+        """
+        with self._lock:
+            connection = self._connections.get(server_address)
+
+            if connection is None or connection.closed:
+                connection = Connection(server_address, self._logger)
+                self._connections[server_address] = connection
+
+            return connection
+
+    def submit(self, server_address: Address, *data: Any) -> Future:
+        """
+        Send job to server over a pooled connection
+
+        Args:
+            server_address (Address): Server address
+            *data (Any): Data (e.g. partitions of Matrix A and Matrix B) to be sent
+
+        Returns:
+            Future: Data received from server, as a list of payloads
+        """
+        return self.get(server_address).submit(*data)
+
+    def submit_cached(self, server_address: Address, matrix_a: tuple[Any, ...], matrix_b: Any, digest: bytes, keep: Keep | Accumulate | None = None) -> Future:
+        """
+        Send job to server over a pooled connection, sending partition of Matrix B only if server doesn't have it cached
+
+        Args:
+            server_address (Address): Server address
+            matrix_a (tuple[Any, ...]): Partition of Matrix A (followed by its mask, if redacted numerically), or a reference to a result kept on server
+            matrix_b (Any): Partition of Matrix B
+            digest (bytes): Content hash of partition of Matrix B
+            keep (Keep | Accumulate | None, optional): Ask server to keep result under this key, or add it to the other products of its tile,
+            instead of sending it back; defaults to None
+
+        Returns:
+            Future: Data received from server, as a list of payloads
+        """
+        return self.get(server_address).submit_cached(matrix_a, matrix_b, digest, keep)
+
+    def discard(self, server_address: Address, accumulate: Accumulate) -> bool:
+        """
+        Ask server to drop the partial sum of a tile client gave up on, without waiting for its confirmation
+        (tiles only live on the connection they were sent over, so nothing is sent if it's closed)
+
+        Args:
+            server_address (Address): Server address
+            accumulate (Accumulate): Tile's key and number of products in it
+
+        Returns:
+            bool: True if request was sent, else False
+        """
+        with self._lock: connection = self._connections.get(server_address)
+        if connection is None or connection.closed: return False
+
+        try: connection.submit(Accumulate(accumulate.digest, 0))
+        except (error, ValueError): return False
+
+        return True
+
+    def cancel(self, server_address: Address, future: Future) -> bool:
+        """
+        Stop waiting for a job's response from server, waking anyone waiting on it
+
+        Args:
+            server_address (Address): Server address
+            future (Future): Response to job sent to server
+
+        Returns:
+            bool: True if job was cancelled, else False (i.e. its response already arrived, or connection failed)
+        """
+        with self._lock: connection = self._connections.get(server_address)
+        return connection is not None and connection.cancel(future)
+
+    def close(self) -> None:
+        """
+        Close all pooled connections
+        """
+        with self._lock:
+            connections, self._connections = list(self._connections.values()), { }
+
+        for connection in connections: connection.close()
@@ -0,0 +1,121 @@
+from threading import Lock
+from time import perf_counter
+from logging import Logger
+from math import prod
+from numpy import ndarray, random, integer, issubdtype, int64, zeros, array_equal, allclose
+from sympy import isprime
+from project.src.IntegerMultiply import MAX_MODULUS, magnitude, modular_dot
+from project.src.Shared import timing
+
+MIN_PRIME = MAX_MODULUS // 2
+"""Smallest prime integer products may be checked modulo (i.e. every prime is drawn from [2 ** 30, 2 ** 31), so modular_dot accepts it)"""
+
+FREIVALDS_ROUNDS = 2
+"""Number of random vectors each product is checked against (i.e. a wrong product passes every vector with probability at most MIN_PRIME ** -FREIVALDS_ROUNDS)"""
+
+class FreivaldsVerifier():
+    def __init__(self, rounds: int = FREIVALDS_ROUNDS, seed: int | None = None):
+        # Number of random vectors per check (0 disables checks)
+        self._rounds = rounds
+
+        # Random number generator drawing primes and vectors (seed it for reproducible benchmarks; primes are then predictable), shared by every worker
+        self._rng = random.default_rng(seed)
+        self._lock = Lock()
+
+    def _prime(self) -> int:
+        """
+        Draw a random prime in [MIN_PRIME, MAX_MODULUS), kept secret from server(s) (i.e. they can't send an error that's a multiple of it)
+
+        Returns:
+            int: Prime
+        """
+        while True:
+            with self._lock: candidate = int(self._rng.integers(MIN_PRIME, MAX_MODULUS)) | 1
+            if candidate < MAX_MODULUS and isprime(candidate): return candidate
+
+    def _vectors(self, width: int, modulus: int | None) -> ndarray:
+        """
+        Draw rounds random column vectors
+
+        Args:
+            width (int): Length of each vector (i.e. product's width)
+            modulus (int | None): Draw residues modulo modulus; None to draw floats
+
+        Returns:
+            ndarray: Vectors, one per column
+        """
+        with self._lock:
+            if modulus is not None: return self._rng.integers(0, modulus, (width, self._rounds), dtype = int64)
+            return self._rng.random((width, self._rounds))
+
+    def _bound(self, terms: list[list[ndarray]]) -> int:
+        """
+        Largest magnitude any element of the sum of terms can have (i.e. per term, product of its inner dimensions and of each matrix's largest magnitude)
+
+        Args:
+            terms (list[list[ndarray]]): Chains of integer matrices
+
+        Returns:
+            int: Bound
+        """
+        return sum(prod(matrix.shape[1] for matrix in term[:-1]) * prod(magnitude(matrix) for matrix in term) for term in terms)
+
+    def verify(self, terms: list[list[ndarray]], product: ndarray) -> bool:
+        """
+        Check product equals the sum of terms, each a chain of matrices multiplied together, with Freivalds' algorithm:
+        product * r == M1 * (M2 * (... * r)) summed over terms, for random vectors r (i.e. O(n ** 2) per vector, rather than recomputing product);
+        integer products must lie within the bound their terms allow, and are compared exactly modulo a secret random prime, anything else approximately
+
+        Args:
+            terms (list[list[ndarray]]): Chains of matrices whose products sum to product (e.g. [[Matrix A, Matrix B]],
+            or one pair of partitions per partition in a tile)
+            product (ndarray): Product to check
+
+        Returns:
+            bool: True if product passed every check, else False (i.e. product is certainly wrong)
+        """
+        if self._rounds == 0: return True
+
+        if all(issubdtype(matrix.dtype, integer) for term in terms for matrix in [*term, product]):
+            # An element beyond the bound is wrong outright; within it, an error is a multiple of the (secret) prime only by chance
+            if magnitude(product) > self._bound(terms): return False
+
+            modulus = self._prime()
+            vectors, expected = self._vectors(product.shape[1], modulus), zeros((product.shape[0], self._rounds), dtype = int64)
+
+            # Multiply vectors through each chain from the right, so every step is a matrix times a few vectors
+            for term in terms:
+                checked = vectors
+                for matrix in reversed(term): checked = modular_dot(matrix, checked, modulus)
+                expected = (expected + checked) % modulus
+
+            return array_equal(expected, modular_dot(product, vectors, modulus))
+
+        vectors, expected = self._vectors(product.shape[1], None), zeros((product.shape[0], self._rounds))
+
+        for term in terms:
+            checked = vectors
+            for matrix in reversed(term): checked = matrix @ checked
+            expected += checked
+
+        return allclose(expected, product @ vectors)
+
+    def verify_result(self, factors: list[ndarray], result: ndarray, logger: Logger) -> bool:
+        """
+        Check assembled result equals the product of factors, logging the outcome
+
+        Args:
+            factors (list[ndarray]): Matrices whose product result should be (e.g. Matrix A and Matrix B, or a chain of matrices)
+            result (ndarray): Assembled result
+            logger (Logger): Logger
+
+        Returns:
+            bool: True if result passed every check, else False
+        """
+        start = perf_counter()
+        verified = self.verify([factors], result)
+
+        end = perf_counter()
+        logger.info(f"Result {'passed' if verified else 'FAILED'} Freivalds verification ({self._rounds} round(s)) in {timing(end, start)} seconds\n")
+
+        return verified
@@ -0,0 +1,102 @@
+from socket import create_connection, error
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import monotonic, perf_counter
+from logging import Logger
+from collections.abc import Iterable
+from project.src.Shared import Address, Ping, ACKNOWLEDGEMENT, receive, send_message, receive_message, timing
+
+HEALTH_TIMEOUT = 1.0
+"""Time (seconds) a server has to accept a connection and answer a ping"""
+
+HEALTH_TTL = 30.0
+"""Time (seconds) a health check result is reused before server is probed again"""
+
+MAX_PROBES = 32
+"""Largest number of servers probed at once"""
+
+def ping(server_address: Address, timeout: float = HEALTH_TIMEOUT) -> bool:
+    """
+    Check that server accepts connections and handles messages, by sending it a ping and waiting for its reply
+
+    Args:
+        server_address (Address): Server address
+        timeout (float, optional): Time (seconds) to connect and get a reply; defaults to HEALTH_TIMEOUT
+
+    Returns:
+        bool: True if server replied in time, else False
+    """
+    try:
+        with create_connection(server_address, timeout = timeout) as sock:
+            send_message(sock, 0, Ping())
+
+            # Receive and verify acknowledgment, then reply from server
+            if receive(sock).decode("utf-8").strip() != ACKNOWLEDGEMENT: return False
+            _, reply = receive_message(sock)
+
+            return isinstance(reply[0], Ping)
+
+    except (error, EOFError, ValueError):
+        return False
+
+class HealthChecker():
+    def __init__(self, ttl: float = HEALTH_TTL, timeout: float = HEALTH_TIMEOUT, max_probes: int = MAX_PROBES):
+        # Time (seconds) a result is reused for
+        self._ttl = ttl
+
+        # Time (seconds) each server has to reply
+        self._timeout = timeout
+
+        # Largest number of servers probed at once
+        self._max_probes = max_probes
+
+        # Most recent result for each server (i.e. Key = server address, Value = whether it's up and when it was checked)
+        self._results: dict[Address, tuple[bool, float]] = { }
+        self._lock = Lock()
+
+    def check(self, server_addresses: Iterable[Address], logger: Logger) -> dict[Address, bool]:
+        """
+        Check whether each server is up, probing all servers without a recent result concurrently
+
+        Args:
+            server_addresses (Iterable[Address]): Server addresses
+            logger (Logger): Logger
+
+        Returns:
+            dict[Address, bool]: Whether or not each server is up
+        """
+        start, now = perf_counter(), monotonic()
+        server_addresses = list(dict.fromkeys(server_addresses))
+
+        with self._lock:
+            results = { server_address: self._results[server_address][0] for server_address in server_addresses
+                        if server_address in self._results and now - self._results[server_address][1] < self._ttl }
+
+        stale = [server_address for server_address in server_addresses if server_address not in results]
+
+        if stale:
+            with ThreadPoolExecutor(max_workers = min(len(stale), self._max_probes), thread_name_prefix = "HealthCheck") as executor:
+                probes = dict(zip(stale, executor.map(ping, stale, [self._timeout] * len(stale))))
+
+            with self._lock:
+                for server_address, up in probes.items(): self._results[server_address] = (up, monotonic())
+
+            results.update(probes)
+
+        end = perf_counter()
+        logger.info(f"Checked {len(server_addresses)} server(s) ({len(stale)} probed, {len(server_addresses) - len(stale)} cached) in {timing(end, start)} seconds: "
+                    f"{sum(results.values())} up\n")
+
+        return { server_address: results[server_address] for server_address in server_addresses }
+
+    def invalidate(self, server_address: Address) -> None:
+        """
+        Forget server's result, so it's probed again next time (e.g. server stopped responding)
+
+        Args:
+            server_address (Address): Server address
+        """
+        with self._lock: self._results.pop(server_address, None)
+
+HEALTH_CHECKER = HealthChecker()
+"""Health checker shared by every client in this process, so constructing several clients doesn't probe the same servers again"""
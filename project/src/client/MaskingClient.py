@@ -0,0 +1,292 @@
+from numpy import ndarray, result_type, array_split, array, random, int64
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Queue
+from threading import Lock
+from typing import Any
+from time import perf_counter
+from logging import getLogger, Logger
+from project.src.client.Shared import get_result, get_operand, select_servers, print_outcome, validate_inputs, MATRIX_B_WIDTH
+from project.src.ExceptionHandler import handle_exceptions
+from project.src.IntegerMultiply import MAX_MODULUS, magnitude, modular_dot
+from project.src.client.ConnectionPool import ConnectionPool
+from project.src.client.PartitionPlanner import PartitionPlanner
+from project.src.client.ResultAssembler import ResultAssembler
+from project.src.client.Scheduler import Scheduler, WorkerStatistics, REQUEST_TIMEOUT, STRAGGLER_FACTOR, MAX_DUPLICATES
+from project.src.client.FreivaldsVerifier import FreivaldsVerifier
+from project.src.Shared import Address, LENGTH, cleanup, create_logger, generate_matrix, timing
+
+MODULUS = 2147483647
+"""Prime modulus (i.e. 2 ** 31 - 1) that partitions of Matrix A are masked modulo"""
+
+CLIENT_LOGGER = getLogger(__name__)
+"""Client logger"""
+
+def validate_modulus(modulus: int, matrix_a: ndarray, matrix_b: ndarray, logger: Logger) -> None:
+    """
+    Ensure modulus is large enough to recover every product of partitions exactly (i.e. from its residue), yet small enough for modular_dot
+
+    Args:
+        modulus (int): Modulus
+        matrix_a (ndarray): Matrix A
+        matrix_b (ndarray): Matrix B
+        logger (Logger): Logger
+
+    Raises:
+        ValueError: Invalid modulus
+    """
+    # Largest possible magnitude of an element of any product of partitions
+    bound = matrix_a.shape[1] * magnitude(matrix_a) * magnitude(matrix_b)
+
+    if not 2 * bound < modulus < MAX_MODULUS:
+        exception_msg = f"Modulus ({modulus}) must be greater than {2 * bound} (i.e. twice the largest product) and less than {MAX_MODULUS}"
+        logger.exception(exception_msg)
+        cleanup(logger)
+        raise ValueError(exception_msg)
+
+class MaskingClient():
+    def __init__(self, matrix_a: ndarray, matrix_b: ndarray, length: int = LENGTH, matrix_b_width: int = MATRIX_B_WIDTH,
+                 planner: PartitionPlanner | None = None, modulus: int = MODULUS, seed: int | None = None,
+                 verifier: FreivaldsVerifier | None = None,
+                 request_timeout: float | None = REQUEST_TIMEOUT, straggler_factor: float = STRAGGLER_FACTOR, max_duplicates: float = MAX_DUPLICATES):
+        create_logger("client.log")
+        CLIENT_LOGGER.info("Starting Masking Client...\n")
+
+        # Ensure matrix dimensions and modulus are valid
+        validate_inputs(length, matrix_b_width, CLIENT_LOGGER)
+        validate_modulus(modulus, matrix_a, matrix_b, CLIENT_LOGGER)
+
+        # Server(s) to send jobs to and their CPU, available RAM
+        self._servers: dict[Address, tuple[int, float]] = select_servers(CLIENT_LOGGER)
+        self._server_addresses: list[Address] = list(self._servers)
+        CLIENT_LOGGER.info(f"Sending jobs to {self._server_addresses}\n")
+
+        # Number of horizontal and vertical partitions, chosen from matrix shapes and server(s)
+        self._plan = (planner or PartitionPlanner()).plan(matrix_a.shape, matrix_b.shape, matrix_a.itemsize, self._servers, CLIENT_LOGGER)
+
+        # Preallocated result, which server(s) results (i.e. Chunk of Matrix A * Chunk of Matrix B) are accumulated into as they arrive
+        self._result = ResultAssembler(matrix_a.shape[0], matrix_b.shape[1], self._plan.horizontal, self._plan.vertical,
+                                       result_type(matrix_a.dtype, matrix_b.dtype))
+
+        # Checks each result from server(s) and the final result (i.e. Matrix A * Matrix B), without recomputing them
+        self._verifier, self._factors = verifier or FreivaldsVerifier(), [matrix_a, matrix_b]
+
+        # Time (seconds) after which a job sent to a server is abandoned, and when (and how often) partitions straggling on a server are run again on an idle one
+        self._request_timeout, self._straggler_factor, self._max_duplicates = request_timeout, straggler_factor, max_duplicates
+
+        # Partitions completed and busy, idle time of client and each server during the last call to answer()
+        self._statistics: dict[Address | str, WorkerStatistics] = { }
+
+        # Persistent connections to server(s), reused across partitions and calls to answer()
+        self._connection_pool = ConnectionPool(CLIENT_LOGGER)
+
+        # Partitions of Matrix B prepared for sending and their content hash (i.e. Key = vertical partition), so server(s) can cache them
+        self._operands: dict[int, tuple[Any, bytes]] = { }
+        self._operand_lock = Lock()
+
+        # Modulus, and random number generator drawing masks (seed it for reproducible benchmarks; only the precomputing thread uses it)
+        self._modulus, self._rng = modulus, random.default_rng(seed)
+
+        # Masked partition of Matrix A and its correction (i.e. mask * partition of Matrix B) for each partition, precomputed in the background
+        # in queue order, so they're ready before partitions are sent (i.e. Key = position)
+        self._masks: dict[int, Future] = { }
+        self._mask_lock = Lock()
+        self._precomputer = ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "Masking")
+
+        # Create and queue partitions of Matrix A and Matrix B and their position, to be sent to selected server(s)
+        self._partitions: Queue = self._queue_partitions(matrix_a, matrix_b)
+
+    def _queue_partitions(self, matrix_a: ndarray, matrix_b: ndarray) -> Queue:
+        """
+        Create and queue partitions of Matrix A and Matrix B and their position
+
+        Args:
+            matrix_a (ndarray): Matrix A
+            matrix_b (ndarray): Matrix B
+
+        Returns:
+            Queue: Queue of partitions of Matrix A and Matrix B and their position
+        """
+        start = perf_counter()
+        
+        # Number of horizontal and vertical partitions
+        horizontal_partitions, vertical_partitions, _ = self._plan
+
+        # Split Matrix A horizontally
+        sub_matrices = array_split(matrix_a, horizontal_partitions, axis = 0)
+
+        # Split Matrix A vertically and split Matrix B horizontally using vertical_partitions (i.e., Matrix A's vertical partitions width should equal Matrix B's horizontal partitions length)
+        matrix_a_partitions, matrix_b_partitions = [m for sub_matrix in sub_matrices for m in  array_split(sub_matrix, vertical_partitions, axis = 1)], array_split(matrix_b, vertical_partitions, axis = 0)
+
+        # Declare queue to be populated and returned
+        queue = Queue()
+        
+        for i in range(len(matrix_a_partitions)):
+            # Current subset of Matrix A and Matrix B
+            sub_matrix_a, sub_matrix_b = matrix_a_partitions[i], matrix_b_partitions[i % vertical_partitions]
+
+            # Queue every partition; client and server(s) each pull their next one as soon as they're free
+            queue.put((sub_matrix_a, sub_matrix_b, i))
+
+            # Start masking partition in the background
+            self._masks[i] = self._precomputer.submit(self._mask, sub_matrix_a, sub_matrix_b, i)
+
+        end = perf_counter()
+        CLIENT_LOGGER.info(f"Created partitions and queue in {timing(end, start)} seconds\n")
+        
+        return queue
+
+    def answer(self) -> ndarray:
+        """
+        Use client and server(s) to multiply matrices, then get result
+
+        Returns:
+            ndarray: Product of Matrix A and Matrix B 
+        """
+        return get_result(self, CLIENT_LOGGER)
+
+    @property
+    def statistics(self) -> dict[Address | str, WorkerStatistics]:
+        """
+        Partitions completed and busy, idle time of client and each server during the last call to answer()
+
+        Returns:
+            dict[Address | str, WorkerStatistics]: Statistics of each worker
+        """
+        return self._statistics
+
+    def close(self) -> None:
+        """
+        Stop masking partitions and close persistent connections to server(s)
+        """
+        self._precomputer.shutdown(cancel_futures = True)
+        self._connection_pool.close()
+
+    def _reduce(self, matrix: ndarray) -> ndarray:
+        """
+        Reduce matrix modulo modulus (i.e. every element in [0, modulus))
+
+        Args:
+            matrix (ndarray): Matrix
+
+        Returns:
+            ndarray: Matrix modulo modulus
+        """
+        return matrix.astype(int64) % self._modulus
+
+    def _mask(self, sub_matrix_a: ndarray, sub_matrix_b: ndarray, index: int) -> tuple[ndarray, ndarray]:
+        """
+        Add a one-time pad (i.e. uniformly random residues) to partition of Matrix A, and compute what it adds to the product
+
+        Args:
+            sub_matrix_a (ndarray): Partition of Matrix A
+            sub_matrix_b (ndarray): Partition of Matrix B
+            index (int): Position of partitions
+
+        Returns:
+            tuple[ndarray, ndarray]: Masked partition of Matrix A, and correction (i.e. mask * partition of Matrix B, modulo modulus)
+        """
+        start = perf_counter()
+
+        # Reduced partition of Matrix B is also what's sent to server(s), so it's prepared and hashed here, ahead of dispatch
+        operand, _ = get_operand(self, index % self._plan.vertical, sub_matrix_b, self._reduce)
+        mask = self._rng.integers(0, self._modulus, size = sub_matrix_a.shape, dtype = int64)
+        masked = (self._reduce(sub_matrix_a) + mask) % self._modulus
+
+        correction = modular_dot(mask, operand, self._modulus)
+
+        end = perf_counter()
+        CLIENT_LOGGER.info(f"Masked partition {index} in {timing(end, start)} seconds\n")
+
+        return masked, correction
+
+    def _prepare(self, partitions: tuple[ndarray, ndarray, int]) -> tuple[tuple[ndarray, ndarray], ndarray, bytes]:
+        """
+        Get data to send to server for partitions (i.e. masked partition of Matrix A, waiting for it if it's still being precomputed;
+        partitions sent again after their result failed verification are masked afresh)
+
+        Args:
+            partitions (tuple[ndarray, ndarray, int]): Partitions of Matrix A and Matrix B and their position
+
+        Returns:
+            tuple[tuple[ndarray, ndarray], ndarray, bytes]: Masked partition of Matrix A and modulus, partition of Matrix B (modulo modulus),
+            and content hash of partition of Matrix B
+        """
+        sub_matrix_a, sub_matrix_b, index = partitions
+
+        with self._mask_lock:
+            if index not in self._masks: self._masks[index] = self._precomputer.submit(self._mask, sub_matrix_a, sub_matrix_b, index)
+            mask = self._masks[index]
+
+        masked, _ = mask.result()
+
+        return (masked, array(self._modulus)), *get_operand(self, index % self._plan.vertical, sub_matrix_b, self._reduce)
+
+    def _process_result(self, index: int, result: ndarray) -> ndarray:
+        """
+        Unmask result from server (i.e. subtract correction modulo modulus, then lift residue to its signed value)
+
+        Args:
+            index (int): Position of result
+            result (ndarray): Product of masked partition of Matrix A and partition of Matrix B, modulo modulus
+
+        Returns:
+            ndarray: Product of partitions of Matrix A and Matrix B, to be verified before it's accumulated
+        """
+        start = perf_counter()
+
+        with self._mask_lock: mask = self._masks.pop(index)
+        _, correction = mask.result()
+
+        # Product's magnitude is below modulus / 2 (see validate_modulus), so residues above it are negative
+        product = (result - correction) % self._modulus
+        product[product > self._modulus // 2] -= self._modulus
+
+        end = perf_counter()
+        CLIENT_LOGGER.info(f"Unmasked result in {timing(end, start)} seconds\n")
+
+        return product
+
+    def _add_product(self, index: int, product: ndarray) -> None:
+        """
+        Accumulate product of partitions into its rows of result, cancelling its mask if it's no longer needed (i.e. client multiplied partitions itself)
+
+        Args:
+            index (int): Position of product
+            product (ndarray): Product of partitions of Matrix A and Matrix B
+        """
+        with self._mask_lock: mask = self._masks.pop(index, None)
+        if mask is not None: mask.cancel()
+
+        self._result.add(index, product)
+
+    @handle_exceptions(CLIENT_LOGGER)
+    def _work(self) -> None:
+        """
+        Multiply partitioned matrices with client and server(s) (each pulling partitions as soon as it's free), get results,
+        then add them to dictionary for combining later
+        """
+        self._statistics = Scheduler(self, self._servers if self._plan.distribute else { }, CLIENT_LOGGER, verifier = self._verifier,
+                                     request_timeout = self._request_timeout, straggler_factor = self._straggler_factor, max_duplicates = self._max_duplicates).run()
+
+if __name__ == "__main__":    
+    # Generate example matrices for testing
+    matrix_a = generate_matrix(LENGTH, LENGTH)
+    matrix_b = generate_matrix(LENGTH, MATRIX_B_WIDTH)
+
+    print(f"Matrix A: {matrix_a}\n")
+    print(f"Matrix B: {matrix_b}\n")
+    start = perf_counter()
+
+    # Create Masking Client to multiply matrices
+    # (Example matrices are tiny, so distribute them regardless of size)
+    masking_client = MaskingClient(matrix_a, matrix_b, planner = PartitionPlanner(local_cutoff = 0))
+
+    # Get result and print it
+    answer = masking_client.answer()
+    masking_client.close()
+    end = perf_counter()
+    print(f"Final Result Matrix = {answer}\n")
+    print(f"Masking Client ran for {end - start} seconds\n")
+
+    # Print outcome (i.e. answer's correctness)
+    print_outcome(answer, matrix_a, matrix_b)
\ No newline at end of file
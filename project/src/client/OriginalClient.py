@@ -1,13 +1,18 @@
-from socket import socket, SOL_SOCKET, SO_REUSEADDR
-from pickle import loads, dumps
-from numpy import ndarray, array_split, dot
+from numpy import ndarray, result_type, array_split
 from queue import Queue
+from threading import Lock
+from typing import Any
 from time import perf_counter
 from logging import getLogger
-from project.src.client.Shared import get_result, handle_server, select_servers, print_outcome, validate_inputs, MATRIX_B_WIDTH
+from project.src.client.Shared import get_result, get_operand, select_servers, print_outcome, validate_inputs, MATRIX_B_WIDTH
 from project.src.ExceptionHandler import handle_exceptions
-from project.src.Shared import (Address, HORIZONTAL_PARTITIONS, LENGTH, VERTICAL_PARTITIONS,
-                                create_logger, generate_matrix, timing)
+from project.src.client.ConnectionPool import ConnectionPool
+from project.src.client.PartitionPlanner import PartitionPlanner
+from project.src.client.ResultAssembler import ResultAssembler
+from project.src.client.StrassenPlanner import StrassenPlanner, StrassenAssembler, strassen_operands
+from project.src.client.Scheduler import Scheduler, Tile, WorkerStatistics, REQUEST_TIMEOUT, STRAGGLER_FACTOR, MAX_DUPLICATES
+from project.src.client.FreivaldsVerifier import FreivaldsVerifier
+from project.src.Shared import Address, LENGTH, create_logger, generate_matrix, timing
 
 CLIENT_LOGGER = getLogger(__name__)
 """Client logger"""
@@ -15,22 +20,75 @@ CLIENT_LOGGER = getLogger(__name__)
 # TODO Implement load balancer for client-servers
 
 class OriginalClient():
-    def __init__(self, matrix_a: ndarray, matrix_b: ndarray, length: int = LENGTH, matrix_b_width: int = MATRIX_B_WIDTH):
+    def __init__(self, matrix_a: ndarray, matrix_b: ndarray, length: int = LENGTH, matrix_b_width: int = MATRIX_B_WIDTH,
+                 planner: PartitionPlanner | None = None, strassen: StrassenPlanner | None = None, verifier: FreivaldsVerifier | None = None,
+                 request_timeout: float | None = REQUEST_TIMEOUT, straggler_factor: float = STRAGGLER_FACTOR, max_duplicates: float = MAX_DUPLICATES):
         create_logger("client.log")
         CLIENT_LOGGER.info("Starting Original Client...\n")
 
         # Ensure matrix dimensions are valid
         validate_inputs(length, matrix_b_width, CLIENT_LOGGER)
-        
-        # Store server(s) results (i.e. Value = Chunk of Matrix A * Chunk of Matrix B at Key = given position)
-        self._matrix_products: dict[int, ndarray] = { }
 
-        # Server(s) to send jobs to
-        self._server_addresses: list[Address] = select_servers(CLIENT_LOGGER)
+        # Server(s) to send jobs to and their CPU, available RAM
+        self._servers: dict[Address, tuple[int, float]] = select_servers(CLIENT_LOGGER)
+        self._server_addresses: list[Address] = list(self._servers)
         CLIENT_LOGGER.info(f"Sending jobs to {self._server_addresses}\n")
 
-        # Create and queue partitions of Matrix A and Matrix B and their position, to be sent to selected server(s)
-        self._partitions: Queue = self._queue_partitions(matrix_a, matrix_b)
+        # Number of horizontal and vertical partitions, chosen from matrix shapes and server(s)
+        planner = planner or PartitionPlanner()
+        self._plan = planner.plan(matrix_a.shape, matrix_b.shape, matrix_a.itemsize, self._servers, CLIENT_LOGGER)
+
+        # Number of Strassen-Winograd levels, if enabled (i.e. 7 ** depth independent products replace the classical partitions)
+        self._depth = strassen.depth(matrix_a, matrix_b, CLIENT_LOGGER) if strassen else 0
+
+        # Server(s) with enough RAM to sum each row of partitions themselves (i.e. sent tiles of partitions, and send back one result per tile)
+        self._accumulators = set() if self._depth else planner.accumulators(matrix_a.shape, matrix_b.shape, matrix_a.itemsize, self._plan, self._servers, CLIENT_LOGGER)
+
+        # Preallocated result, which server(s) results (i.e. Chunk of Matrix A * Chunk of Matrix B) are accumulated into as they arrive
+        # (or Strassen-Winograd products, combined once they've all arrived)
+        if self._depth: self._result = StrassenAssembler(matrix_a.shape[0], matrix_b.shape[1], self._depth)
+        else: self._result = ResultAssembler(matrix_a.shape[0], matrix_b.shape[1], self._plan.horizontal, self._plan.vertical,
+                                             result_type(matrix_a.dtype, matrix_b.dtype))
+
+        # Checks each result from server(s) and the final result (i.e. Matrix A * Matrix B), without recomputing them
+        self._verifier, self._factors = verifier or FreivaldsVerifier(), [matrix_a, matrix_b]
+
+        # Time (seconds) after which a job sent to a server is abandoned, and when (and how often) partitions straggling on a server are run again on an idle one
+        self._request_timeout, self._straggler_factor, self._max_duplicates = request_timeout, straggler_factor, max_duplicates
+
+        # Partitions completed and busy, idle time of client and each server during the last call to answer()
+        self._statistics: dict[Address | str, WorkerStatistics] = { }
+
+        # Persistent connections to server(s), reused across partitions and calls to answer()
+        self._connection_pool = ConnectionPool(CLIENT_LOGGER)
+
+        # Partitions of Matrix B prepared for sending and their content hash (i.e. Key = vertical partition), so server(s) can cache them
+        self._operands: dict[int, tuple[Any, bytes]] = { }
+        self._operand_lock = Lock()
+
+        # Create and queue partitions of Matrix A and Matrix B (or Strassen-Winograd operands) and their position, to be sent to selected server(s)
+        self._partitions: Queue = self._queue_strassen(matrix_a, matrix_b) if self._depth else self._queue_partitions(matrix_a, matrix_b)
+
+    def _queue_strassen(self, matrix_a: ndarray, matrix_b: ndarray) -> Queue:
+        """
+        Create and queue operands of each Strassen-Winograd product and their position (i.e. client does the additions, worker(s) the products)
+
+        Args:
+            matrix_a (ndarray): Matrix A
+            matrix_b (ndarray): Matrix B
+
+        Returns:
+            Queue: Queue of operands and their position
+        """
+        start = perf_counter()
+        queue = Queue()
+
+        for i, (sub_matrix_a, sub_matrix_b) in enumerate(strassen_operands(matrix_a, matrix_b, self._depth)): queue.put((sub_matrix_a, sub_matrix_b, i))
+
+        end = perf_counter()
+        CLIENT_LOGGER.info(f"Created {queue.qsize()} Strassen-Winograd products and queue in {timing(end, start)} seconds\n")
+
+        return queue
 
     def _queue_partitions(self, matrix_a: ndarray, matrix_b: ndarray) -> Queue:
         """
@@ -45,26 +103,27 @@ class OriginalClient():
         """
         start = perf_counter()
         
+        # Number of horizontal and vertical partitions
+        horizontal_partitions, vertical_partitions, _ = self._plan
+
         # Split Matrix A horizontally
-        sub_matrices = array_split(matrix_a, HORIZONTAL_PARTITIONS, axis = 0)
+        sub_matrices = array_split(matrix_a, horizontal_partitions, axis = 0)
 
-        # Split Matrix A vertically and split Matrix B horizontally using VERTICAL_PARTITIONS (i.e., Matrix A's vertical partitions width should equal Matrix B's horizontal partitions length)
-        matrix_a_partitions, matrix_b_partitions = [m for sub_matrix in sub_matrices for m in  array_split(sub_matrix, VERTICAL_PARTITIONS, axis = 1)], array_split(matrix_b, VERTICAL_PARTITIONS, axis = 0)
+        # Split Matrix A vertically and split Matrix B horizontally using vertical_partitions (i.e., Matrix A's vertical partitions width should equal Matrix B's horizontal partitions length)
+        matrix_a_partitions, matrix_b_partitions = [m for sub_matrix in sub_matrices for m in  array_split(sub_matrix, vertical_partitions, axis = 1)], array_split(matrix_b, vertical_partitions, axis = 0)
 
         # Declare queue to be populated and returned
         queue = Queue()
         
-        for i in range(len(matrix_a_partitions)):
-            # Current subset of Matrix A and Matrix B
-            sub_matrix_a, sub_matrix_b = matrix_a_partitions[i], matrix_b_partitions[i % VERTICAL_PARTITIONS]
-
-            # Have client compute some of the partitions (add 1 to account for client)
-            if i % (len(self._server_addresses) + 1) == 0:
-                self._matrix_products[i] = dot(sub_matrix_a, sub_matrix_b)
+        for i in range(0, len(matrix_a_partitions), vertical_partitions):
+            # Current row of partitions of Matrix A, and their partitions of Matrix B
+            row = [(matrix_a_partitions[i + j], matrix_b_partitions[j], i + j) for j in range(vertical_partitions)]
 
-            # ...while server(s) compute the rest
+            # Queue every partition; client and server(s) each pull their next one as soon as they're free
+            # (queue each row as a tile if any server sums rows itself; other workers split it back into partitions)
+            if self._accumulators: queue.put(Tile(row))
             else:
-                queue.put((sub_matrix_a, sub_matrix_b, i))
+                for partitions in row: queue.put(partitions)
 
         end = perf_counter()
         CLIENT_LOGGER.info(f"Created partitions and queue in {timing(end, start)} seconds\n")
@@ -79,69 +138,70 @@ class OriginalClient():
             ndarray: Product of Matrix A and Matrix B 
         """
         return get_result(self, CLIENT_LOGGER)
-        
-    @handle_exceptions(CLIENT_LOGGER)
-    def _work(self) -> None:
-        """
-        Send partitioned matrices to server(s), get results,
-        then add them to dictionary for combining later
-        """
-        # Index used to determine where to connect (i.e. cycles through available servers; round robin)
-        i = 0
-
-        start_work = perf_counter()
 
-        # While there's still partitions to send to server(s)
-        while not self._partitions.empty():
-            try:
-                with socket() as sock:
-                    # Allow reuse of address
-                    sock.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+    @property
+    def statistics(self) -> dict[Address | str, WorkerStatistics]:
+        """
+        Partitions completed and busy, idle time of client and each server during the last call to answer()
 
-                    # Address of server
-                    server_address = self._server_addresses[i % len(self._server_addresses)]
+        Returns:
+            dict[Address | str, WorkerStatistics]: Statistics of each worker
+        """
+        return self._statistics
 
-                    # Start timer
-                    start = perf_counter()
+    def close(self) -> None:
+        """
+        Close persistent connections to server(s)
+        """
+        self._connection_pool.close()
+        
+    def _prepare(self, partitions: tuple[ndarray, ndarray, int]) -> tuple[tuple[ndarray], ndarray, bytes]:
+        """
+        Get data to send to server for partitions
 
-                    # Connect to server
-                    sock.connect(server_address)
-                    connection_timer = perf_counter()
-                    CLIENT_LOGGER.info(f"Original Client connected to Server at {server_address} in {timing(connection_timer, start)} seconds\n")
+        Args:
+            partitions (tuple[ndarray, ndarray, int]): Partitions of Matrix A and Matrix B and their position
 
-                    # Get partitions to send to server
-                    partitions = self._partitions.get(timeout = 0.1)
-                    print(f"Sending to server: {partitions}\n")
+        Returns:
+            tuple[tuple[ndarray], ndarray, bytes]: Partition of Matrix A, partition of Matrix B, and content hash of partition of Matrix B
+        """
+        sub_matrix_a, sub_matrix_b, index = partitions
 
-                    # Receive result from server
-                    data = handle_server(sock, dumps(partitions), CLIENT_LOGGER)
-                    
-                    # Unpack data (i.e. position and product of partitions) from server
-                    index, result = loads(data)
+        # Every Strassen-Winograd product has its own operand of Matrix B
+        return (sub_matrix_a,), *get_operand(self, index if self._depth else index % self._plan.vertical, sub_matrix_b)
 
-                    end = perf_counter()
-                    CLIENT_LOGGER.info(f"Original Client connected, sent, received, and unpacked data from Server at {server_address} in {timing(end, start)} seconds\n")
+    def _process_result(self, index: int, result: ndarray) -> ndarray:
+        """
+        Get product of partitions from server's result (i.e. result as is)
 
-                    # Check if result and index was received (i.e. not None)
-                    if result is not None:
-                        #print(f"Result Matrix from Server at {server_address} = {result}\n")
-                        CLIENT_LOGGER.info(f"Successfully received valid result from Server at {server_address}\n")
+        Args:
+            index (int): Position of result
+            result (ndarray): Product of partitions of Matrix A and Matrix B
 
-                        # Add result to dict, to be combined into final result later
-                        self._matrix_products[index] = result
+        Returns:
+            ndarray: Product of partitions of Matrix A and Matrix B, to be verified before it's accumulated
+        """
+        return result
 
-                    else:
-                        CLIENT_LOGGER.error(f"Failed to receive valid result from Server at {server_address}; retrying later...\n")
+    def _add_product(self, index: int, product: ndarray) -> None:
+        """
+        Accumulate product of partitions into its rows of result
 
-                        # Put partitions back into queue (since it was previously removed via .get()), to try again later
-                        self._partitions.put(partitions)
+        Args:
+            index (int): Position of product
+            product (ndarray): Product of partitions of Matrix A and Matrix B
+        """
+        self._result.add(index, product)
 
-                    # Increment index
-                    i += 1
-            
-            finally:
-                end_work = perf_counter()
-                CLIENT_LOGGER.info(f"Original Client worked for {timing(end_work, start_work)} seconds\n")
+    @handle_exceptions(CLIENT_LOGGER)
+    def _work(self) -> None:
+        """
+        Multiply partitioned matrices with client and server(s) (each pulling partitions as soon as it's free), get results,
+        then add them to dictionary for combining later
+        """
+        self._statistics = Scheduler(self, self._servers if self._plan.distribute else { }, CLIENT_LOGGER, accumulators = self._accumulators,
+                                     verifier = self._verifier, request_timeout = self._request_timeout, straggler_factor = self._straggler_factor,
+                                     max_duplicates = self._max_duplicates).run()
 
 if __name__ == "__main__":    
     # Generate example matrices for testing
@@ -153,13 +213,15 @@ if __name__ == "__main__":
     start = perf_counter()
 
     # Create Original Client to multiply matrices
-    unencrypted_client = OriginalClient(matrix_a, matrix_b)
+    # (Example matrices are tiny, so distribute them regardless of size)
+    unencrypted_client = OriginalClient(matrix_a, matrix_b, planner = PartitionPlanner(local_cutoff = 0))
 
     # Get result and print it
     answer = unencrypted_client.answer()
+    unencrypted_client.close()
     end = perf_counter()
     print(f"Final Result Matrix = {answer}\n")
     print(f"Original Client ran for {end - start} seconds\n")
 
     # Print outcome (i.e. answer's correctness)
-    print_outcome(answer, matrix_a @ matrix_b)
\ No newline at end of file
+    print_outcome(answer, matrix_a, matrix_b)
\ No newline at end of file
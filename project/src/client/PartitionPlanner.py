@@ -0,0 +1,141 @@
+from math import ceil
+from time import perf_counter
+from logging import Logger
+from typing import NamedTuple
+from project.src.Shared import Address, timing
+
+BLOCK_BYTES = 16777216
+"""Target size (bytes) of each partition of Matrix A (i.e. 16 MiB)"""
+
+MIN_BLOCKS_PER_SERVER = 2
+"""Minimum number of partitions per server (and per client), so no worker idles while waiting for its next partition"""
+
+LOCAL_CUTOFF = 50000000
+"""Number of multiply-adds below which client multiplies matrices itself, rather than paying network overhead"""
+
+RAM_FRACTION = 0.25
+"""Fraction of a server's available RAM a single job (i.e. partitions and their product) may use"""
+
+class PartitionPlan(NamedTuple):
+    """
+    Tuple defining how to partition Matrix A and Matrix B
+
+    Args:
+        NamedTuple (int, int, bool): Number of horizontal partitions (i.e. rows of Matrix A),
+        number of vertical partitions (i.e. columns of Matrix A and rows of Matrix B), and whether or not to distribute partitions to server(s)
+    """
+    horizontal: int
+    vertical: int
+    distribute: bool
+
+class PartitionPlanner():
+    def __init__(self, block_bytes: int = BLOCK_BYTES, min_blocks_per_server: int = MIN_BLOCKS_PER_SERVER,
+                 local_cutoff: int = LOCAL_CUTOFF, ram_fraction: float = RAM_FRACTION):
+        # Target size (bytes) of each partition of Matrix A
+        self._block_bytes = block_bytes
+
+        # Minimum number of partitions per server (and per client)
+        self._min_blocks_per_server = min_blocks_per_server
+
+        # Number of multiply-adds below which client multiplies matrices itself
+        self._local_cutoff = local_cutoff
+
+        # Fraction of a server's available RAM a single job may use
+        self._ram_fraction = ram_fraction
+
+    def _job_bytes(self, length: int, inner: int, width: int, itemsize: int, horizontal: int, vertical: int) -> int:
+        """
+        Memory (bytes) needed by a single job (i.e. partition of Matrix A, partition of Matrix B, and their product)
+
+        Args:
+            length (int): Matrix A's length
+            inner (int): Matrix A's width (i.e. Matrix B's length)
+            width (int): Matrix B's width
+            itemsize (int): Size (bytes) of each element
+            horizontal (int): Number of horizontal partitions
+            vertical (int): Number of vertical partitions
+
+        Returns:
+            int: Memory (bytes) needed by a single job
+        """
+        rows, columns = ceil(length / horizontal), ceil(inner / vertical)
+        return (rows * columns + columns * width + rows * width) * itemsize
+
+    def accumulators(self, shape_a: tuple[int, int], shape_b: tuple[int, int], itemsize: int, plan: PartitionPlan,
+                     servers: dict[Address, tuple[int, float]], logger: Logger) -> set[Address]:
+        """
+        Choose server(s) that are sent every partition in a row of partitions at once, and sum their products themselves (i.e. one result per row of partitions
+        instead of one per partition); server(s) whose available RAM can't also hold that sum are sent each partition as a separate job
+
+        Args:
+            shape_a (tuple[int, int]): Matrix A's shape
+            shape_b (tuple[int, int]): Matrix B's shape
+            itemsize (int): Size (bytes) of each element
+            plan (PartitionPlan): Number of horizontal and vertical partitions, and whether or not to distribute them
+            servers (dict[Address, tuple[int, float]]): Server(s) to send jobs to and their CPU, available RAM (GB)
+            logger (Logger): Logger
+
+        Returns:
+            set[Address]: Server(s) that accumulate rows of partitions
+        """
+        # Nothing to sum if there's only one partition per row (or partitions aren't distributed)
+        if not plan.distribute or plan.vertical == 1: return set()
+
+        (length, inner), width = shape_a, shape_b[1]
+
+        # Sum of a row of partitions is held alongside a single job
+        tile_bytes = self._job_bytes(length, inner, width, itemsize, plan.horizontal, plan.vertical) + ceil(length / plan.horizontal) * width * itemsize
+        accumulators = { server_address for server_address, (_, ram) in servers.items() if tile_bytes <= ram * 1000000000 * self._ram_fraction }
+
+        logger.info(f"Server(s) {accumulators} accumulate rows of partitions ({tile_bytes} bytes each); the rest are sent separate partitions\n")
+
+        return accumulators
+
+    def plan(self, shape_a: tuple[int, int], shape_b: tuple[int, int], itemsize: int,
+             servers: dict[Address, tuple[int, float]], logger: Logger) -> PartitionPlan:
+        """
+        Choose number of horizontal and vertical partitions from matrix shapes, element size,
+        and number of servers and their CPU, available RAM
+
+        Args:
+            shape_a (tuple[int, int]): Matrix A's shape
+            shape_b (tuple[int, int]): Matrix B's shape
+            itemsize (int): Size (bytes) of each element
+            servers (dict[Address, tuple[int, float]]): Server(s) to send jobs to and their CPU, available RAM (GB)
+            logger (Logger): Logger
+
+        Returns:
+            PartitionPlan: Number of horizontal and vertical partitions, and whether or not to distribute them
+        """
+        start = perf_counter()
+        (length, inner), width = shape_a, shape_b[1]
+
+        # Multiply locally if there's no one to send jobs to, or matrices are too small to be worth sending
+        if not servers or length * inner * width < self._local_cutoff:
+            plan = PartitionPlan(1, 1, False)
+
+        else:
+            # Servers with more cores count as several workers (add 1 to account for client)
+            min_cpu = min(cpu for cpu, _ in servers.values()) or 1
+            workers = 1 + sum(max(1, round(cpu / min_cpu)) for cpu, _ in servers.values())
+
+            # Enough partitions to keep every worker busy, and to keep each partition of Matrix A near block_bytes
+            blocks = max(workers * self._min_blocks_per_server, ceil(length * inner * itemsize / self._block_bytes))
+
+            # Prefer horizontal partitions (i.e. independent rows of result), then split vertically;
+            # also split vertically if each partition of Matrix B would exceed block_bytes
+            horizontal = min(length, blocks)
+            vertical = min(inner, max(ceil(blocks / horizontal), ceil(inner * width * itemsize / self._block_bytes)))
+
+            # Keep each job within a fraction of the smallest available RAM reported by server(s)
+            ram = min(ram for _, ram in servers.values()) * 1000000000 * self._ram_fraction
+            while ram > 0 and self._job_bytes(length, inner, width, itemsize, horizontal, vertical) > ram and (horizontal < length or vertical < inner):
+                if horizontal < length: horizontal = min(length, horizontal * 2)
+                else: vertical = min(inner, vertical * 2)
+
+            plan = PartitionPlan(horizontal, vertical, True)
+
+        end = perf_counter()
+        logger.info(f"Planned {plan} for {shape_a} x {shape_b} matrices across {len(servers)} server(s) in {timing(end, start)} seconds\n")
+
+        return plan
@@ -0,0 +1,44 @@
+from threading import Lock
+from numpy import ndarray, dtype, zeros
+
+class ResultAssembler():
+    def __init__(self, length: int, width: int, horizontal_partitions: int, vertical_partitions: int, result_dtype: dtype):
+        # Preallocated result, which products of partitions are accumulated into as soon as they arrive
+        self._matrix = zeros((length, width), dtype = result_dtype)
+
+        # First row of each horizontal partition (same split as numpy.array_split), plus the row after the last one
+        size, extra = divmod(length, horizontal_partitions)
+        self._row_offsets = [i * size + min(i, extra) for i in range(horizontal_partitions + 1)]
+
+        # Products in the same row of partitions are summed into the same rows of result, so each row of partitions gets a lock
+        self._vertical_partitions = vertical_partitions
+        self._locks = [Lock() for _ in range(horizontal_partitions)]
+
+    @property
+    def matrix(self) -> ndarray:
+        """
+        Result (i.e. sum of products accumulated so far)
+
+        Returns:
+            ndarray: Result
+        """
+        return self._matrix
+
+    def add(self, index: int, product: ndarray) -> None:
+        """
+        Accumulate product of partitions into its rows of result, in place
+
+        Args:
+            index (int): Position of product (i.e. horizontal partition * vertical_partitions + vertical partition)
+            product (ndarray): Product of partitions of Matrix A and Matrix B
+
+        Raises:
+            ValueError: Product's shape doesn't match its rows of result
+        """
+        row = index // self._vertical_partitions
+        rows = slice(self._row_offsets[row], self._row_offsets[row + 1])
+
+        if product.shape != self._matrix[rows].shape:
+            raise ValueError(f"Product at position {index} has shape {product.shape}, expected {self._matrix[rows].shape}")
+
+        with self._locks[row]: self._matrix[rows] += product
@@ -0,0 +1,608 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from math import ceil
+from queue import Queue, Empty
+from statistics import median
+from threading import Condition
+from time import perf_counter
+from logging import Logger
+from os import cpu_count
+from secrets import token_bytes
+from socket import error
+from typing import NamedTuple
+from psutil import virtual_memory
+from project.src.IntegerMultiply import integer_dot
+from project.src.client.HealthCheck import HEALTH_CHECKER
+from project.src.client.FreivaldsVerifier import FreivaldsVerifier
+from project.src.Shared import Address, Accumulate, Reference, DIGEST_SIZE, SIG_FIGS, timing
+
+PIPELINE_DEPTH = 2
+"""Maximum number of jobs in flight per server (i.e. server starts its next job while the previous result is in transit)"""
+
+INITIAL_SHARE = 0.5
+"""Fraction of partitions handed out up front in chunks weighted by CPU and available RAM; the rest are pulled one at a time"""
+
+LOCAL_WORKER = "client"
+"""Name of the worker that multiplies partitions on the client itself"""
+
+REQUEST_TIMEOUT = 300.0
+"""Time (seconds) after which a job sent to a server is abandoned and the server is considered unreachable (None to wait indefinitely)"""
+
+STRAGGLER_FACTOR = 2.0
+"""Multiple of the median time per partition (across server(s)) after which partitions still running on a server count as straggling"""
+
+MAX_DUPLICATES = 0.1
+"""Largest fraction of partitions an idle server may run a second time, in place of a straggling server"""
+
+class Tile(NamedTuple):
+    """
+    Tuple defining every partition in a row of partitions (i.e. products that sum to the same rows of result), sent together to a server that accumulates them
+
+    Args:
+        NamedTuple (list[tuple]): Partitions of Matrix A and Matrix B and their position
+    """
+    partitions: list[tuple]
+
+class WorkerStatistics():
+    def __init__(self):
+        # Number of partitions completed
+        self.blocks = 0
+
+        # Number of partitions run a second time in place of a straggling server, and how many of them finished first
+        self.duplicates = self.wins = 0
+
+        # Number of partitions whose result failed verification (i.e. server is suspect, since it computed them wrong; they were run again elsewhere)
+        self.rejected = 0
+
+        # Time (seconds) spent computing or waiting on server
+        self.busy = 0.0
+
+        # Time (seconds) spent with nothing left to do, while other workers finished
+        self.idle = 0.0
+
+    def __repr__(self) -> str:
+        return (f"WorkerStatistics(blocks = {self.blocks}, duplicates = {self.duplicates}, wins = {self.wins}, rejected = {self.rejected}, "
+                f"busy = {round(self.busy, SIG_FIGS)}, idle = {round(self.idle, SIG_FIGS)})")
+
+class Running():
+    def __init__(self, partitions: tuple | Tile, prepared: tuple | None):
+        # Partitions (or tile) and when they were first sent
+        self.partitions = partitions
+        self.started = perf_counter()
+
+        # Data sent for partitions, reused by every attempt so their results are interchangeable (None for a tile, whose partitions are prepared as they're sent)
+        self.prepared = prepared
+
+        # Server(s) running partitions, when each started, and their responses
+        self.attempts: dict[Address, tuple[float, list[Future]]] = { }
+
+    @property
+    def count(self) -> int:
+        """
+        Number of partitions running (i.e. more than one for a tile)
+
+        Returns:
+            int: Number of partitions
+        """
+        return len(self.partitions.partitions) if isinstance(self.partitions, Tile) else 1
+
+class Scheduler():
+    def __init__(self, client, servers: dict[Address, tuple[int, float]], logger: Logger,
+                 pipeline_depth: int = PIPELINE_DEPTH, initial_share: float = INITIAL_SHARE, accumulators: set[Address] | None = None,
+                 request_timeout: float | None = REQUEST_TIMEOUT, straggler_factor: float = STRAGGLER_FACTOR, max_duplicates: float = MAX_DUPLICATES,
+                 verifier: FreivaldsVerifier | None = None):
+        self._client = client
+        self._servers = servers
+        self._logger = logger
+        self._pipeline_depth = pipeline_depth
+        self._initial_share = initial_share
+        self._request_timeout = request_timeout
+        self._straggler_factor = straggler_factor
+
+        # Checks every result received from server(s) before it's accumulated (i.e. a wrong result is run again elsewhere, rather than corrupting result)
+        self._verifier = verifier or FreivaldsVerifier()
+
+        # Server(s) that sum the products of a tile themselves (every other worker splits tiles into separate partitions)
+        self._accumulators: set[Address] = accumulators or set()
+
+        # Shared queue of partitions (i.e. partitions of Matrix A and Matrix B and their position)
+        self._partitions: Queue = client._partitions
+
+        # Partitions handed to each worker up front, which idle workers may steal from
+        self._backlogs: dict[Address | str, deque] = { worker: deque() for worker in [LOCAL_WORKER, *servers] }
+
+        # Partitions running on server(s) (i.e. Key = position), positions whose result was already accumulated (i.e. later results are discarded),
+        # time per partition of each result received from server(s), and number of duplicates idle server(s) may still start
+        self._running: dict[int, Running] = { }
+        self._finished: set[int] = set()
+        self._durations: list[float] = [ ]
+        self._duplicates_left = ceil(self._partitions.qsize() * max_duplicates)
+
+        # Guards the above, and wakes idle server(s) waiting for a straggler whenever partitions finish or are put back
+        self._lock = Condition()
+
+        self.statistics: dict[Address | str, WorkerStatistics] = { worker: WorkerStatistics() for worker in self._backlogs }
+
+    def _weights(self) -> dict[Address | str, float]:
+        """
+        Relative capacity of each worker, from its CPU and available RAM (each normalized by their mean)
+
+        Returns:
+            dict[Address | str, float]: Weight of each worker
+        """
+        capacities = { LOCAL_WORKER: (cpu_count() or 1, virtual_memory().available / 1000000000), **self._servers }
+        mean_cpu = sum(cpu for cpu, _ in capacities.values()) / len(capacities) or 1
+        mean_ram = sum(ram for _, ram in capacities.values()) / len(capacities) or 1
+
+        return { worker: (cpu / mean_cpu + ram / mean_ram) / 2 for worker, (cpu, ram) in capacities.items() }
+
+    def _hand_out(self) -> None:
+        """
+        Hand each worker an initial chunk of partitions, sized by its weight
+        """
+        weights = self._weights()
+        total_weight, share = sum(weights.values()), int(self._partitions.qsize() * self._initial_share)
+
+        for worker, weight in weights.items():
+            for _ in range(int(share * weight / total_weight)):
+                try: self._backlogs[worker].append(self._partitions.get_nowait())
+                except Empty: return
+
+    def _next(self, worker: Address | str) -> tuple | Tile | None:
+        """
+        Get worker's next partitions: from its own backlog, then the shared queue, then by stealing from the largest backlog;
+        a tile taken by a worker that doesn't accumulate is split, and the rest of its partitions go to the front of worker's backlog
+
+        Args:
+            worker (Address | str): Worker
+
+        Returns:
+            tuple | Tile | None: Partitions of Matrix A and Matrix B and their position, or tile of them (accumulating server(s) only);
+            None if there's nothing left
+        """
+        with self._lock:
+            partitions = self._take(worker)
+
+            if isinstance(partitions, Tile) and worker not in self._accumulators:
+                self._backlogs[worker].extendleft(reversed(partitions.partitions[1:]))
+                partitions = partitions.partitions[0]
+
+            return partitions
+
+    def _take(self, worker: Address | str) -> tuple | Tile | None:
+        """
+        Get worker's next item from its own backlog, then the shared queue, then by stealing from the largest backlog (call while holding lock)
+
+        Args:
+            worker (Address | str): Worker
+
+        Returns:
+            tuple | Tile | None: Partitions of Matrix A and Matrix B and their position, or tile of them; None if there's nothing left
+        """
+        if self._backlogs[worker]: return self._backlogs[worker].popleft()
+
+        try: return self._partitions.get_nowait()
+        except Empty: pass
+
+        # Steal from the end of the largest backlog (i.e. the partitions its owner would reach last)
+        victim = max(self._backlogs, key = lambda other: len(self._backlogs[other]))
+        if self._backlogs[victim]:
+            self._logger.info(f"Worker {worker} stole partitions from {victim}\n")
+            return self._backlogs[victim].pop()
+
+        return None
+
+    def _return_backlog(self, worker: Address | str) -> None:
+        """
+        Put worker's remaining backlog back into shared queue (i.e. worker can no longer compute them)
+
+        Args:
+            worker (Address | str): Worker
+        """
+        with self._lock:
+            while self._backlogs[worker]: self._partitions.put(self._backlogs[worker].popleft())
+            self._lock.notify_all()
+
+    def _put_back(self, partitions: tuple | Tile) -> None:
+        """
+        Put partitions (or tile) back into shared queue, for any worker to take
+
+        Args:
+            partitions (tuple | Tile): Partitions of Matrix A and Matrix B and their position, or tile of them
+        """
+        with self._lock:
+            self._partitions.put(partitions)
+            self._lock.notify_all()
+
+    def _has_work(self) -> bool:
+        """
+        Whether or not any partitions are waiting in shared queue or a backlog
+
+        Returns:
+            bool: True if there are partitions left to take, else False
+        """
+        with self._lock: return not self._partitions.empty() or any(self._backlogs.values())
+
+    def _position(self, partitions: tuple | Tile) -> int:
+        """
+        Position partitions (or tile) are tracked under while running (i.e. position of a tile's first partition)
+
+        Args:
+            partitions (tuple | Tile): Partitions of Matrix A and Matrix B and their position, or tile of them
+
+        Returns:
+            int: Position
+        """
+        return partitions.partitions[0][-1] if isinstance(partitions, Tile) else partitions[-1]
+
+    def _start(self, server_address: Address, partitions: tuple | Tile, prepared: tuple | None) -> None:
+        """
+        Record that server started running partitions (or tile) taken from a queue
+
+        Args:
+            server_address (Address): Server address
+            partitions (tuple | Tile): Partitions of Matrix A and Matrix B and their position, or tile of them
+            prepared (tuple | None): Data sent for partitions; None for a tile
+        """
+        with self._lock:
+            running = self._running.setdefault(self._position(partitions), Running(partitions, prepared))
+            running.attempts[server_address] = (perf_counter(), [ ])
+
+    def _sent(self, position: int, server_address: Address, response: Future) -> None:
+        """
+        Record server's response to (a partition of) partitions it's running, so it can be cancelled if another server finishes them first
+
+        Args:
+            position (int): Position of partitions
+            server_address (Address): Server address
+            response (Future): Response from server
+        """
+        with self._lock:
+            running = self._running.get(position)
+
+            if running is not None and server_address in running.attempts: running.attempts[server_address][1].append(response)
+            else: self._client._connection_pool.cancel(server_address, response)
+
+    def _claimed(self, position: int) -> bool:
+        """
+        Whether or not a result of partitions was already accumulated
+
+        Args:
+            position (int): Position of partitions
+
+        Returns:
+            bool: True if partitions are finished, else False
+        """
+        with self._lock: return position in self._finished
+
+    def _claim(self, position: int, server_address: Address) -> bool:
+        """
+        Accept server's result of partitions if it's the first to arrive, cancelling every other server's attempt at them (i.e. result is accumulated exactly once)
+
+        Args:
+            position (int): Position of partitions
+            server_address (Address): Server address
+
+        Returns:
+            bool: True if result is to be accumulated, else False (i.e. another server's result arrived first)
+        """
+        with self._lock:
+            if position in self._finished: return False
+            self._finished.add(position)
+
+            running = self._running.pop(position, None)
+
+            if running is not None:
+                started, _ = running.attempts.pop(server_address, (running.started, [ ]))
+                self._durations.append((perf_counter() - started) / running.count)
+
+                for other, (_, responses) in running.attempts.items():
+                    for response in responses: self._client._connection_pool.cancel(other, response)
+
+            self._lock.notify_all()
+
+            return True
+
+    def _reject(self, position: int, partitions: tuple | Tile) -> None:
+        """
+        Undo claim on partitions (or tile) whose result failed verification, putting them back into queue for any worker to take
+
+        Args:
+            position (int): Position of partitions
+            partitions (tuple | Tile): Partitions of Matrix A and Matrix B and their position, or tile of them
+        """
+        with self._lock:
+            self._finished.discard(position)
+            self._partitions.put(partitions)
+            self._lock.notify_all()
+
+    def _abandon(self, position: int, server_address: Address) -> bool:
+        """
+        Forget server's attempt at partitions (e.g. it failed or timed out)
+
+        Args:
+            position (int): Position of partitions
+            server_address (Address): Server address
+
+        Returns:
+            bool: True if no other server is still running partitions (i.e. caller puts them back into queue), else False
+        """
+        with self._lock:
+            running = self._running.get(position)
+            if running is None or position in self._finished: return False
+
+            running.attempts.pop(server_address, None)
+            if running.attempts: return False
+
+            del self._running[position]
+            self._lock.notify_all()
+
+            return True
+
+    def _straggler(self, server_address: Address) -> Running | None:
+        """
+        Wait for partitions running on another server to straggle (i.e. run for longer than straggler_factor times the median time per partition),
+        then start running them on server too; stops waiting once there are partitions to take, nothing left running, or no duplicates left
+
+        Args:
+            server_address (Address): Server address (i.e. idle server)
+
+        Returns:
+            Running | None: Straggling partitions, now also running on server; None if there's nothing to run a second time
+        """
+        with self._lock:
+            while self._duplicates_left > 0 and self._running and self._partitions.empty() and not any(self._backlogs.values()):
+                now, timeout = perf_counter(), None
+
+                if self._durations:
+                    threshold = self._straggler_factor * median(self._durations)
+
+                    # Partitions server may run (i.e. tiles only on accumulating server(s)), that aren't running a second time already
+                    candidates = [running for running in self._running.values() if len(running.attempts) == 1 and server_address not in running.attempts
+                                  and (server_address in self._accumulators or not isinstance(running.partitions, Tile))]
+                    lag, running = max(((now - running.started - threshold * running.count, running) for running in candidates),
+                                       key = lambda lagging: lagging[0], default = (None, None))
+
+                    if running is not None and lag >= 0:
+                        running.attempts[server_address] = (now, [ ])
+                        self._duplicates_left -= 1
+
+                        self._logger.info(f"Partitions {self._position(running.partitions)} are straggling on {[*running.attempts][0]} "
+                                          f"({timing(now, running.started)} seconds); running them on Server at {server_address} too\n")
+                        return running
+
+                    # Check again when the most lagging one would start straggling
+                    if running is not None: timeout = -lag
+
+                self._lock.wait(timeout)
+
+            return None
+
+    def _work_locally(self) -> bool:
+        """
+        Multiply partitions on the client itself until there's nothing left
+
+        Returns:
+            bool: True (i.e. client is always reachable)
+        """
+        statistics = self.statistics[LOCAL_WORKER]
+
+        while (partitions := self._next(LOCAL_WORKER)) is not None:
+            start = perf_counter()
+            sub_matrix_a, sub_matrix_b, index = partitions
+
+            self._client._add_product(index, integer_dot(sub_matrix_a, sub_matrix_b))
+
+            statistics.blocks += 1
+            statistics.busy += perf_counter() - start
+
+        return True
+
+    def _work_with_server(self, server_address: Address) -> bool:
+        """
+        Send partitions to a single server until there's nothing left, keeping up to pipeline_depth jobs in flight;
+        every partition of a tile is sent to the same server, which sends back only their sum. Once idle, server also runs partitions straggling on another server
+        (whichever result arrives first is used), and jobs taking longer than request_timeout are abandoned
+
+        Args:
+            server_address (Address): Server address
+
+        Returns:
+            bool: True if server stayed reachable, else False
+        """
+        statistics = self.statistics[server_address]
+
+        # Jobs in flight (i.e. Key = response from server, Value = partitions, accumulate request of their tile (if any), position, and time sent)
+        jobs: dict[Future, tuple[tuple, Accumulate | None, int, float]] = { }
+        reachable = True
+
+        # Partitions waiting to be sent (i.e. rest of the current tile, or partitions of a tile the server no longer had operands for) and their data, if prepared;
+        # tiles being accumulated, and positions of partitions run a second time
+        unsent: deque[tuple[tuple, Accumulate | None, int, tuple | None]] = deque()
+        tiles: dict[bytes, Tile] = { }
+        duplicates: set[int] = set()
+
+        def drop(accumulate: Accumulate) -> None:
+            # Stop accumulating tile (telling server to drop its partial sum), putting it back into queue (once) unless another server is still running it
+            tile = tiles.pop(accumulate.digest, None)
+
+            if tile is not None:
+                self._client._connection_pool.discard(server_address, accumulate)
+                if self._abandon(self._position(tile), server_address): self._put_back(tile)
+
+            for entry in [entry for entry in unsent if entry[1] == accumulate]: unsent.remove(entry)
+
+        def fail(partitions: tuple, accumulate: Accumulate | None, position: int) -> None:
+            # Give up on partitions (or their whole tile), putting them back into queue unless another server is still running them
+            if accumulate is not None: drop(accumulate)
+            elif self._abandon(position, server_address): self._put_back(partitions)
+
+        def unreachable() -> None:
+            # Stop sending to server, leaving its backlog (and tiles still waiting to resend a partition) for other worker(s)
+            nonlocal reachable
+            reachable = False
+
+            while unsent: drop(unsent[0][1])
+            self._return_backlog(server_address)
+
+            # Probe server again the next time it's considered
+            HEALTH_CHECKER.invalidate(server_address)
+
+        while True:
+            # Top up jobs in flight
+            while reachable and len(jobs) < self._pipeline_depth:
+                if not unsent:
+                    if (partitions := self._next(server_address)) is not None:
+                        prepared = None if isinstance(partitions, Tile) else self._client._prepare(partitions)
+                        self._start(server_address, partitions, prepared)
+
+                    # Nothing left to take, so once idle, run whatever is straggling on another server (using the same data, so either result can be used)
+                    elif not jobs and (running := self._straggler(server_address)) is not None:
+                        partitions, prepared = running.partitions, running.prepared
+                        duplicates.add(self._position(partitions))
+                        statistics.duplicates += running.count
+
+                    # Wait for jobs in flight, or take partitions that were put back while waiting for a straggler
+                    elif jobs or not self._has_work(): break
+                    else: continue
+
+                    # Tag every partition of a tile with the same key, so server sums their products
+                    if isinstance(partitions, Tile):
+                        accumulate = Accumulate(token_bytes(DIGEST_SIZE), len(partitions.partitions))
+                        tiles[accumulate.digest] = partitions
+                        unsent.extend((tile_partitions, accumulate, self._position(partitions), None) for tile_partitions in partitions.partitions)
+
+                    else: unsent.append((partitions, None, self._position(partitions), prepared))
+
+                partitions, accumulate, position, prepared = unsent.popleft()
+
+                try:
+                    # Send (prepared) partitions to server, tagged with a job ID (partition of Matrix B is only sent if server doesn't have it cached)
+                    response = self._client._connection_pool.submit_cached(server_address, *(prepared or self._client._prepare(partitions)), accumulate)
+                    jobs[response] = (partitions, accumulate, position, perf_counter())
+                    self._sent(position, server_address, response)
+
+                except (ConnectionError, error):
+                    self._logger.exception(f"Unable to send partitions to Server at {server_address}; leaving them for other worker(s)...\n")
+
+                    # Put partitions (or their whole tile) back into queue, for other worker(s) to take
+                    fail(partitions, accumulate, position)
+                    unreachable()
+
+            if not jobs: return reachable
+
+            # Wait for any job in flight to finish, or the oldest one to time out
+            deadline = None if self._request_timeout is None else min(sent for *_, sent in jobs.values()) + self._request_timeout
+            done, _ = wait(jobs, timeout = None if deadline is None else max(0.0, deadline - perf_counter()), return_when = FIRST_COMPLETED)
+
+            # Abandon jobs that timed out (i.e. server is hung or too slow), and stop sending to server
+            if not done:
+                latest = max(deadline, perf_counter()) - self._request_timeout
+
+                for job in [job for job, (*_, sent) in jobs.items() if sent <= latest]:
+                    partitions, accumulate, position, _ = jobs.pop(job)
+                    self._client._connection_pool.cancel(server_address, job)
+
+                    self._logger.error(f"Server at {server_address} took longer than {self._request_timeout} seconds on partition {partitions[-1]}; "
+                                       f"leaving it for other worker(s)...\n")
+                    fail(partitions, accumulate, position)
+
+                if reachable: unreachable()
+                continue
+
+            for job in done:
+                partitions, accumulate, position, sent = jobs.pop(job)
+                *_, index = partitions
+
+                # Another server's result for these partitions arrived first
+                if job.cancelled() or self._claimed(position):
+                    if accumulate is not None: drop(accumulate)
+                    continue
+
+                # Result, followed by any extra payloads (e.g. positions of unknowns, for numeric substitution)
+                try: result, *extra = job.result()
+
+                except ConnectionError:
+                    self._logger.exception(f"Lost connection to Server at {server_address}\n")
+                    result, extra = None, [ ]
+
+                # Tile was already finished, or put back after one of its partitions failed
+                if accumulate is not None and accumulate.digest not in tiles: continue
+
+                # Server no longer has partition of Matrix B cached, so put partitions back into queue (it will be uploaded next time);
+                # a tile's partition is resent to the same server instead, since the rest of the tile is summed there
+                if isinstance(result, Reference):
+                    self._logger.info(f"Server at {server_address} no longer has operand {result.digest.hex()} cached; resending partition {index} later...\n")
+
+                    if accumulate is not None and reachable: unsent.appendleft((partitions, accumulate, position, None))
+                    else: fail(partitions, accumulate, position)
+
+                # Product was added to its tile on server
+                elif isinstance(result, Accumulate): continue
+
+                # Check if result was received (i.e. not None), and accumulate it unless another server's result for the same partitions was already accumulated
+                elif result is not None:
+                    tile = tiles.pop(accumulate.digest) if accumulate else None
+                    count = len(tile.partitions) if tile else 1
+
+                    if self._claim(position, server_address):
+                        product = self._client._process_result(index, result, *extra)
+
+                        # Check product against partitions with Freivalds' algorithm (i.e. O(n ** 2) rather than recomputing it); a wrong product is never accumulated,
+                        # its partitions (or tile) are run again elsewhere, and server is no longer sent partitions
+                        if not self._verifier.verify([[sub_matrix_a, sub_matrix_b] for sub_matrix_a, sub_matrix_b, _ in (tile.partitions if tile else [partitions])], product):
+                            self._logger.error(f"Result for {'tile of ' if tile else ''}partition {position} from Server at {server_address} failed verification; "
+                                               f"marking server as suspect and leaving it for other worker(s)...\n")
+
+                            self._reject(position, tile or partitions)
+                            statistics.rejected += count
+
+                            if reachable: unreachable()
+                            continue
+
+                        self._logger.info(f"Successfully received valid result for {'tile of ' if accumulate else ''}partition {position} from Server at {server_address}\n")
+                        self._client._add_product(index, product)
+
+                        statistics.blocks += count
+                        statistics.wins += count if position in duplicates else 0
+                        statistics.busy += perf_counter() - sent
+
+                    else: self._logger.info(f"Discarded result for partition {index} from Server at {server_address} (another server finished it first)\n")
+
+                else:
+                    self._logger.error(f"Failed to receive valid result from Server at {server_address}; retrying later...\n")
+
+                    # Put partitions (or their whole tile) back into queue (since it was previously removed), to try again later
+                    fail(partitions, accumulate, position)
+
+    def run(self) -> dict[Address | str, WorkerStatistics]:
+        """
+        Multiply all partitions with the client and server(s) concurrently, each pulling its next partition as soon as it's free
+
+        Returns:
+            dict[Address | str, WorkerStatistics]: Partitions completed and busy, idle time of each worker
+        """
+        start = perf_counter()
+        server_addresses = list(self._servers)
+        self._hand_out()
+
+        # Rerun workers while partitions remain (e.g. a worker finished just before another put a failed partition back)
+        while not self._partitions.empty() or any(self._backlogs.values()):
+            with ThreadPoolExecutor(max_workers = len(server_addresses) + 1, thread_name_prefix = "Scheduler") as executor:
+                workers = { executor.submit(self._work_locally): LOCAL_WORKER }
+                workers.update({ executor.submit(self._work_with_server, server_address): server_address for server_address in server_addresses })
+
+                # Record when each worker ran out of work
+                finished = { }
+                for worker in workers: worker.add_done_callback(lambda done: finished.__setitem__(workers[done], perf_counter()))
+
+            end = perf_counter()
+            for worker, time in finished.items(): self.statistics[worker].idle += end - time
+
+            # Stop sending to server(s) whose worker could not reach them
+            server_addresses = [server_address for worker, server_address in workers.items() if server_address != LOCAL_WORKER and worker.result()]
+
+        end = perf_counter()
+        self._logger.info(f"Scheduler ran for {timing(end, start)} seconds: {self.statistics}\n")
+
+        return self.statistics
@@ -1,17 +1,22 @@
-from numpy import ndarray, random, concatenate, array_equal
+from numpy import ndarray, random
 from time import perf_counter
 from random import sample
 from logging import Logger
-from socket import socket, error, SOL_SOCKET, SO_REUSEADDR
-from collections.abc import Iterator
-from errno import EADDRINUSE, EADDRNOTAVAIL
+from collections.abc import Callable, Iterator
+from typing import Any
 from os import path, SEEK_END
-from project.src.Shared import (timing, send, receive, cleanup, Address, ACKNOWLEDGEMENT, HORIZONTAL_PARTITIONS,
-                                VERTICAL_PARTITIONS, HEADERSIZE, SERVER_INFO_PATH)
+from datetime import datetime
+from project.src.ServerRegistry import ServerRegistry
+from project.src.client.HealthCheck import HEALTH_CHECKER
+from project.src.client.FreivaldsVerifier import FreivaldsVerifier
+from project.src.Shared import timing, cleanup, content_hash, Address, SERVER_INFO_PATH, SERVER_REGISTRY_PATH
 
 MATRIX_B_WIDTH = 4
 """Matrix B's width"""
 
+READ_BLOCK = 1048576
+"""Size (bytes) of each block read by read_file_reverse (i.e. 1 MiB)"""
+
 def validate_inputs(length: int, matrix_b_width: int, logger: Logger) -> None:
     """
     Ensure matrix dimensions are valid
@@ -24,175 +29,123 @@ def validate_inputs(length: int, matrix_b_width: int, logger: Logger) -> None:
     Raises:
         ValueError: Invalid matrix shape
     """
-    # Ensure Matrix length is not smaller than number of horizontal and/or vertical partitions
-    if length < (HORIZONTAL_PARTITIONS or VERTICAL_PARTITIONS):
-        exception_msg = f"Matrix length ({length}) cannot be smaller than number of horizontal ({HORIZONTAL_PARTITIONS}) and/or vertical ({VERTICAL_PARTITIONS}) partitions"
+    # Ensure Matrix length is positive
+    if length < 1:
+        exception_msg = f"Matrix length ({length}) must be positive"
         logger.exception(exception_msg)
         cleanup(logger)
         raise ValueError(exception_msg)
 
-    # Ensure Matrix B's width is not smaller than number of vertical partitions
-    elif matrix_b_width < VERTICAL_PARTITIONS:
-        exception_msg = f"Matrix B's width ({matrix_b_width}) cannot be smaller than number of vertical ({VERTICAL_PARTITIONS}) partitions"
+    # Ensure Matrix B's width is positive
+    elif matrix_b_width < 1:
+        exception_msg = f"Matrix B's width ({matrix_b_width}) must be positive"
         logger.exception(exception_msg)
         cleanup(logger)
         raise ValueError(exception_msg)
 
-def combine_results(matrix_products: dict[int, ndarray], logger: Logger) -> ndarray:
+def get_operand(self, index: int, matrix_b: ndarray, prepare: Callable[[ndarray], Any] = lambda matrix: matrix) -> tuple[Any, bytes]:
     """
-    Combines submatrices into a single matrix
+    Get partition of Matrix B (prepared for sending) and its content hash, preparing and hashing each partition only once
 
     Args:
-        matrix_products (dict[int, ndarray]): Dictionary to store results (i.e., Value = Chunk of Matrix A * Chunk of Matrix B at Key = given position)
-        logger (Logger): Logger
-        
+        index (int): Position of partition of Matrix B (i.e. vertical partition)
+        matrix_b (ndarray): Partition of Matrix B
+        prepare (Callable[[ndarray], Any], optional): Converts partition into the form sent to server(s); defaults to sending it as is
+
     Returns:
-        ndarray: Combined result of given matrices
+        tuple[Any, bytes]: Prepared partition of Matrix B and its content hash
     """
-    start = perf_counter()
-    
-    # Get all results from the queue, sorted by its position
-    results = [value for _, value in sorted(matrix_products.items())]
+    with self._operand_lock:
+        if index not in self._operands:
+            operand = prepare(matrix_b)
+            self._operands[index] = (operand, content_hash(operand))
 
-    # End index and list for storing combined results
-    end, combined_results = 0, []
+        return self._operands[index]
 
-    # Sum all values in the same row, then add to combined_results
-    for i in range(0, len(results), VERTICAL_PARTITIONS):
-        end += VERTICAL_PARTITIONS
-        combined_results.append(sum(results[i:end]))
-
-    # Combine all results into a single matrix
-    combined_results = concatenate(combined_results)
-    
-    end = perf_counter()
-    logger.info(f"Combined submatrices into a single matrix in {timing(end, start)} seconds\n")
-    
-    return combined_results
-
-def handle_server(server_socket: socket, data: bytes, logger: Logger) -> bytes:
+def line_timestamp(line: str) -> datetime | None:
     """
-    Exchange data with server
+    Get timestamp recorded at the end of a server info line (i.e. "IP port CPU RAM OS date time")
 
     Args:
-        server_socket (socket): Server socket
-        data (bytes): Data to be sent
-        logger (Logger): Logger
-
-    Raises:
-        ValueError: Invalid acknowledgment
+        line (str): Line from server info file
 
     Returns:
-        bytes: Data received from server
+        datetime | None: Timestamp; None if line has no valid timestamp
     """
-    start_send = perf_counter()
-    
-    # Add header to and send data packet to server
-    send(server_socket, data)
-
-    end_send = perf_counter()
-    logger.info(f"Data sent in {timing(end_send, start_send)} seconds\n")
-    start_receive = perf_counter()
-    
-    # Receive acknowledgment from server
-    acknowledgement_data = server_socket.recv(HEADERSIZE)
-
-    # Verify acknowledgment
-    acknowledgement_length = int(acknowledgement_data.decode("utf-8").strip())
-    acknowledgement_msg = server_socket.recv(acknowledgement_length).decode("utf-8").strip()
-    if acknowledgement_msg != ACKNOWLEDGEMENT:
-        exception_msg = f"Invalid acknowledgment \"{acknowledgement_msg}\""
-        logger.exception(exception_msg)
-        raise ValueError(exception_msg)
-                        
-    # Receive data from server
-    data = receive(server_socket)
-
-    end_receive = perf_counter()
-    logger.info(f"Received data in {timing(end_receive, start_receive)} seconds\n")
-
-    return data
+    try: return datetime.fromisoformat(" ".join(line.rsplit(" ", 2)[-2:]))
+    except ValueError: return None
 
-def read_file_reverse(filepath: str = SERVER_INFO_PATH) -> Iterator[str]:
+def read_file_reverse(filepath: str = SERVER_INFO_PATH, max_lines: int | None = None, since: datetime | None = None,
+                      block_size: int = READ_BLOCK) -> Iterator[str]:
     """
-    Read file in reverse
+    Read file in reverse (i.e. last line first), block by block
 
     Args:
         filepath (str, optional): Path of file to read from; defaults to SERVER_INFO_PATH
+        max_lines (int | None, optional): Stop after this many lines; defaults to None (i.e. no limit)
+        since (datetime | None, optional): Stop at the first line timestamped before this (lines are appended in order); defaults to None (i.e. no cutoff)
+        block_size (int, optional): Size (bytes) of each block read; defaults to READ_BLOCK
 
     Yields:
         Iterator[str]: Line(s) in file at filepath
     """
+    count = 0
+
     with open(filepath, "rb") as file:
-        file.seek(0, SEEK_END)
-        pointer_location = file.tell()
-        buffer = bytearray()
+        pointer_location = file.seek(0, SEEK_END)
+
+        # Start of a line whose beginning is in an earlier block
+        remainder = b""
 
-        while pointer_location >= 0:
+        while pointer_location > 0:
+            # Read blocks aligned to block_size (i.e. the first, partial block is the one at the end of the file)
+            read_size = pointer_location % block_size or block_size
+            pointer_location -= read_size
             file.seek(pointer_location)
-            pointer_location -= 1
-            new_byte = file.read(1)
 
-            if new_byte == b"\n":
-                yield buffer.decode()[::-1]
-                buffer = bytearray()
+            lines = (file.read(read_size) + remainder).split(b"\n")
+            remainder = lines[0]
+
+            for line in reversed(lines[1:]):
+                line = line.decode()
+                if since is not None and line and (timestamp := line_timestamp(line)) is not None and timestamp < since: return
 
-            else: buffer.extend(new_byte)
+                yield line
+                count += 1
+                if max_lines is not None and count >= max_lines: return
 
-        if len(buffer) > 0: yield buffer.decode()[::-1]
+        if remainder:
+            line = remainder.decode()
+            if since is not None and (timestamp := line_timestamp(line)) is not None and timestamp < since: return
 
-def get_available_servers(logger: Logger, filepath: str = SERVER_INFO_PATH) -> dict[Address, tuple[int, float]]:
+            yield line
+
+def get_registered_servers(logger: Logger, filepath: str = SERVER_REGISTRY_PATH) -> dict[Address, tuple[int, float]]:
     """
-    Get all active, listening servers and their CPU, available RAM
+    Get servers with a recent heartbeat in the registry and their CPU, available RAM (expired records are removed)
 
     Args:
         logger (Logger): Logger
-        filepath (str, optional): Path of file to read from; defaults to SERVER_INFO_PATH
-
-    Raises:
-        FileNotFoundError: File containing server information does not exist
-        IOError: File containing server information is empty
+        filepath (str, optional): Path of registry; defaults to SERVER_REGISTRY_PATH
 
     Returns:
-        dict[Address, tuple[int, float]]: Dictionary of available servers and their CPU, available RAM
+        dict[Address, tuple[int, float]]: Dictionary of live servers and their CPU, available RAM
     """
-    # Ensure file containing server information exists
-    if not path.exists(filepath):
-        exception_msg = f"File at {filepath} does not exist"
-        logger.exception(exception_msg)
-        raise FileNotFoundError(exception_msg)
-
-    # Ensure file containing server information is not empty
-    if path.getsize(filepath) == 0:
-        exception_msg = f"File at {filepath} is empty"
-        logger.exception(exception_msg)
-        raise IOError(exception_msg)
-
-    available_servers = { }
     start = perf_counter()
-    
-    # Read file containing server addresses, their CPU, and available RAM in reverse (i.e., most recent information first)
-    for line in read_file_reverse():
-        # Skip empty lines or newlines
-        if line == "" or line == "\n": continue
-        
-        # Get IP Address, port, CPU, and available RAM of server
-        curr_ip, curr_port, curr_cpu, curr_ram = line.split(" ")[:4]
-        curr_address = Address(curr_ip, int(curr_port))
 
-        # Add server address, its CPU, and available RAM to available_servers if not already in it
-        if curr_address not in available_servers.keys() and is_server_listening(curr_address, logger):
-            logger.info(f"Adding info from {line} to available_servers\n")
-            available_servers[curr_address] = (int(curr_cpu), float(curr_ram))
+    # No server has registered yet
+    if not path.exists(filepath): return { }
+
+    live_servers = ServerRegistry(filepath).live_servers()
 
-    end_read = perf_counter()
-    logger.info(f"Read server info file in {timing(end_read, start)} seconds\n")
+    end = perf_counter()
+    logger.info(f"Found {len(live_servers)} live server(s) in registry in {timing(end, start)} seconds\n")
 
-    return available_servers
+    return live_servers
 
-def is_server_listening(server_address: Address, logger: Logger) -> bool | None:
+def is_server_listening(server_address: Address, logger: Logger) -> bool:
     """
-    Check if server is listening
+    Check if server is listening (i.e. answers a ping, reusing a recent result)
 
     Args:
         server_address (Address): Server address
@@ -201,35 +154,29 @@ def is_server_listening(server_address: Address, logger: Logger) -> bool | None:
     Returns:
         bool: True if server is listening, else False
     """
-    with socket() as sock:
-        sock.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
-
-        # Server is not listening
-        try:
-            sock.bind(server_address)
-            logger.info(f"{server_address} is not listening\n")
-            return False
-        
-        except error as exception:
-            error_num, _ = exception.args
-            
-            # Server is listening
-            if error_num in (EADDRINUSE, EADDRNOTAVAIL):
-                logger.info(f"{server_address} is listening\n")
-                return True
-
-def select_servers(logger: Logger) -> list[Address]:
+    return HEALTH_CHECKER.check([server_address], logger)[server_address]
+
+def select_servers(logger: Logger) -> dict[Address, tuple[int, float]]:
     """
     Selects a subset of server(s) with the highest compute power to send jobs to
 
     Args:
         logger (Logger): Logger
-        
+
+    Raises:
+        ConnectionError: No live server is registered
+
     Returns:
-        list[Address]: List of server addresses to send jobs to
+        dict[Address, tuple[int, float]]: Dictionary of server addresses to send jobs to and their CPU, available RAM
     """
-    # Get available servers and their CPU, available RAM
-    available_servers = get_available_servers(logger)
+    # Get live servers and their CPU, available RAM from registry (i.e. the only record servers keep)
+    available_servers = get_registered_servers(logger)
+
+    # Ensure at least one server is live
+    if not available_servers:
+        exception_msg = f"No live servers registered at {SERVER_REGISTRY_PATH}"
+        logger.exception(exception_msg)
+        raise ConnectionError(exception_msg)
 
     # Select random number between 1 and # of available Servers, inclusive
     num_servers = random.randint(1, len(available_servers) + 1)
@@ -242,14 +189,16 @@ def select_servers(logger: Logger) -> list[Address]:
     
     if same_cpu:
         if same_ram:
-            # Return random sample of available servers since they have same CPU and available RAM
-            return sample(list(available_servers.keys()), num_servers)
+            # Select random sample of available servers since they have same CPU and available RAM
+            selected_servers = sample(list(available_servers.keys()), num_servers)
 
-        # Return top available servers with most available RAM
-        else: return sorted(available_servers.keys(), key = lambda x: available_servers[x][1], reverse = True)[:num_servers]
+        # Select top available servers with most available RAM
+        else: selected_servers = sorted(available_servers.keys(), key = lambda x: available_servers[x][1], reverse = True)[:num_servers]
         
-    # Return top available servers with highest CPU power
-    else: return sorted(available_servers.keys(), key = lambda x: available_servers[x], reverse = True)[:num_servers]
+    # Select top available servers with highest CPU power
+    else: selected_servers = sorted(available_servers.keys(), key = lambda x: available_servers[x], reverse = True)[:num_servers]
+
+    return { server_address: available_servers[server_address] for server_address in selected_servers }
 
 def same_cpu_ram(servers: dict[Address, tuple[int, float]], logger: Logger) -> tuple[bool, bool]:
     """
@@ -290,29 +239,36 @@ def get_result(self, logger: Logger) -> ndarray:
 
     Returns:
         ndarray: Product of Matrix A and Matrix B 
+
+    Raises:
+        ValueError: Result failed verification
     """
     start = perf_counter()
     
-    # Send partitioned matrices to randomly selected server(s)
+    # Send partitioned matrices to randomly selected server(s), accumulating results into preallocated matrix as they arrive
     self._work()
+    result = self._result.matrix
 
-    # Combine [all] results into a single matrix
-    result = combine_results(self._matrix_products, logger)
+    # Check assembled result against the matrices it's the product of (i.e. Freivalds' algorithm), so a wrong result is never returned
+    if not self._verifier.verify_result(self._factors, result, logger):
+        exception_msg = "Final result failed Freivalds verification (i.e. it is not the product of the matrices)"
+        logger.error(exception_msg)
+        raise ValueError(exception_msg)
 
     end = perf_counter()
     logger.info(f"Calculated final result in {timing(end, start)} seconds\n")
     
     return result
 
-def print_outcome(result: ndarray, check: ndarray) -> None:
+def print_outcome(result: ndarray, *factors: ndarray) -> None:
     """
-    Prints calculation's outcome (i.e. correctness)
+    Prints calculation's outcome (i.e. correctness, checked with Freivalds' algorithm rather than recomputing the product)
 
     Args:
         result (ndarray): Calculated result
-        check (ndarray): Numpy's result
+        factors (ndarray): Matrices whose product result should be
     """
-    if array_equal(result, check):
+    if FreivaldsVerifier().verify([list(factors)], result):
         print("CORRECT CALCULATION!")
         exit(0)
 
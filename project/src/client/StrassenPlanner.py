@@ -0,0 +1,205 @@
+from json import load
+from math import ceil
+from os import path
+from time import perf_counter
+from logging import Logger
+from threading import Lock
+from numpy import ndarray, empty, integer, issubdtype, pad, result_type
+from project.src.IntegerMultiply import INTEGER_BITS, magnitude
+from project.src.Shared import STRASSEN_CALIBRATION_PATH, timing
+
+STRASSEN_CROSSOVERS = (8192,)
+"""Smallest dimension from which each further Strassen-Winograd level (7 half-size products and 15 additions) beats one level fewer,
+used if no calibration was recorded (i.e. the run in project/file/calibration/strassen.json: 1 core, 1 level 1.22x faster at 8192 but 0.65x at 4096;
+2 levels were slower than 1 at 8192, and 16384 x 16384 didn't fit in memory, so level 2 is never planned)"""
+
+MAX_DEPTH = 2
+"""Largest number of Strassen-Winograd levels planned (i.e. at most 7 ** 2 = 49 products)"""
+
+GROWTH = 64
+"""Bound on how much each Strassen-Winograd level grows the magnitude of products and their sums (i.e. operands are sums of up to 4 blocks each,
+and results sums of up to 4 products)"""
+
+def load_crossovers(filepath: str = STRASSEN_CALIBRATION_PATH) -> tuple[int, ...]:
+    """
+    Crossovers recorded by the last run of project.test.benchmark_strassen (i.e. on the machine the client runs on), up to the first level that never won
+
+    Args:
+        filepath (str, optional): Calibration file path; defaults to STRASSEN_CALIBRATION_PATH
+
+    Returns:
+        tuple[int, ...]: Smallest dimension from which each level wins (STRASSEN_CROSSOVERS if no calibration was recorded)
+    """
+    if not path.isfile(filepath): return STRASSEN_CROSSOVERS
+
+    with open(filepath, "r") as file: crossovers = load(file)["crossovers"]
+
+    # Levels past one that never won (or wasn't measured) aren't planned
+    return tuple(crossovers[:crossovers.index(None)] if None in crossovers else crossovers)
+
+def winograd_operands(matrix_a: ndarray, matrix_b: ndarray) -> list[tuple[ndarray, ndarray]]:
+    """
+    Split Matrix A and Matrix B into quadrants (padding odd dimensions with zeros), and form the operands of the 7 Strassen-Winograd products
+
+    Args:
+        matrix_a (ndarray): Matrix A
+        matrix_b (ndarray): Matrix B
+
+    Returns:
+        list[tuple[ndarray, ndarray]]: Operands of each product
+    """
+    (length, inner), width = matrix_a.shape, matrix_b.shape[1]
+    if length % 2 or inner % 2: matrix_a = pad(matrix_a, ((0, length % 2), (0, inner % 2)))
+    if inner % 2 or width % 2: matrix_b = pad(matrix_b, ((0, inner % 2), (0, width % 2)))
+
+    rows, middle, columns = matrix_a.shape[0] // 2, matrix_a.shape[1] // 2, matrix_b.shape[1] // 2
+    a11, a12, a21, a22 = matrix_a[:rows, :middle], matrix_a[:rows, middle:], matrix_a[rows:, :middle], matrix_a[rows:, middle:]
+    b11, b12, b21, b22 = matrix_b[:middle, :columns], matrix_b[:middle, columns:], matrix_b[middle:, :columns], matrix_b[middle:, columns:]
+
+    s1 = a21 + a22
+    s2 = s1 - a11
+    s3 = a11 - a21
+    s4 = a12 - s2
+
+    t1 = b12 - b11
+    t2 = b22 - t1
+    t3 = b22 - b12
+    t4 = t2 - b21
+
+    return [(a11, b11), (a12, b21), (s4, b22), (a22, t4), (s1, t1), (s2, t2), (s3, t3)]
+
+def winograd_combine(products: list[ndarray], length: int, width: int) -> ndarray:
+    """
+    Combine the 7 Strassen-Winograd products into the product of Matrix A and Matrix B
+
+    Args:
+        products (list[ndarray]): Products, in the order winograd_operands returned their operands
+        length (int): Matrix A's length
+        width (int): Matrix B's width
+
+    Returns:
+        ndarray: Product of Matrix A and Matrix B (without the padding added by winograd_operands)
+    """
+    p1, p2, p3, p4, p5, p6, p7 = products
+
+    u2 = p1 + p6
+    u3 = u2 + p7
+    u4 = u2 + p5
+
+    rows, columns = p1.shape
+    result = empty((2 * rows, 2 * columns), dtype = p1.dtype)
+    result[:rows, :columns] = p1 + p2
+    result[:rows, columns:] = u4 + p3
+    result[rows:, :columns] = u3 - p4
+    result[rows:, columns:] = u3 + p5
+
+    return result[:length, :width]
+
+def strassen_operands(matrix_a: ndarray, matrix_b: ndarray, depth: int) -> list[tuple[ndarray, ndarray]]:
+    """
+    Form the operands of the 7 ** depth products of depth Strassen-Winograd levels
+
+    Args:
+        matrix_a (ndarray): Matrix A
+        matrix_b (ndarray): Matrix B
+        depth (int): Number of levels
+
+    Returns:
+        list[tuple[ndarray, ndarray]]: Operands of each product
+    """
+    if depth == 0: return [(matrix_a, matrix_b)]
+    return [operands for sub_a, sub_b in winograd_operands(matrix_a, matrix_b) for operands in strassen_operands(sub_a, sub_b, depth - 1)]
+
+def strassen_combine(products: list[ndarray], length: int, width: int, depth: int) -> ndarray:
+    """
+    Combine the 7 ** depth products of depth Strassen-Winograd levels into the product of Matrix A and Matrix B
+
+    Args:
+        products (list[ndarray]): Products, in the order strassen_operands returned their operands
+        length (int): Matrix A's length
+        width (int): Matrix B's width
+        depth (int): Number of levels
+
+    Returns:
+        ndarray: Product of Matrix A and Matrix B
+    """
+    if depth == 0: return products[0]
+
+    count = len(products) // 7
+    return winograd_combine([strassen_combine(products[i * count:(i + 1) * count], ceil(length / 2), ceil(width / 2), depth - 1) for i in range(7)],
+                            length, width)
+
+class StrassenAssembler():
+    def __init__(self, length: int, width: int, depth: int):
+        # Shape of result, and number of Strassen-Winograd levels its products come from
+        self._length, self._width, self._depth = length, width, depth
+
+        # Products received so far (i.e. Key = position)
+        self._products: dict[int, ndarray] = { }
+        self._lock = Lock()
+
+    @property
+    def matrix(self) -> ndarray:
+        """
+        Result (i.e. every product combined; call once all products were added)
+
+        Raises:
+            ValueError: Not every product was added
+
+        Returns:
+            ndarray: Result
+        """
+        with self._lock: products = dict(self._products)
+
+        if len(products) != 7 ** self._depth:
+            raise ValueError(f"Only {len(products)} of {7 ** self._depth} Strassen-Winograd products were added")
+
+        return strassen_combine([products[i] for i in range(7 ** self._depth)], self._length, self._width, self._depth)
+
+    def add(self, index: int, product: ndarray) -> None:
+        """
+        Store product, to be combined into result
+
+        Args:
+            index (int): Position of product
+            product (ndarray): Product of operands at index
+        """
+        with self._lock: self._products[index] = product
+
+class StrassenPlanner():
+    def __init__(self, crossovers: tuple[int, ...] | None = None, max_depth: int = MAX_DEPTH, calibration_path: str = STRASSEN_CALIBRATION_PATH):
+        # Smallest dimension from which each Strassen-Winograd level wins (i.e. measured by project.test.benchmark_strassen, unless given)
+        self._crossovers = crossovers if crossovers is not None else load_crossovers(calibration_path)
+
+        # Largest number of levels
+        self._max_depth = max_depth
+
+    def depth(self, matrix_a: ndarray, matrix_b: ndarray, logger: Logger) -> int:
+        """
+        Choose number of Strassen-Winograd levels: one more for as long as every dimension is at least that level's crossover,
+        but none unless matrices hold integers whose products and sums can't overflow (i.e. result is exact)
+
+        Args:
+            matrix_a (ndarray): Matrix A
+            matrix_b (ndarray): Matrix B
+            logger (Logger): Logger
+
+        Returns:
+            int: Number of levels (0 for classical block products)
+        """
+        start = perf_counter()
+        depth, dimensions = 0, (matrix_a.shape[0], matrix_a.shape[1], matrix_b.shape[1])
+
+        product_dtype = result_type(matrix_a.dtype, matrix_b.dtype)
+
+        if issubdtype(product_dtype, integer):
+            # Largest magnitude of a classical product, and largest exact magnitude of the product's dtype
+            bound, limit = matrix_a.shape[1] * magnitude(matrix_a) * magnitude(matrix_b), 1 << min(INTEGER_BITS, product_dtype.itemsize * 8 - 1)
+
+            while depth < min(self._max_depth, len(self._crossovers)) and min(dimensions) >= self._crossovers[depth] and bound * GROWTH ** (depth + 1) < limit:
+                depth += 1
+
+        end = perf_counter()
+        logger.info(f"Planned {depth} Strassen-Winograd level(s) ({7 ** depth} product(s)) for {matrix_a.shape} x {matrix_b.shape} matrices in {timing(end, start)} seconds\n")
+
+        return depth
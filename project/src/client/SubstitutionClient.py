@@ -1,65 +1,160 @@
-from socket import socket, SOL_SOCKET, SO_REUSEADDR
-from pickle import loads, dumps
-from numpy import ndarray, random, array_split, dot
+from numpy import ndarray, result_type, random, array_split, zeros, zeros_like, where, nonzero, empty, array, add, int64
 from queue import Queue
+from threading import Lock
+from typing import Any
 from time import perf_counter
 from logging import getLogger
-from sympy import IndexedBase, Matrix, matrix2numpy
+from sympy import IndexedBase, Indexed, Add, Matrix
 from project.src.ExceptionHandler import handle_exceptions
-from project.src.client.Shared import get_result, handle_server, select_servers, print_outcome, validate_inputs, MATRIX_B_WIDTH
-from project.src.Shared import (Address, create_logger, generate_matrix, timing,
-                                HORIZONTAL_PARTITIONS, LENGTH, VERTICAL_PARTITIONS)
+from project.src.IntegerMultiply import integer_dot
+from project.src.client.ConnectionPool import ConnectionPool
+from project.src.client.PartitionPlanner import PartitionPlanner
+from project.src.client.ResultAssembler import ResultAssembler
+from project.src.client.Scheduler import Scheduler, WorkerStatistics, REQUEST_TIMEOUT, STRAGGLER_FACTOR, MAX_DUPLICATES
+from project.src.client.FreivaldsVerifier import FreivaldsVerifier
+from project.src.client.Shared import get_result, get_operand, select_servers, print_outcome, validate_inputs, MATRIX_B_WIDTH
+from project.src.Shared import Address, LENGTH, create_logger, generate_matrix, timing
 
 X = IndexedBase("x")
 """Base of subscriptable variable used to replace elements in matrix"""
 
+REDACTION_DENSITY = 0.5
+"""Fraction of elements in each partition of Matrix A replaced with a variable (or masked, if redacting numerically)"""
+
 CLIENT_LOGGER = getLogger(__name__)
 """Client logger"""
 
-# TODO Threading in Substitution Client where there's 1 thread for each Server connection
+def substitute(result: Matrix, values: ndarray) -> ndarray:
+    """
+    Replace variables in a redacted product with their values, reading each element as a linear form (i.e. constant + sum of coefficient * X[i])
+    and evaluating all of them at once, so the cost depends only on the size of this product
+
+    Args:
+        result (Matrix): Redacted product, whose variables X[0], X[1], ... stand for values[0], values[1], ...
+        values (ndarray): Values of variables
+
+    Raises:
+        ValueError: Element of result is not linear in the variables
+
+    Returns:
+        ndarray: Product with variables replaced
+    """
+    constants = zeros(len(result), dtype = int64)
+    elements, variables, coefficients = [ ], [ ], [ ]
+
+    # Split each element into its constant and (coefficient, variable) terms
+    for element, expression in enumerate(result):
+        for term in Add.make_args(expression):
+            coefficient, factor = term.as_coeff_Mul()
+
+            if isinstance(factor, Indexed):
+                elements.append(element)
+                variables.append(int(factor.indices[0]))
+                coefficients.append(int(coefficient))
+
+            elif term.is_Integer: constants[element] += int(term)
+            else: raise ValueError(f"Term {term} of redacted product is not linear in the variables")
+
+    # Add every term's coefficient * value to its element (exact integer arithmetic)
+    if elements: add.at(constants, array(elements), array(coefficients, dtype = int64) * values[array(variables)])
+
+    return constants.reshape(result.shape)
 
 class SubstitutionClient():
-    def __init__(self, matrix_a: ndarray, matrix_b: ndarray, length: int = LENGTH, matrix_b_width: int = MATRIX_B_WIDTH):
+    def __init__(self, matrix_a: ndarray, matrix_b: ndarray, length: int = LENGTH, matrix_b_width: int = MATRIX_B_WIDTH,
+                 planner: PartitionPlanner | None = None, numeric: bool = False, density: float = REDACTION_DENSITY, seed: int | None = None,
+                 verifier: FreivaldsVerifier | None = None,
+                 request_timeout: float | None = REQUEST_TIMEOUT, straggler_factor: float = STRAGGLER_FACTOR, max_duplicates: float = MAX_DUPLICATES):
         create_logger("client.log")
         CLIENT_LOGGER.info("Starting Substitution Client...\n")
 
         # Ensure matrix dimensions are valid
         validate_inputs(length, matrix_b_width, CLIENT_LOGGER)
 
-        # Store server(s) results (i.e. Value = Chunk of Matrix A * Chunk of Matrix B at Key = given position)
-        self._matrix_products: dict[int, ndarray] = { }
-
-        # Server(s) to send jobs to
-        self._server_addresses: list[Address] = select_servers(CLIENT_LOGGER)
+        # Server(s) to send jobs to and their CPU, available RAM
+        self._servers: dict[Address, tuple[int, float]] = select_servers(CLIENT_LOGGER)
+        self._server_addresses: list[Address] = list(self._servers)
         CLIENT_LOGGER.info(f"Sending jobs to {self._server_addresses}\n")
 
-        # List to store elements (datatype equal to that of matrices) that have been replaced
-        self._replaced_elements: list[int] = [ ]
+        # Number of horizontal and vertical partitions, chosen from matrix shapes and server(s)
+        self._plan = (planner or PartitionPlanner()).plan(matrix_a.shape, matrix_b.shape, matrix_a.itemsize, self._servers, CLIENT_LOGGER)
+
+        # Preallocated result, which server(s) results (i.e. Chunk of Matrix A * Chunk of Matrix B) are accumulated into as they arrive
+        self._result = ResultAssembler(matrix_a.shape[0], matrix_b.shape[1], self._plan.horizontal, self._plan.vertical,
+                                       result_type(matrix_a.dtype, matrix_b.dtype))
+
+        # Checks each result from server(s) and the final result (i.e. Matrix A * Matrix B), without recomputing them
+        self._verifier, self._factors = verifier or FreivaldsVerifier(), [matrix_a, matrix_b]
+
+        # Time (seconds) after which a job sent to a server is abandoned, and when (and how often) partitions straggling on a server are run again on an idle one
+        self._request_timeout, self._straggler_factor, self._max_duplicates = request_timeout, straggler_factor, max_duplicates
+
+        # Partitions completed and busy, idle time of client and each server during the last call to answer()
+        self._statistics: dict[Address | str, WorkerStatistics] = { }
+
+        # Persistent connections to server(s), reused across partitions and calls to answer()
+        self._connection_pool = ConnectionPool(CLIENT_LOGGER)
+
+        # Partitions of Matrix B prepared for sending and their content hash (i.e. Key = vertical partition), so server(s) can cache them
+        self._operands: dict[int, tuple[Any, bytes]] = { }
+        self._operand_lock = Lock()
+
+        # Elements replaced in each partition sent to server(s), awaiting results (i.e. Key = position, Value = value of X[0], X[1], ... in that partition)
+        self._replaced_elements: dict[int, ndarray] = { }
+
+        # Partitions are redacted concurrently by each server's worker
+        self._replace_lock = Lock()
+
+        # Fraction of elements redacted, and random number generator choosing them (seed it for reproducible benchmarks;
+        # each partition then draws from its own generator seeded with (seed, position), so its redaction doesn't depend on which worker prepares it first)
+        self._density, self._seed, self._rng = density, seed, random.default_rng(seed)
+
+        # Redact partitions numerically (i.e. send known elements with masked elements zeroed, plus the mask) rather than with SymPy variables
+        self._numeric = numeric
+
+        # Partitions redacted numerically and sent to server(s), awaiting results (i.e. Key = position, Value = partitions of Matrix A and Matrix B)
+        self._redacted: dict[int, tuple[ndarray, ndarray]] = { }
 
         # Create and queue partitions of Matrix A and Matrix B and their position, to be sent to selected server(s)
         self._partitions: Queue = self._queue_partitions(matrix_a, matrix_b)
 
-    def _randomly_replace(self, matrix: Matrix, index: int) -> tuple[Matrix, int]:
+    def _random_mask(self, shape: tuple[int, ...], index: int) -> ndarray:
+        """
+        Choose random elements to redact (call while holding replace lock, since the unseeded random number generator is shared)
+
+        Args:
+            shape (tuple[int, ...]): Shape of matrix to be redacted
+            index (int): Position of partition (i.e. seeds its own generator, if client was seeded)
+
+        Returns:
+            ndarray: Mask that is True for each element to redact (each with probability density)
+        """
+        rng = random.default_rng([self._seed, index]) if self._seed is not None else self._rng
+
+        return rng.random(shape) < self._density
+
+    def _randomly_replace(self, matrix: ndarray, index: int) -> tuple[Matrix, ndarray]:
         """
-        Replace random elements in matrix with a variable
+        Replace random elements in matrix with a variable, numbered from X[0] within each matrix (call while holding replace lock)
 
         Args:
-            matrix (Matrix): Matrix to be redacted
-            index (int): Position of replaced element (also number of elements replaced so far)
+            matrix (ndarray): Matrix to be redacted
+            index (int): Position of partition
 
         Returns:
-            tuple[Matrix, int]: Redacted matrix and index of most recently replaced element
+            tuple[Matrix, ndarray]: Redacted matrix and replaced elements (i.e. value of X[0], X[1], ...)
         """
-        mask = random.default_rng().choice([True, False], size = matrix.shape, shuffle = False)
+        rows, columns = nonzero(self._random_mask(matrix.shape, index))
+
+        # Assign variables X[0], X[1], ... to replaced elements (in row-major order) in bulk
+        variables = empty(len(rows), dtype = object)
+        variables[:] = [X[i] for i in range(len(rows))]
 
-        for row in range(len(mask)):
-            for col in range(len(mask[0])):
-                if mask[row][col]:
-                    self._replaced_elements.append(matrix[row, col]) # type: ignore
-                    matrix[row, col] = X[index]
-                    index += 1
+        redacted = matrix.astype(object)
+        redacted[rows, columns] = variables
 
-        return matrix, index
+        # Gather replaced elements in one go
+        return Matrix(redacted), matrix[rows, columns]
 
     def _queue_partitions(self, matrix_a: ndarray, matrix_b: ndarray) -> Queue:
         """
@@ -74,30 +169,25 @@ class SubstitutionClient():
         """
         start = perf_counter()
         
+        # Number of horizontal and vertical partitions
+        horizontal_partitions, vertical_partitions, _ = self._plan
+
         # Split Matrix A horizontally
-        sub_matrices = array_split(matrix_a, HORIZONTAL_PARTITIONS, axis = 0)
+        sub_matrices = array_split(matrix_a, horizontal_partitions, axis = 0)
 
-        # Split Matrix A vertically and split Matrix B horizontally using VERTICAL_PARTITIONS (i.e., Matrix A's vertical partitions width should equal Matrix B's horizontal partitions length)
-        matrix_a_partitions, matrix_b_partitions = [m for sub_matrix in sub_matrices for m in  array_split(sub_matrix, VERTICAL_PARTITIONS, axis = 1)], array_split(matrix_b, VERTICAL_PARTITIONS, axis = 0)
+        # Split Matrix A vertically and split Matrix B horizontally using vertical_partitions (i.e., Matrix A's vertical partitions width should equal Matrix B's horizontal partitions length)
+        matrix_a_partitions, matrix_b_partitions = [m for sub_matrix in sub_matrices for m in  array_split(sub_matrix, vertical_partitions, axis = 1)], array_split(matrix_b, vertical_partitions, axis = 0)
         
         # Declare queue to be populated and returned
         queue = Queue()
-
-        replaced_index = 0
         
         for i in range(len(matrix_a_partitions)):
             # Current subset of Matrix A and Matrix B
-            sub_matrix_a, sub_matrix_b = matrix_a_partitions[i], matrix_b_partitions[i % VERTICAL_PARTITIONS]
+            sub_matrix_a, sub_matrix_b = matrix_a_partitions[i], matrix_b_partitions[i % vertical_partitions]
 
-            # Have client compute some of the partitions (add 1 to account for client)
-            if i % (len(self._server_addresses) + 1) == 0:
-                self._matrix_products[i] = dot(sub_matrix_a, sub_matrix_b)
-
-            # ...while server(s) compute the rest
-            else:
-                # Replace random elements in Matrix A with a variable
-                redacted_matrix_a, replaced_index = self._randomly_replace(Matrix(sub_matrix_a), replaced_index)
-                queue.put((redacted_matrix_a, Matrix(sub_matrix_b), i))
+            # Queue every partition; client and server(s) each pull their next one as soon as they're free
+            # (partitions are only redacted once they're about to be sent to a server)
+            queue.put((sub_matrix_a, sub_matrix_b, i))
 
         end = perf_counter()
         CLIENT_LOGGER.info(f"Created partitions and queue in {timing(end, start)} seconds\n")
@@ -112,87 +202,107 @@ class SubstitutionClient():
             ndarray: Product of Matrix A and Matrix B 
         """
         return get_result(self, CLIENT_LOGGER)
+
+    @property
+    def statistics(self) -> dict[Address | str, WorkerStatistics]:
+        """
+        Partitions completed and busy, idle time of client and each server during the last call to answer()
+
+        Returns:
+            dict[Address | str, WorkerStatistics]: Statistics of each worker
+        """
+        return self._statistics
+
+    def close(self) -> None:
+        """
+        Close persistent connections to server(s)
+        """
+        self._connection_pool.close()
         
-    @handle_exceptions(CLIENT_LOGGER)
-    # TODO Create separate client instances for each server
-    def _work(self) -> None:
+    def _prepare(self, partitions: tuple[ndarray, ndarray, int]) -> tuple[tuple[Matrix] | tuple[ndarray, ndarray], Matrix | ndarray, bytes]:
         """
-        Send partitioned matrices to server(s), get results,
-        then add them to dictionary for combining later
+        Get data to send to server for partitions (i.e. replace random elements in partition of Matrix A with a variable,
+        or zero them and send them with their mask, if redacting numerically)
+
+        Args:
+            partitions (tuple[ndarray, ndarray, int]): Partitions of Matrix A and Matrix B and their position
+
+        Returns:
+            tuple[tuple[Matrix] | tuple[ndarray, ndarray], Matrix | ndarray, bytes]: Redacted partition of Matrix A (and its mask),
+            partition of Matrix B, and content hash of partition of Matrix B
         """
-        # Index used to determine where to connect (i.e. cycles through available servers; round robin)
-        i = 0
+        sub_matrix_a, sub_matrix_b, index = partitions
 
-        start_work = perf_counter()
+        if self._numeric:
+            # Keep original partitions to fill in the unknowns once the result arrives
+            with self._replace_lock:
+                mask = self._random_mask(sub_matrix_a.shape, index)
+                self._redacted[index] = (sub_matrix_a, sub_matrix_b)
 
-        # While there's still partitions to send to server(s)
-        while not self._partitions.empty():
-            try:
-                with socket() as sock:
-                    # Allow reuse of address
-                    sock.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+            return (where(mask, 0, sub_matrix_a), mask), *get_operand(self, index % self._plan.vertical, sub_matrix_b)
 
-                    # Address of server
-                    server_address = self._server_addresses[i % len(self._server_addresses)]
+        with self._replace_lock:
+            redacted_matrix_a, self._replaced_elements[index] = self._randomly_replace(sub_matrix_a, index)
 
-                    # Start timer
-                    start = perf_counter()
+        return (redacted_matrix_a,), *get_operand(self, index % self._plan.vertical, sub_matrix_b, Matrix)
 
-                    # Connect to server
-                    sock.connect(server_address)
-                    connection_timer = perf_counter()
-                    CLIENT_LOGGER.info(f"Substitution Client connected to Server at {server_address} in {timing(connection_timer, start)} seconds\n")
+    def _process_result(self, index: int, result: Matrix | ndarray, rows: ndarray | None = None, columns: ndarray | None = None) -> ndarray:
+        """
+        Replace variables (or unknowns, if redacted numerically) in result from server with their actual values
 
-                    # Get partitions to send to server
-                    partitions = self._partitions.get(timeout = 0.1)
-                    print(f"Sending to server: {partitions}\n")
+        Args:
+            index (int): Position of result
+            result (Matrix | ndarray): Redacted product of partitions of Matrix A and Matrix B (i.e. product of known elements, if redacted numerically)
+            rows (ndarray | None, optional): Row of each unknown in partition of Matrix A (numeric only); defaults to None
+            columns (ndarray | None, optional): Column of each unknown in partition of Matrix A (numeric only); defaults to None
 
-                    # Receive result from server
-                    data = handle_server(sock, dumps(partitions), CLIENT_LOGGER)
-                    
-                    # Unpack data (i.e. position and product of partitions) from server
-                    index, result = loads(data)
+        Returns:
+            ndarray: Product of partitions of Matrix A and Matrix B, to be verified before it's accumulated
+        """
+        if rows is not None and columns is not None:
+            start = perf_counter()
 
-                    end = perf_counter()
-                    CLIENT_LOGGER.info(f"Substitution Client connected, sent, received, and unpacked data from Server at {server_address} in {timing(end, start)} seconds\n")
+            with self._replace_lock: sub_matrix_a, sub_matrix_b = self._redacted.pop(index)
 
-                    # Check if result and index was received (i.e. not None)
-                    if result is not None:
-                        CLIENT_LOGGER.info(f"Successfully received valid result from Server at {server_address}\n")
-                        #print(f"Redacted result Matrix from Server at {server_address} = {result}\n")
+            # Unknown k adds its value times row columns[k] of Matrix B to row rows[k] of result, i.e. result += (unknowns of Matrix A) * Matrix B
+            unknowns = zeros_like(sub_matrix_a)
+            unknowns[rows, columns] = sub_matrix_a[rows, columns]
+            product = result + integer_dot(unknowns, sub_matrix_b)
 
-                        # Start timer
-                        start = perf_counter()
+            end = perf_counter()
+            CLIENT_LOGGER.info(f"Filled in {len(rows)} unknowns in result in {timing(end, start)} seconds\n")
 
-                        # Replace variables in result with their actual values
-                        actual_matrix = result.subs(X, tuple(self._replaced_elements)).doit()
+            return product
 
-                        # End timer
-                        end = perf_counter()
-                        CLIENT_LOGGER.info(f"Replaced variables in result with their actual values in {timing(end, start)} seconds\n")
+        start = perf_counter()
 
-                        # Start timer
-                        start = perf_counter()
-                        
-                        # Cast from SymPy Matrix to NumPy ndarray, then add to dict for concatenation later
-                        self._matrix_products[index] = matrix2numpy(actual_matrix, dtype = int)
+        # Replace variables in result with this partition's replaced elements
+        with self._replace_lock: values = self._replaced_elements.pop(index)
+        product = substitute(result, values)
 
-                        # End timer
-                        end = perf_counter()
-                        CLIENT_LOGGER.info(f"Converted SymPy Matrix to NumPy ndarray in {timing(end, start)} seconds\n")
+        end = perf_counter()
+        CLIENT_LOGGER.info(f"Replaced variables in result with their actual values in {timing(end, start)} seconds\n")
 
-                    else:
-                        CLIENT_LOGGER.error(f"Failed to receive valid result from Server at {server_address}; retrying later...\n")
+        return product
 
-                        # Put partitions back into queue (since it was previously removed via .get()), to try again later
-                        self._partitions.put(partitions)
+    def _add_product(self, index: int, product: ndarray) -> None:
+        """
+        Accumulate product of partitions into its rows of result
 
-                    # Increment index
-                    i += 1
-            
-            finally:
-                end_work = perf_counter()
-                CLIENT_LOGGER.info(f"Substitution Client worked for {timing(end_work, start_work)} seconds\n")
+        Args:
+            index (int): Position of product
+            product (ndarray): Product of partitions of Matrix A and Matrix B
+        """
+        self._result.add(index, product)
+
+    @handle_exceptions(CLIENT_LOGGER)
+    def _work(self) -> None:
+        """
+        Multiply partitioned matrices with client and server(s) (each pulling partitions as soon as it's free), get results,
+        then add them to dictionary for combining later
+        """
+        self._statistics = Scheduler(self, self._servers if self._plan.distribute else { }, CLIENT_LOGGER, verifier = self._verifier,
+                                     request_timeout = self._request_timeout, straggler_factor = self._straggler_factor, max_duplicates = self._max_duplicates).run()
 
 if __name__ == "__main__":
     # Generate example matrices for testing
@@ -204,14 +314,16 @@ if __name__ == "__main__":
     start = perf_counter()
 
     # Create Substitution Client to multiply matrices
-    encrypted_client = SubstitutionClient(matrix_a, matrix_b)
+    # (Example matrices are tiny, so distribute them regardless of size)
+    encrypted_client = SubstitutionClient(matrix_a, matrix_b, planner = PartitionPlanner(local_cutoff = 0))
 
     # Get result
     answer = encrypted_client.answer()
+    encrypted_client.close()
 
     end = perf_counter()
     print(f"Final Result Matrix = {answer}\n")
     print(f"Substitution Client ran for {end - start} seconds\n")
 
     # Print outcome (i.e. answer's correctness)
-    print_outcome(answer, matrix_a @ matrix_b)
\ No newline at end of file
+    print_outcome(answer, matrix_a, matrix_b)
\ No newline at end of file
@@ -0,0 +1,153 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from collections.abc import Callable
+from math import ceil, prod
+from os import cpu_count
+from typing import Any, NamedTuple
+from numpy import ndarray, dtype, dot, result_type, vstack
+
+MIN_BAND_ROWS = 64
+"""Smallest number of rows of Matrix A given to a single worker process"""
+
+class SharedArray(NamedTuple):
+    """
+    Tuple describing an ndarray stored in shared memory
+
+    Args:
+        NamedTuple (str, tuple[int, ...], str): Shared memory block name, shape, and dtype
+    """
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+def share(matrix: ndarray) -> tuple[SharedMemory, SharedArray]:
+    """
+    Copy matrix into a new shared memory block
+
+    Args:
+        matrix (ndarray): Matrix to share
+
+    Returns:
+        tuple[SharedMemory, SharedArray]: Shared memory block and its description
+    """
+    block = SharedMemory(create = True, size = max(matrix.nbytes, 1))
+    ndarray(matrix.shape, matrix.dtype, buffer = block.buf)[...] = matrix
+
+    return block, SharedArray(block.name, matrix.shape, matrix.dtype.str)
+
+def allocate(shape: tuple[int, ...], matrix_dtype: dtype) -> tuple[SharedMemory, SharedArray]:
+    """
+    Create an uninitialized shared memory block for a matrix
+
+    Args:
+        shape (tuple[int, ...]): Matrix shape
+        matrix_dtype (dtype): Matrix dtype
+
+    Returns:
+        tuple[SharedMemory, SharedArray]: Shared memory block and its description
+    """
+    block = SharedMemory(create = True, size = max(matrix_dtype.itemsize * prod(shape), 1))
+    return block, SharedArray(block.name, shape, matrix_dtype.str)
+
+def multiply_band(multiply: Callable[[ndarray, ndarray], ndarray], matrix_a: SharedArray, matrix_b: SharedArray,
+                  product: SharedArray, start: int, stop: int) -> None:
+    """
+    Multiply rows [start, stop) of shared Matrix A by shared Matrix B, writing them into the shared product (runs in worker process)
+
+    Args:
+        multiply (Callable[[ndarray, ndarray], ndarray]): Multiplication function
+        matrix_a (SharedArray): Matrix A
+        matrix_b (SharedArray): Matrix B
+        product (SharedArray): Product of Matrix A and Matrix B
+        start (int): First row of band
+        stop (int): Row after last row of band
+    """
+    blocks = [SharedMemory(name = shared.name) for shared in (matrix_a, matrix_b, product)]
+
+    try:
+        a, b, c = (ndarray(shared.shape, dtype(shared.dtype), buffer = block.buf) for shared, block in zip((matrix_a, matrix_b, product), blocks))
+        c[start:stop] = multiply(a[start:stop], b)
+
+        # Release views before closing their blocks
+        del a, b, c
+
+    finally:
+        for block in blocks: block.close()
+
+class ComputePool():
+    def __init__(self, processes: int | None = None, min_band_rows: int = MIN_BAND_ROWS):
+        # Number of worker processes (i.e. defaults to number of cores)
+        self._processes = processes or cpu_count() or 1
+
+        # Smallest number of rows of Matrix A given to a single worker process
+        self._min_band_rows = min_band_rows
+        self._executor = ProcessPoolExecutor(max_workers = self._processes)
+
+    @property
+    def processes(self) -> int:
+        """
+        Number of worker processes
+
+        Returns:
+            int: Number of worker processes
+        """
+        return self._processes
+
+    def _bands(self, rows: int) -> list[tuple[int, int]]:
+        """
+        Split rows into contiguous bands, one per worker process (but no smaller than min_band_rows)
+
+        Args:
+            rows (int): Number of rows
+
+        Returns:
+            list[tuple[int, int]]: Start and stop row of each band
+        """
+        count = max(1, min(self._processes, rows // self._min_band_rows))
+        size = ceil(rows / count) if rows else 0
+
+        return [(start, min(start + size, rows)) for start in range(0, rows, size)] if size else [(0, 0)]
+
+    def multiply(self, matrix_a: Any, matrix_b: Any, multiply: Callable[[Any, Any], Any] = dot,
+                 stack: Callable[..., Any] = vstack) -> Any:
+        """
+        Multiply Matrix A by Matrix B across worker processes, splitting Matrix A into row bands;
+        ndarrays are handed over through shared memory, anything else (e.g. SymPy matrices) is pickled
+
+        Args:
+            matrix_a (Any): Matrix A
+            matrix_b (Any): Matrix B
+            multiply (Callable[[Any, Any], Any], optional): Picklable multiplication function; defaults to numpy.dot
+            stack (Callable[..., Any], optional): Function that vertically stacks products of non-ndarray bands; defaults to numpy.vstack
+
+        Returns:
+            Any: Product of Matrix A and Matrix B
+        """
+        bands = self._bands(matrix_a.shape[0])
+
+        # Pickle bands of non-numeric matrices (e.g. SymPy), since they can't live in shared memory
+        if not isinstance(matrix_a, ndarray) or not isinstance(matrix_b, ndarray) or matrix_a.dtype.hasobject or matrix_b.dtype.hasobject:
+            products = [self._executor.submit(multiply, matrix_a[start:stop, :], matrix_b) for start, stop in bands]
+            return stack(*(product.result() for product in products))
+
+        # Share operands and product, so worker processes read and write them in place
+        (block_a, shared_a), (block_b, shared_b) = share(matrix_a), share(matrix_b)
+        block_c, shared_c = allocate((matrix_a.shape[0], matrix_b.shape[1]), result_type(matrix_a.dtype, matrix_b.dtype))
+
+        try:
+            jobs = [self._executor.submit(multiply_band, multiply, shared_a, shared_b, shared_c, start, stop) for start, stop in bands]
+            for job in jobs: job.result()
+
+            # Copy product out of shared memory before releasing it
+            return ndarray(shared_c.shape, dtype(shared_c.dtype), buffer = block_c.buf).copy()
+
+        finally:
+            for block in (block_a, block_b, block_c):
+                block.close()
+                block.unlink()
+
+    def close(self) -> None:
+        """
+        Shutdown worker processes
+        """
+        self._executor.shutdown()
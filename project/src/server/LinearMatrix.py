@@ -0,0 +1,101 @@
+from functools import cmp_to_key
+from typing import NamedTuple
+from numpy import ndarray, array, zeros, int64, searchsorted, nonzero
+from sympy import Matrix, Basic, Add, Mul, Integer, Indexed
+from project.src.IntegerMultiply import integer_dot
+
+CANONICAL_ORDER = cmp_to_key(Basic.compare)
+"""Sort key putting terms of a sum in the order SymPy evaluates them into (i.e. so an unevaluated sum equals the evaluated one)"""
+
+class LinearMatrix(NamedTuple):
+    """
+    Tuple defining a matrix whose elements are integers or single variables (i.e. a sparse store of linear polynomials)
+
+    Args:
+        NamedTuple (ndarray, ndarray, ndarray, list[Basic]): Integer elements (variables' elements are 0),
+        row and column of each variable (in row-major order), and the variables themselves
+    """
+    constants: ndarray
+    rows: ndarray
+    columns: ndarray
+    variables: list[Basic]
+
+def to_linear(matrix: Matrix) -> LinearMatrix | None:
+    """
+    Convert redacted SymPy matrix (i.e. integers, some replaced with variables) into a linear store
+
+    Args:
+        matrix (Matrix): Redacted matrix
+
+    Returns:
+        LinearMatrix | None: Linear store; None if an element is neither an integer nor a single variable, or a variable appears more than once
+    """
+    length, width = matrix.shape
+    constants = zeros(length * width, dtype = int64)
+    positions, variables = [ ], [ ]
+
+    for position, element in enumerate(matrix):
+        if element.is_Integer: constants[position] = int(element)
+
+        elif element.is_Symbol or isinstance(element, Indexed):
+            positions.append(position)
+            variables.append(element)
+
+        else: return None
+
+    # Each product element must have no like terms to combine
+    if len(set(variables)) < len(variables): return None
+
+    positions = array(positions, dtype = int64)
+    return LinearMatrix(constants.reshape(length, width), positions // width, positions % width, variables)
+
+def to_integers(matrix: Matrix) -> ndarray | None:
+    """
+    Convert SymPy matrix of integers into an ndarray
+
+    Args:
+        matrix (Matrix): Matrix
+
+    Returns:
+        ndarray | None: Integer ndarray; None if an element isn't an integer
+    """
+    if not all(element.is_Integer for element in matrix): return None
+    return array([int(element) for element in matrix], dtype = int64).reshape(matrix.shape)
+
+def multiply_linear(matrix_a: LinearMatrix, matrix_b: ndarray) -> Matrix:
+    """
+    Multiply linear store by integer matrix, converting to a SymPy matrix only once the product is known
+    (i.e. each product element is the integer part of the product plus coefficient * variable for each variable in that row of Matrix A)
+
+    Args:
+        matrix_a (LinearMatrix): Matrix A
+        matrix_b (ndarray): Matrix B
+
+    Returns:
+        Matrix: Product of Matrix A and Matrix B (identical to sympy.Matrix.multiply)
+    """
+    constants = integer_dot(matrix_a.constants, matrix_b)
+    length, width = constants.shape
+
+    # Variables in each row of Matrix A are contiguous (i.e. row-major order)
+    bounds = searchsorted(matrix_a.rows, range(length + 1))
+    elements = [ ]
+
+    for row in range(length):
+        start, stop = bounds[row], bounds[row + 1]
+
+        # Coefficient of each of this row's variables in each column of product
+        coefficients, variables = matrix_b[matrix_a.columns[start:stop]], matrix_a.variables[start:stop]
+
+        for column in range(width):
+            terms = [variables[i] if coefficients[i, column] == 1 else Mul(Integer(int(coefficients[i, column])), variables[i], evaluate = False)
+                     for i in nonzero(coefficients[:, column])[0]]
+
+            # Build canonical sum without evaluating it (i.e. variables are distinct, so there are no like terms to combine)
+            terms.sort(key = CANONICAL_ORDER)
+            if constants[row, column]: terms.insert(0, Integer(int(constants[row, column])))
+
+            if len(terms) > 1: elements.append(Add(*terms, evaluate = False))
+            else: elements.append(terms[0] if terms else Integer(0))
+
+    return Matrix(length, width, elements)
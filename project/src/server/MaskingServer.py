@@ -0,0 +1,85 @@
+from numpy import ndarray
+from functools import partial
+from logging import getLogger, Logger
+from time import perf_counter
+from project.src.ExceptionHandler import handle_exceptions
+from project.src.IntegerMultiply import modular_dot
+from project.src.server.ComputePool import ComputePool
+from project.src.server.OperandCache import OperandCache, CACHE_BYTES
+from project.src.server.OriginalServer import Matrix
+from project.src.server.Shared import start_server, start_async_server, validate_input, get_address, register_server, MAX_CLIENTS, MAX_JOBS
+from project.src.Shared import (Address, FILE_DIRECTORY_PATH,
+                                create_logger, timing)
+
+SERVER_LOGGER = getLogger(__name__)
+"""Server logger"""
+
+class MaskingServer():
+    def __init__(self, directory_path: str = FILE_DIRECTORY_PATH, asynchronous: bool = False, max_clients: int = MAX_CLIENTS, max_jobs: int = MAX_JOBS,
+                 process_pool: bool = False, cache_bytes: int = CACHE_BYTES):
+        create_logger("server.log")
+        SERVER_LOGGER.info("Starting Masking Server...\n")
+        
+        # Masking Server's IP Address and port
+        server_address: Address | None = get_address()
+
+        # Ensure server address and directory path are valid
+        validate_input(server_address, directory_path, SERVER_LOGGER)
+
+        # Register server (and keep its record alive with heartbeats) so clients can find it
+        register_server(server_address, SERVER_LOGGER)
+
+        # Maximum number of clients served and multiplications run at once (asyncio server only)
+        self._max_clients, self._max_jobs = max_clients, max_jobs
+
+        # Worker processes (one per core) to run multiplications in, if enabled
+        self._compute_pool: ComputePool | None = ComputePool() if process_pool else None
+
+        # Partitions of Matrix B received so far (keyed by content hash), so clients only send each one once
+        self._operand_cache = OperandCache(cache_bytes)
+
+        # Start server
+        self._start_masking_server(server_address, SERVER_LOGGER, asynchronous)
+
+    @handle_exceptions(SERVER_LOGGER)
+    def _start_masking_server(self, server_address: Address, logger: Logger, asynchronous: bool = False) -> None:
+        """
+        Start Masking Server
+
+        Args:
+            server_address (Address): Server's address
+            logger (Logger): Logger
+            asynchronous (bool, optional): Serve many clients concurrently with asyncio; defaults to False
+        """
+        try:
+            if asynchronous: start_async_server(self, server_address, logger, self._max_clients, self._max_jobs)
+            else: start_server(self, server_address, logger)
+
+        # Shutdown worker processes however server stops (e.g. CTRL + C)
+        finally:
+            if self._compute_pool: self._compute_pool.close()
+
+    def _multiply(self, matrix_a: ndarray, matrix_b: ndarray, index: int, modulus: ndarray) -> Matrix:
+        """
+        Multiply 2 matrices modulo client's modulus using multithreading (i.e. Matrix A is masked with uniformly random residues, so it's only meaningful modulo modulus)
+
+        Args:
+            matrix_a (ndarray): Masked Matrix A
+            matrix_b (ndarray): Matrix B (reduced modulo modulus)
+            index (int): Matrix position
+            modulus (ndarray): Modulus chosen by client (0-dimensional array)
+
+        Returns:
+            Matrix: Position and multiple of Matrix A and Matrix B modulo modulus
+        """
+        start = perf_counter()
+        multiply = partial(modular_dot, modulus = int(modulus))
+
+        # Multiply matrices exactly via float64 BLAS, one limb of Matrix A at a time (split into row bands across worker processes, if enabled)
+        if self._compute_pool: product = Matrix(index, self._compute_pool.multiply(matrix_a, matrix_b, multiply))
+        else: product = Matrix(index, multiply(matrix_a, matrix_b))
+
+        end = perf_counter()
+        SERVER_LOGGER.info(f"Multiplied matrices modulo {int(modulus)} in {timing(end, start)} seconds\n")
+        
+        return product
\ No newline at end of file
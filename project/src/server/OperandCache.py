@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from pickle import dumps, HIGHEST_PROTOCOL
+from threading import Lock
+from typing import Any
+from numpy import ndarray
+
+CACHE_BYTES = 1073741824
+"""Memory budget (bytes) of a server's operand cache (i.e. 1 GiB)"""
+
+def operand_size(operand: Any) -> int:
+    """
+    Memory (bytes) used by operand (i.e. buffer size of ndarrays, pickled size of anything else)
+
+    Args:
+        operand (Any): Operand (e.g. partition of Matrix B)
+
+    Returns:
+        int: Memory (bytes) used by operand
+    """
+    if isinstance(operand, ndarray) and not operand.dtype.hasobject: return operand.nbytes
+    return len(dumps(operand, protocol = HIGHEST_PROTOCOL))
+
+class OperandCache():
+    def __init__(self, max_bytes: int = CACHE_BYTES):
+        # Memory budget (bytes); least recently used operands are evicted beyond it
+        self._max_bytes = max_bytes
+
+        # Cached operands, least recently used first (i.e. Key = content hash, Value = operand and its size)
+        self._operands: OrderedDict[bytes, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+
+        # Number of lookups that found their operand, lookups that didn't, and operands evicted
+        self.hits = self.misses = self.evictions = 0
+
+    def __repr__(self) -> str:
+        return (f"OperandCache(operands = {len(self._operands)}, bytes = {self._bytes}/{self._max_bytes}, "
+                f"hits = {self.hits}, misses = {self.misses}, evictions = {self.evictions})")
+
+    def get(self, digest: bytes) -> Any | None:
+        """
+        Get cached operand, marking it as most recently used
+
+        Args:
+            digest (bytes): Operand's content hash
+
+        Returns:
+            Any | None: Operand; None if it isn't cached (e.g. it was evicted)
+        """
+        with self._lock:
+            entry = self._operands.get(digest)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._operands.move_to_end(digest)
+
+            return entry[0]
+
+    def put(self, digest: bytes, operand: Any) -> bool:
+        """
+        Cache operand, evicting least recently used operands until it fits (operands larger than the whole budget aren't cached)
+
+        Args:
+            digest (bytes): Operand's content hash
+            operand (Any): Operand
+
+        Returns:
+            bool: True if operand was cached, else False (i.e. it's larger than the whole budget)
+        """
+        size = operand_size(operand)
+        if size > self._max_bytes: return False
+
+        with self._lock:
+            previous = self._operands.pop(digest, None)
+            if previous is not None: self._bytes -= previous[1]
+
+            while self._operands and self._bytes + size > self._max_bytes:
+                _, (_, evicted_size) = self._operands.popitem(last = False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+            self._operands[digest] = (operand, size)
+            self._bytes += size
+
+        return True
@@ -1,13 +1,15 @@
-from numpy import ndarray, dot
+from numpy import ndarray
 from logging import getLogger, Logger
 from time import perf_counter
 from typing import NamedTuple
 from project.src.ExceptionHandler import handle_exceptions
-from project.src.server.Shared import start_server, validate_input, get_address, document_info
+from project.src.IntegerMultiply import integer_dot
+from project.src.server.ComputePool import ComputePool
+from project.src.server.OperandCache import OperandCache, CACHE_BYTES
+from project.src.server.Shared import start_server, start_async_server, validate_input, get_address, register_server, MAX_CLIENTS, MAX_JOBS
 from project.src.Shared import (Address, FILE_DIRECTORY_PATH,
                                 create_logger, timing)
 
-# TODO Threading
 # TODO Fix logging for server(s)
 # https://docs.python.org/2/howto/logging-cookbook.html#sending-and-receiving-logging-events-across-a-network
 
@@ -25,7 +27,8 @@ class Matrix(NamedTuple):
     matrix: ndarray
 
 class OriginalServer():
-    def __init__(self, directory_path: str = FILE_DIRECTORY_PATH):
+    def __init__(self, directory_path: str = FILE_DIRECTORY_PATH, asynchronous: bool = False, max_clients: int = MAX_CLIENTS, max_jobs: int = MAX_JOBS,
+                 process_pool: bool = False, cache_bytes: int = CACHE_BYTES):
         create_logger("server.log")
         SERVER_LOGGER.info("Starting Original Server...\n")
         
@@ -35,22 +38,38 @@ class OriginalServer():
         # Ensure server address and directory path are valid
         validate_input(server_address, directory_path, SERVER_LOGGER)
 
-        # Document server info
-        document_info(server_address, SERVER_LOGGER)
+        # Register server (and keep its record alive with heartbeats) so clients can find it
+        register_server(server_address, SERVER_LOGGER)
+
+        # Maximum number of clients served and multiplications run at once (asyncio server only)
+        self._max_clients, self._max_jobs = max_clients, max_jobs
+
+        # Worker processes (one per core) to run multiplications in, if enabled
+        self._compute_pool: ComputePool | None = ComputePool() if process_pool else None
+
+        # Partitions of Matrix B received so far (keyed by content hash), so clients only send each one once
+        self._operand_cache = OperandCache(cache_bytes)
 
         # Start server
-        self._start_original_server(server_address, SERVER_LOGGER)
+        self._start_original_server(server_address, SERVER_LOGGER, asynchronous)
 
     @handle_exceptions(SERVER_LOGGER)
-    def _start_original_server(self, server_address: Address, logger: Logger) -> None:
+    def _start_original_server(self, server_address: Address, logger: Logger, asynchronous: bool = False) -> None:
         """
         Start Original Server
 
         Args:
             server_address (Address): Server's address
             logger (Logger): Logger
+            asynchronous (bool, optional): Serve many clients concurrently with asyncio; defaults to False
         """
-        start_server(self, server_address, logger)
+        try:
+            if asynchronous: start_async_server(self, server_address, logger, self._max_clients, self._max_jobs)
+            else: start_server(self, server_address, logger)
+
+        # Shutdown worker processes however server stops (e.g. CTRL + C)
+        finally:
+            if self._compute_pool: self._compute_pool.close()
 
     def _multiply(self, matrix_a: ndarray, matrix_b: ndarray, index: int) -> Matrix:
         """
@@ -66,8 +85,9 @@ class OriginalServer():
         """
         start = perf_counter()
 
-        # Multiply matrices
-        product = Matrix(index, dot(matrix_a, matrix_b))
+        # Multiply matrices exactly via float64 BLAS (split into row bands across worker processes, if enabled)
+        if self._compute_pool: product = Matrix(index, self._compute_pool.multiply(matrix_a, matrix_b, integer_dot))
+        else: product = Matrix(index, integer_dot(matrix_a, matrix_b))
 
         end = perf_counter()
         SERVER_LOGGER.info(f"Multiplied matrices in {timing(end, start)} seconds\n")
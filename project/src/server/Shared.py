@@ -1,13 +1,28 @@
 from logging import Logger
 from os import path
 from socket import socket, SOL_SOCKET, SO_REUSEADDR
-from os import O_CREAT, O_WRONLY, path, cpu_count, umask, open as opener
+from os import path, cpu_count
 from psutil import virtual_memory
 from platform import platform
-from time import perf_counter
-from datetime import datetime
-from pickle import loads, dumps
-from project.src.Shared import Address, send, receive, timing, cleanup, SERVER_INFO_PATH, ACKNOWLEDGEMENT
+from time import perf_counter, sleep
+from typing import Any
+from threading import Thread
+from asyncio import StreamReader, StreamWriter, Semaphore, Lock, create_task, gather, get_running_loop, run, start_server as start_asyncio_server
+from concurrent.futures import Executor, ThreadPoolExecutor
+from project.src.server.OperandCache import OperandCache
+from project.src.server.TileAccumulator import TileAccumulator
+from project.src.ServerRegistry import ServerRegistry, HEARTBEAT_INTERVAL
+from project.src.Shared import (Address, Accumulate, Keep, Ping, Reference, send, send_message, receive_message, send_async, send_message_async, receive_message_async,
+                                timing, cleanup, ACKNOWLEDGEMENT)
+
+MAX_CLIENTS = 64
+"""Maximum number of clients an asyncio server handles at once"""
+
+MAX_JOBS = cpu_count() or 1
+"""Maximum number of multiplications an asyncio server runs at once"""
+
+MAX_PENDING = 2 * MAX_JOBS
+"""Maximum number of jobs an asyncio server holds per client (i.e. one running and one waiting per multiplication slot, so receiving overlaps multiplying)"""
 
 def validate_input(server_address: Address | None, directory_path: str, logger: Logger) -> None:
     """
@@ -63,42 +78,210 @@ def get_address() -> Address:
         sock.bind(("", 0))
         return Address(sock.getsockname()[0], sock.getsockname()[1])
 
-# TODO After x lines, create new file. After creating N files, delete N - 1 files.
-def document_info(address: Address, logger: Logger, filepath: str = SERVER_INFO_PATH) -> None:
+def register_server(address: Address, logger: Logger, registry: ServerRegistry | None = None) -> Thread:
     """
-    Document server's IP Address, port, number of cores, available RAM, OS, and timestamp to SERVER_INFO_PATH
+    Add server's record to registry, then keep refreshing it with heartbeats (re-registering if it expired) on a background thread
 
     Args:
         address (Address): Server's address
         logger (Logger): Logger
-        filepath (str, optional): Path of file to read from; defaults to SERVER_INFO_PATH
+        registry (ServerRegistry | None, optional): Server registry; defaults to the one at SERVER_REGISTRY_PATH
+
+    Returns:
+        Thread: Heartbeat thread
     """
-    # Append to file if < 1 GB; creates it if it does not exist or is empty
-    if not path.exists(filepath) or not path.isfile(filepath) or path.getsize(filepath) < 1000000000: mode = "a"
+    registry = registry or ServerRegistry()
+    registry.register(address, cpu_count() or 1, virtual_memory().available / 1000000000, platform(terse = True))
+    logger.info(f"Registered server at {address}\n")
 
-    # Else, overwrite file if size >= 1 GB
-    else: mode = "w"
+    def beat() -> None:
+        while True:
+            sleep(HEARTBEAT_INTERVAL)
 
-    # File will have no privileges initially revoked
-    # TODO If statement
-    umask(0)
+            try:
+                if not registry.heartbeat(address, virtual_memory().available / 1000000000):
+                    logger.info(f"Record for server at {address} expired; registering again\n")
+                    registry.register(address, cpu_count() or 1, virtual_memory().available / 1000000000, platform(terse = True))
 
-    # Create and write permissions to file for all users
-    descriptor = opener(filepath, flags = O_CREAT | O_WRONLY, mode = 0o777)
-    
-    # Create file and write Server's IP Address, port, number of cores, available RAM, OS, and timestamp to file
-    with open(descriptor, mode) as file:
-        file.write(f"{address.ip} {address.port} {cpu_count()} {virtual_memory().available / 1000000000:.2f} {platform(terse = True)} {datetime.now()}\n")
+            except Exception:
+                logger.exception(f"Unable to send heartbeat for server at {address}; retrying...\n")
+
+    heartbeat = Thread(target = beat, name = "Heartbeat", daemon = True)
+    heartbeat.start()
+
+    return heartbeat
+
+def unregister_server(address: Address, logger: Logger, registry: ServerRegistry | None = None) -> None:
+    """
+    Remove server's record from registry
+
+    Args:
+        address (Address): Server's address
+        logger (Logger): Logger
+        registry (ServerRegistry | None, optional): Server registry; defaults to the one at SERVER_REGISTRY_PATH
+    """
+    try:
+        (registry or ServerRegistry()).unregister(address)
+        logger.info(f"Unregistered server at {address}\n")
+
+    # Record will expire on its own
+    except Exception:
+        logger.exception(f"Unable to unregister server at {address}\n")
+
+def split_keep(payloads: list[Any]) -> tuple[Keep | Accumulate | None, list[Any]]:
+    """
+    Separate request to keep or accumulate a job's result on the server (i.e. its first payload, if any) from the rest of its payload(s)
+
+    Args:
+        payloads (list[Any]): Payload(s) received from client
+
+    Returns:
+        tuple[Keep | Accumulate | None, list[Any]]: Keep or accumulate request (None if result is to be sent back) and remaining payload(s)
+    """
+    if payloads and isinstance(payloads[0], (Keep, Accumulate)): return payloads[0], payloads[1:]
+    return None, payloads
+
+def keep_result(keep: Keep | None, result: Any, cache: OperandCache, logger: Logger) -> Any:
+    """
+    Cache job's result if client asked to keep it (e.g. intermediate product of a chain, which a later job multiplies further)
+
+    Args:
+        keep (Keep | None): Keep request; None if result is to be sent back
+        result (Any): Job's result
+        cache (OperandCache): Cache of operands received so far
+        logger (Logger): Logger
+
+    Returns:
+        Any: Data to send back to client (i.e. keep request once result is cached, else result itself, e.g. it's larger than the whole cache)
+    """
+    if keep is None or not cache.put(keep.digest, result): return result
+
+    logger.info(f"Kept result {keep.digest.hex()}: {cache}\n")
+    return keep
+
+def accumulate_result(accumulate: Accumulate, result: Any, tiles: TileAccumulator, logger: Logger) -> Any:
+    """
+    Add job's result to the other products of its tile (i.e. client sent every partition of Matrix A in a row of partitions to this server)
+
+    Args:
+        accumulate (Accumulate): Tile's key and number of products in it
+        result (Any): Job's result
+        tiles (TileAccumulator): Partial sums of tiles received over this connection
+        logger (Logger): Logger
+
+    Returns:
+        Any: Data to send back to client (i.e. tile's finished sum once every product was added, else accumulate request as confirmation)
+    """
+    total = tiles.add(accumulate, result)
+    if total is None: return accumulate
+
+    logger.info(f"Finished tile {accumulate.digest.hex()} ({accumulate.count} products): {tiles}\n")
+    return total
+
+def discard_tile(accumulate: Accumulate, tiles: TileAccumulator, logger: Logger) -> Accumulate:
+    """
+    Drop partial sum of a tile client gave up on (i.e. its products are being run elsewhere), rather than holding it for as long as the connection lasts
+
+    Args:
+        accumulate (Accumulate): Tile's key
+        tiles (TileAccumulator): Partial sums of tiles received over this connection
+        logger (Logger): Logger
+
+    Returns:
+        Accumulate: Accumulate request, sent back as confirmation
+    """
+    tiles.discard(accumulate.digest)
+    logger.info(f"Discarded tile {accumulate.digest.hex()}: {tiles}\n")
+
+    return accumulate
+
+def finish_result(request: Keep | Accumulate | None, result: Any, cache: OperandCache, tiles: TileAccumulator, logger: Logger) -> Any:
+    """
+    Keep or accumulate job's result, if client asked to
+
+    Args:
+        request (Keep | Accumulate | None): Keep or accumulate request; None if result is to be sent back
+        result (Any): Job's result
+        cache (OperandCache): Cache of operands received so far
+        tiles (TileAccumulator): Partial sums of tiles received over this connection
+        logger (Logger): Logger
+
+    Returns:
+        Any: Data to send back to client
+    """
+    if isinstance(request, Accumulate): return accumulate_result(request, result, tiles, logger)
+    return keep_result(request, result, cache, logger)
+
+def resolve_operands(payloads: list[Any], cache: OperandCache, logger: Logger) -> tuple[tuple[Any, ...] | Reference | Ping, Reference | None]:
+    """
+    Get partitions of Matrix A and Matrix B from a job's payload(s), i.e. partition of Matrix A (followed by its mask, if redacted numerically), then either
+    partition of Matrix B, a reference to a cached partition of Matrix B, or the reference followed by partition of Matrix B (i.e. partition of Matrix B is to be cached);
+    partition of Matrix A may itself be a reference to a result kept on the server
+
+    Args:
+        payloads (list[Any]): Payload(s) received from client
+        cache (OperandCache): Cache of operands received so far
+        logger (Logger): Logger
+
+    Returns:
+        tuple[tuple[Any, ...] | Reference | Ping, Reference | None]: Partitions of Matrix A and Matrix B (followed by mask, if any); reference if partition of Matrix A or Matrix B
+        is no longer cached, or ping if client is only checking that server is up (i.e. reply to send back without multiplying); followed by a reference to partition of Matrix B
+        if it was uploaded but couldn't be cached (i.e. larger than cache's budget), else None
+    """
+    # Health check
+    if isinstance(payloads[0], Ping): return Ping(), None
+
+    # Partition of Matrix A kept on this server by an earlier job
+    if isinstance(payloads[0], Reference):
+        matrix_a_partition = cache.get(payloads[0].digest)
+        logger.info(f"Kept result {payloads[0].digest.hex()} {'missed' if matrix_a_partition is None else 'hit'}: {cache}\n")
+
+        if matrix_a_partition is None: return payloads[0], None
+        payloads = [matrix_a_partition, *payloads[1:]]
+
+    references = [i for i, payload in enumerate(payloads) if isinstance(payload, Reference)]
+
+    # Both partitions sent in full
+    if not references:
+        (matrix_a_partition, *mask), matrix_b_partition = payloads[:-1], payloads[-1]
+        return (matrix_a_partition, matrix_b_partition, *mask), None
+
+    (matrix_a_partition, *mask), reference, uploaded = payloads[:references[0]], payloads[references[0]], payloads[references[0] + 1:]
+
+    # Partition of Matrix B sent along with its content hash, to be referenced by later jobs
+    if uploaded:
+        cached = cache.put(reference.digest, uploaded[0])
+        logger.info(f"{'Cached' if cached else 'Could not cache (larger than budget)'} operand {reference.digest.hex()}: {cache}\n")
+
+        return (matrix_a_partition, uploaded[0], *mask), None if cached else reference
+
+    matrix_b_partition = cache.get(reference.digest)
+    logger.info(f"Operand {reference.digest.hex()} {'missed' if matrix_b_partition is None else 'hit'}: {cache}\n")
 
-    logger.info(f"Recorded information and timestamp for server at {address}\n")
+    return reference if matrix_b_partition is None else (matrix_a_partition, matrix_b_partition, *mask), None
 
-def send_client(client_socket: socket, data: bytes, server_address: Address, logger: Logger) -> None:
+def flag_uncached(data: Any, uncached: Reference | None) -> Any:
+    """
+    Append reference to an uploaded operand that couldn't be cached to data sent back, so client keeps sending it in full rather than referencing it
+
+    Args:
+        data (Any): Data to send back to client
+        uncached (Reference | None): Reference to operand that couldn't be cached; None if there's none
+
+    Returns:
+        Any: Data to send back to client
+    """
+    if uncached is None: return data
+    return [*(data if isinstance(data, list) else [data]), uncached]
+
+def send_client(client_socket: socket, index: int, data: Any, server_address: Address, logger: Logger) -> None:
     """
     Send data to client
 
     Args:
         client_socket (socket): Client socket
-        data (bytes): Message packet (i.e. data) to send to client
+        index (int): Position of data
+        data (Any): Message (i.e. data) to send to client; a list is sent as one frame per item
         server_address (Address): Server address
         logger (Logger): Logger
     """
@@ -107,15 +290,16 @@ def send_client(client_socket: socket, data: bytes, server_address: Address, log
     # Add header to and send acknowledgment packet
     send(client_socket, ACKNOWLEDGEMENT.encode("utf-8"))
 
-    # Add header to and send message packet back to client
-    send(client_socket, data)
+    # Send message frame(s) back to client
+    send_message(client_socket, index, *(data if isinstance(data, list) else [data]))
 
     end = perf_counter()
     logger.info(f"Server at {server_address} sent acknowledgement and message packet back to client {client_socket} in {timing(end, start)} seconds\n")
 
 def handle_client(self, client_socket: socket, server_address: Address, logger: Logger) -> None:
     """
-    Get partitions of Matrix A and Matrix B from client, multiply them, then send result back to client
+    Get partitions of Matrix A and Matrix B from client, multiply them, then send result back to client;
+    repeats for every job the client sends over the connection (i.e. keep-alive) until the client disconnects
 
     Args:
         client_socket (socket): Client socket
@@ -123,36 +307,51 @@ def handle_client(self, client_socket: socket, server_address: Address, logger:
         logger (Logger): Logger
 
     Raises:
-        EOFError: Client is checking if server is listening
+        EOFError: Client disconnected
     """
-    start = perf_counter()
+    # Partial sums of tiles sent over this connection (i.e. discarded with it, if client disconnects part-way through a tile)
+    tiles = TileAccumulator()
 
-    # Receive data from client
-    data = receive(client_socket)
+    with client_socket:
+        while True:
+            start = perf_counter()
 
-    # Unpack data (i.e. partitions of Matrix A and Matrix B and their position)
-    try:
-        matrix_a_partition, matrix_b_partition, index = loads(data)
-        print(f"Received and unpacked [{index}]: {matrix_a_partition} and {matrix_b_partition}")
+            # Receive and unpack data (i.e. partitions of Matrix A and Matrix B, or a reference to a cached one, and their position) from client
+            try:
+                index, payloads = receive_message(client_socket)
+                keep, payloads = split_keep(payloads)
 
-    # Catch error encountered when client is checking if server is listening
-    except EOFError:
-        logger.info(f"Client {client_socket} is checking if server at {server_address} is listening\n")
-        return
+                # Accumulate request without partitions means client gave up on its tile
+                if isinstance(keep, Accumulate) and not payloads: operands, uncached = discard_tile(keep, tiles, logger), None
+                else: operands, uncached = resolve_operands(payloads, self._operand_cache, logger)
 
-    except:
-        logger.exception(f"Unexpected error occurred... server at {server_address} will stop handling client {client_socket}\n")
-        return
+            # Catch error encountered when client disconnects
+            except EOFError:
+                logger.info(f"Client {client_socket} disconnected from server at {server_address}\n")
+                return
 
-    # Multiply partitions of Matrix A and Matrix B, while keeping track of their position
-    result = self._multiply(matrix_a_partition, matrix_b_partition, index)
-    
-    # Convert result to bytes, then send back to client
-    send_client(client_socket, dumps(result), server_address, logger)
-    print(f"\nSent: {result}\n")
+            except:
+                logger.exception(f"Unexpected error occurred... server at {server_address} will stop handling client {client_socket}\n")
+                return
 
-    end = perf_counter()
-    logger.info(f"Successfully handled client in {timing(end, start)} second(s)\n")
+            # Reply to health check or discarded tile, or tell client which operand is no longer cached (e.g. it was evicted), so it resends or recomputes it
+            if isinstance(operands, (Ping, Reference, Accumulate)):
+                send_client(client_socket, index, operands, server_address, logger)
+                continue
+
+            matrix_a_partition, matrix_b_partition, *mask = operands
+            logger.debug(f"Received job {index} ({matrix_a_partition.shape} x {matrix_b_partition.shape} partitions)\n")
+
+            # Multiply partitions of Matrix A and Matrix B, while keeping track of their position
+            index, result = self._multiply(matrix_a_partition, matrix_b_partition, index, *mask)
+
+            # Send result back to client (or confirm it was kept or accumulated, if client asked to)
+            result = finish_result(keep, result, self._operand_cache, tiles, logger)
+            send_client(client_socket, index, flag_uncached(result, uncached), server_address, logger)
+            logger.debug(f"Sent result of job {index} ({getattr(result, 'shape', type(result).__name__)})\n")
+
+            end = perf_counter()
+            logger.info(f"Successfully handled job {index} in {timing(end, start)} second(s)\n")
     
 def start_server(self, server_address: Address, logger: Logger) -> None:
     """
@@ -189,8 +388,9 @@ def start_server(self, server_address: Address, logger: Logger) -> None:
                 # TODO Break out of while loop if client address is not an allowed address
 
                 # Handle client (i.e. get position and partitions of Matrix A and Matrix B,
-                # multiply them, then send result and its position back to client)
-                handle_client(self, client_socket, server_address, logger)
+                # multiply them, then send result and its position back to client) on its own thread,
+                # since the client keeps its connection open for further jobs
+                Thread(target = handle_client, args = (self, client_socket, server_address, logger), daemon = True).start()
 
     # Catch error encountered when server is disconnected via CTRL + C
     except KeyboardInterrupt:
@@ -198,6 +398,141 @@ def start_server(self, server_address: Address, logger: Logger) -> None:
         exit(0)
 
     finally:
+        unregister_server(server_address, logger)
+
         end = perf_counter()
         logger.info(f"Encrypted Server at {server_address} ran for {timing(end, start)} seconds")
-        cleanup(logger)
\ No newline at end of file
+        cleanup(logger)
+
+async def handle_client_async(self, reader: StreamReader, writer: StreamWriter, server_address: Address,
+                              jobs: Semaphore, executor: Executor, logger: Logger, max_pending: int = MAX_PENDING) -> None:
+    """
+    Get partitions of Matrix A and Matrix B from client, multiply them in executor, then send each result back to client as soon as it's ready
+    (i.e. several jobs from one client run at once, and their results may be sent out of order) until the client disconnects
+
+    Args:
+        reader (StreamReader): Client stream reader
+        writer (StreamWriter): Client stream writer
+        server_address (Address): Server address
+        jobs (Semaphore): Limits number of multiplications running at once (across all clients)
+        executor (Executor): Executor to run multiplications in
+        logger (Logger): Logger
+        max_pending (int, optional): Maximum number of this client's jobs received but not yet answered (i.e. further frames wait in the socket); defaults to MAX_PENDING
+    """
+    client_address = writer.get_extra_info("peername")
+    write_lock, tasks, pending = Lock(), set(), Semaphore(max_pending)
+
+    # Partial sums of tiles sent over this connection (i.e. discarded with it, if client disconnects part-way through a tile)
+    tiles = TileAccumulator()
+
+    async def run_job(keep: Keep | Accumulate | None, uncached: Reference | None, index: int, matrix_a_partition: Any, matrix_b_partition: Any, *mask: Any) -> None:
+        start = perf_counter()
+
+        try:
+            # Multiply partitions of Matrix A and Matrix B off the event loop, while keeping track of their position
+            async with jobs:
+                index, result = await get_running_loop().run_in_executor(executor, self._multiply, matrix_a_partition, matrix_b_partition, index, *mask)
+
+            # Keep or accumulate result on server instead of sending it back, if client asked to
+            result = flag_uncached(finish_result(keep, result, self._operand_cache, tiles, logger), uncached)
+
+            # Send acknowledgement and result back to client (i.e. one response at a time per client)
+            async with write_lock:
+                send_async(writer, ACKNOWLEDGEMENT.encode("utf-8"))
+                await send_message_async(writer, index, *(result if isinstance(result, list) else [result]))
+
+        # Free job's slot, so the next frame from client is read
+        finally: pending.release()
+
+        end = perf_counter()
+        logger.info(f"Successfully handled job {index} from {client_address} in {timing(end, start)} second(s)\n")
+
+    try:
+        while True:
+            # Wait for a free slot before reading the next frame, so a client can't queue unbounded jobs (and their operands) in memory
+            await pending.acquire()
+
+            # Receive and unpack data (i.e. partitions of Matrix A and Matrix B, or a reference to a cached one, and their position) from client
+            try: index, payloads = await receive_message_async(reader)
+
+            # Catch error encountered when client disconnects
+            except EOFError:
+                logger.info(f"Client {client_address} disconnected from server at {server_address}\n")
+                break
+
+            # Resolve references in order of arrival, so a job can reference an operand uploaded by the job before it
+            keep, payloads = split_keep(payloads)
+
+            # Accumulate request without partitions means client gave up on its tile
+            if isinstance(keep, Accumulate) and not payloads: operands, uncached = discard_tile(keep, tiles, logger), None
+            else: operands, uncached = resolve_operands(payloads, self._operand_cache, logger)
+
+            # Reply to health check or discarded tile, or tell client which operand is no longer cached (e.g. it was evicted), so it resends or recomputes it
+            if isinstance(operands, (Ping, Reference, Accumulate)):
+                async with write_lock:
+                    send_async(writer, ACKNOWLEDGEMENT.encode("utf-8"))
+                    await send_message_async(writer, index, operands)
+
+                pending.release()
+                continue
+
+            task = create_task(run_job(keep, uncached, index, *operands))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        # Finish jobs already received before closing connection
+        await gather(*tasks)
+
+    except Exception:
+        logger.exception(f"Unexpected error occurred... server at {server_address} will stop handling client {client_address}\n")
+
+    finally:
+        for task in tasks: task.cancel()
+        writer.close()
+
+def start_async_server(self, server_address: Address, logger: Logger, max_clients: int = MAX_CLIENTS, max_jobs: int = MAX_JOBS) -> None:
+    """
+    Start asyncio server and serve many clients concurrently, running multiplications in a thread pool
+
+    Args:
+        server_address (Address): Server address
+        logger (Logger): Logger
+        max_clients (int, optional): Maximum number of clients served at once (others wait); defaults to MAX_CLIENTS
+        max_jobs (int, optional): Maximum number of multiplications running at once; defaults to MAX_JOBS
+
+    Raises:
+        KeyboardInterrupt: Server disconnected due to keyboard (i.e. CTRL + C)
+    """
+    start = perf_counter()
+
+    async def serve() -> None:
+        clients, jobs = Semaphore(max_clients), Semaphore(max_jobs)
+
+        async def on_connect(reader: StreamReader, writer: StreamWriter) -> None:
+            async with clients:
+                logger.info(f"Server at {server_address} accepted connection from {writer.get_extra_info('peername')}\n")
+                await handle_client_async(self, reader, writer, server_address, jobs, executor, logger, 2 * max_jobs)
+
+        with ThreadPoolExecutor(max_workers = max_jobs) as executor:
+            server = await start_asyncio_server(on_connect, server_address.ip, server_address.port, reuse_address = True)
+
+            async with server:
+                listen_msg = f"Server at {server_address} listening for connection(s) (asyncio; up to {max_clients} clients, {max_jobs} jobs)..."
+                logger.info(f"{listen_msg}\n")
+                print(listen_msg)
+
+                await server.serve_forever()
+
+    try: run(serve())
+
+    # Catch error encountered when server is disconnected via CTRL + C
+    except KeyboardInterrupt:
+        print(f"\nServer at {server_address} disconnected")
+        exit(0)
+
+    finally:
+        unregister_server(server_address, logger)
+
+        end = perf_counter()
+        logger.info(f"Server at {server_address} ran for {timing(end, start)} seconds")
+        cleanup(logger)
@@ -1,20 +1,42 @@
 from logging import getLogger, Logger
 from time import perf_counter
+from numpy import ndarray, nonzero, int32
 from sympy import Matrix
 from project.src.ExceptionHandler import handle_exceptions
-from project.src.server.Shared import start_server, validate_input, get_address, document_info
+from project.src.IntegerMultiply import integer_dot
+from project.src.server.ComputePool import ComputePool
+from project.src.server.LinearMatrix import to_linear, to_integers, multiply_linear
+from project.src.server.OperandCache import OperandCache, CACHE_BYTES
+from project.src.server.Shared import start_server, start_async_server, validate_input, get_address, register_server, MAX_CLIENTS, MAX_JOBS
 from project.src.Shared import (Address, FILE_DIRECTORY_PATH,
                                 create_logger, timing)
 
-# TODO Threading
 # TODO Fix logging for server(s)
 # https://docs.python.org/2/howto/logging-cookbook.html#sending-and-receiving-logging-events-across-a-network
 
 SERVER_LOGGER = getLogger(__name__)
 """Server logger"""
 
+def multiply_matrices(matrix_a: Matrix, matrix_b: Matrix) -> Matrix:
+    """
+    Multiply 2 SymPy matrices (module-level, so worker processes can unpickle it); if Matrix A only holds integers and variables
+    and Matrix B only holds integers, multiply them as a linear store and integer ndarray instead of symbolically
+
+    Args:
+        matrix_a (Matrix): Matrix A
+        matrix_b (Matrix): Matrix B
+
+    Returns:
+        Matrix: Product of Matrix A and Matrix B
+    """
+    linear_a, integer_b = to_linear(matrix_a), to_integers(matrix_b)
+
+    if linear_a is None or integer_b is None: return matrix_a.multiply(matrix_b)
+    return multiply_linear(linear_a, integer_b)
+
 class SubstitutionServer():
-    def __init__(self, directory_path: str = FILE_DIRECTORY_PATH):
+    def __init__(self, directory_path: str = FILE_DIRECTORY_PATH, asynchronous: bool = False, max_clients: int = MAX_CLIENTS, max_jobs: int = MAX_JOBS,
+                 process_pool: bool = False, cache_bytes: int = CACHE_BYTES):
         create_logger("server.log")
         SERVER_LOGGER.info("Starting Substitution Server...\n")
         
@@ -24,39 +46,68 @@ class SubstitutionServer():
         # Ensure server address and directory path are valid
         validate_input(server_address, directory_path, SERVER_LOGGER)
 
-        # Document server info
-        document_info(server_address, SERVER_LOGGER)
+        # Register server (and keep its record alive with heartbeats) so clients can find it
+        register_server(server_address, SERVER_LOGGER)
+
+        # Maximum number of clients served and multiplications run at once (asyncio server only)
+        self._max_clients, self._max_jobs = max_clients, max_jobs
+
+        # Worker processes (one per core) to run multiplications in, if enabled
+        self._compute_pool: ComputePool | None = ComputePool() if process_pool else None
+
+        # Partitions of Matrix B received so far (keyed by content hash), so clients only send each one once
+        self._operand_cache = OperandCache(cache_bytes)
 
         # Start server
-        self._start_substitution_server(server_address, SERVER_LOGGER)
+        self._start_substitution_server(server_address, SERVER_LOGGER, asynchronous)
 
     @handle_exceptions(SERVER_LOGGER)
-    def _start_substitution_server(self, server_address: Address, logger: Logger) -> None:
+    def _start_substitution_server(self, server_address: Address, logger: Logger, asynchronous: bool = False) -> None:
         """
         Start Substitution Server
 
         Args:
             server_address (Address): Server's address
             logger (Logger): Logger
+            asynchronous (bool, optional): Serve many clients concurrently with asyncio; defaults to False
         """
-        start_server(self, server_address, logger)
+        try:
+            if asynchronous: start_async_server(self, server_address, logger, self._max_clients, self._max_jobs)
+            else: start_server(self, server_address, logger)
+
+        # Shutdown worker processes however server stops (e.g. CTRL + C)
+        finally:
+            if self._compute_pool: self._compute_pool.close()
 
-    def _multiply(self, matrix_a: Matrix, matrix_b: Matrix, index: int) -> tuple[int, Matrix]:
+    def _multiply(self, matrix_a: Matrix | ndarray, matrix_b: Matrix | ndarray, index: int, mask: ndarray | None = None) -> tuple[int, Matrix | list[ndarray]]:
         """
-        Multiply 2 matrices using multithreading
+        Multiply 2 matrices using multithreading; if Matrix A comes with a mask (i.e. numeric substitution),
+        its masked elements are unknowns (sent as 0), so the product is returned with each unknown's coefficients
 
         Args:
-            matrix_a (Matrix): Matrix A
-            matrix_b (Matrix): Matrix B
+            matrix_a (Matrix | ndarray): Matrix A (redacted with variables, or with masked elements zeroed)
+            matrix_b (Matrix | ndarray): Matrix B
             index (int): Matrix position
+            mask (ndarray | None, optional): Which elements of Matrix A are unknown; defaults to None (i.e. symbolic substitution)
 
         Returns:
-            tuple[int, Matrix]: Position and multiple of Matrix A and Matrix B
+            tuple[int, Matrix | list[ndarray]]: Position and multiple of Matrix A and Matrix B; for numeric substitution, product of known elements,
+            then row and column of each unknown (i.e. unknown k adds its value times row columns[k] of Matrix B to row rows[k] of product)
         """
         start = perf_counter()
 
-        # Multiply matrices
-        product = matrix_a.multiply(matrix_b)
+        # Multiply known elements of Matrix A by Matrix B exactly via float64 BLAS (split into row bands across worker processes, if enabled)
+        if mask is not None:
+            if self._compute_pool: product = self._compute_pool.multiply(matrix_a, matrix_b, integer_dot)
+            else: product = integer_dot(matrix_a, matrix_b)
+
+            # Every unknown's coefficients are a row of Matrix B, so its position is enough to describe them
+            rows, columns = nonzero(mask)
+            product = [product, rows.astype(int32), columns.astype(int32)]
+
+        # Multiply matrices (split into row bands across worker processes, if enabled)
+        elif self._compute_pool: product = self._compute_pool.multiply(matrix_a, matrix_b, multiply_matrices, Matrix.vstack)
+        else: product = multiply_matrices(matrix_a, matrix_b)
 
         end = perf_counter()
         SERVER_LOGGER.info(f"Multiplied matrices in {timing(end, start)} seconds\n")
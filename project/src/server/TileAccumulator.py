@@ -0,0 +1,59 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any
+from project.src.Shared import Accumulate
+
+MAX_DISCARDED = 4096
+"""Number of tiles discarded by client that are remembered per connection (i.e. their products still arriving are ignored, rather than starting a new partial sum)"""
+
+class TileAccumulator():
+    def __init__(self):
+        # Partial sums of tiles still waiting for some of their products (i.e. Key = tile's key, Value = sum so far and number of products added)
+        self._tiles: dict[bytes, tuple[Any, int]] = { }
+
+        # Keys of tiles client gave up on, oldest first
+        self._discarded: OrderedDict[bytes, None] = OrderedDict()
+
+        # Products of the same tile may finish at the same time (e.g. asyncio server)
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        return f"TileAccumulator(tiles = {len(self._tiles)}, discarded = {len(self._discarded)})"
+
+    def add(self, accumulate: Accumulate, product: Any) -> Any | None:
+        """
+        Add product to its tile's sum, in place
+
+        Args:
+            accumulate (Accumulate): Tile's key and number of products in it
+            product (Any): Product of partitions of Matrix A and Matrix B
+
+        Returns:
+            Any | None: Tile's finished sum once every product was added, else None (also if tile was discarded)
+        """
+        with self._lock:
+            if accumulate.digest in self._discarded: return None
+
+            total, added = self._tiles.pop(accumulate.digest, (None, 0))
+
+            if total is None: total = product
+            else: total += product
+
+            if added + 1 < accumulate.count:
+                self._tiles[accumulate.digest] = (total, added + 1)
+                return None
+
+        return total
+
+    def discard(self, digest: bytes) -> None:
+        """
+        Drop tile's partial sum (e.g. client sent its products elsewhere), ignoring any of its products added later
+
+        Args:
+            digest (bytes): Tile's key
+        """
+        with self._lock:
+            self._tiles.pop(digest, None)
+            self._discarded[digest] = None
+
+            if len(self._discarded) > MAX_DISCARDED: self._discarded.popitem(last = False)
@@ -0,0 +1,74 @@
+# This file is used to benchmark the work done for one partition by project.src.client.MaskingClient and project.src.server.MaskingServer against
+# the plaintext (i.e. OriginalServer) multiplication
+from sys import argv
+from time import perf_counter
+from numpy import ndarray, array_equal, random, int64
+from project.src.client.MaskingClient import MODULUS
+from project.src.IntegerMultiply import integer_dot, modular_dot
+from project.src.Shared import SIG_FIGS
+
+SIZES = [ 256, 512, 1024, 2048 ]
+"""Partition sizes (i.e. length and width of partition of Matrix A, and length of partition of Matrix B) to benchmark"""
+
+WIDTH = 256
+"""Width of partition of Matrix B"""
+
+BOUND = 1000
+"""Elements are drawn from [-BOUND, BOUND)"""
+
+def unmask(result: ndarray, correction: ndarray, modulus: int) -> ndarray:
+    """
+    Unmask product, as MaskingClient._process_result does
+
+    Args:
+        result (ndarray): Product of masked partition of Matrix A and partition of Matrix B, modulo modulus
+        correction (ndarray): Mask * partition of Matrix B, modulo modulus
+        modulus (int): Modulus
+
+    Returns:
+        ndarray: Product of partitions
+    """
+    product = (result - correction) % modulus
+    product[product > modulus // 2] -= modulus
+
+    return product
+
+def benchmark(sizes: list[int] = SIZES, modulus: int = MODULUS) -> None:
+    """
+    Print time taken to multiply a partition in plaintext, to mask it and compute its correction (client, in the background),
+    to multiply it masked (server), and to unmask the result (client)
+
+    Args:
+        sizes (list[int], optional): Partition sizes; defaults to SIZES
+        modulus (int, optional): Modulus; defaults to MODULUS
+    """
+    generator = random.default_rng(0)
+
+    for size in sizes:
+        matrix_a, matrix_b = generator.integers(-BOUND, BOUND, (size, size)), generator.integers(-BOUND, BOUND, (size, WIDTH))
+
+        start = perf_counter()
+        expected = integer_dot(matrix_a, matrix_b)
+        plaintext = perf_counter() - start
+
+        start = perf_counter()
+        mask = generator.integers(0, modulus, size = matrix_a.shape, dtype = int64)
+        masked, residues_b = (matrix_a % modulus + mask) % modulus, matrix_b % modulus
+        correction = modular_dot(mask, residues_b, modulus)
+        precompute = perf_counter() - start
+
+        start = perf_counter()
+        result = modular_dot(masked, residues_b, modulus)
+        server = perf_counter() - start
+
+        start = perf_counter()
+        product = unmask(result, correction, modulus)
+        client = perf_counter() - start
+
+        print(f"{size:>5} x {size:<5} | plaintext {round(plaintext, SIG_FIGS):>8} seconds | precompute {round(precompute, SIG_FIGS):>8} seconds | "
+              f"masked {round(server, SIG_FIGS):>8} seconds ({round(server / plaintext, 1)}x) | unmask {round(client, SIG_FIGS):>8} seconds | "
+              f"exact: {array_equal(product, expected)}")
+
+if __name__ == "__main__":
+    # Optionally pass sizes on the command line, e.g. python -m project.test.benchmark_masking 256 512
+    benchmark([int(size) for size in argv[1:]] or SIZES)
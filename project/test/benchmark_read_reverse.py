@@ -0,0 +1,105 @@
+# This file is used to benchmark project.src.client.Shared.read_file_reverse against the original (i.e. one seek and read per byte) implementation
+from sys import argv
+from os import SEEK_END, path
+from tempfile import TemporaryDirectory
+from datetime import datetime, timedelta
+from time import perf_counter
+from collections.abc import Callable, Iterator
+from project.src.client.Shared import read_file_reverse
+from project.src.Shared import SIG_FIGS
+
+SIZES = [ 1000000, 100000000, 1000000000 ]
+"""Server info file sizes (bytes) to benchmark; 1 MB, 100 MB, and 1 GB"""
+
+LEGACY_MAX_SIZE = 10000000
+"""Largest file size (bytes) to benchmark legacy_read_file_reverse with, since it reads one byte per seek (i.e. 1 GB takes tens of minutes)"""
+
+RECENT_LINES = 100
+"""Number of most recent lines read when benchmarking early stopping"""
+
+def legacy_read_file_reverse(filepath: str) -> Iterator[str]:
+    """
+    Original read_file_reverse (i.e. seeks and reads one byte at a time)
+
+    Args:
+        filepath (str): Path of file to read from
+
+    Yields:
+        Iterator[str]: Line(s) in file at filepath
+    """
+    with open(filepath, "rb") as file:
+        file.seek(0, SEEK_END)
+        pointer_location = file.tell()
+        buffer = bytearray()
+
+        while pointer_location >= 0:
+            file.seek(pointer_location)
+            pointer_location -= 1
+            new_byte = file.read(1)
+
+            if new_byte == b"\n":
+                yield buffer.decode()[::-1]
+                buffer = bytearray()
+
+            else: buffer.extend(new_byte)
+
+        if len(buffer) > 0: yield buffer.decode()[::-1]
+
+def write_server_info(filepath: str, size: int) -> None:
+    """
+    Write a server info file of (at least) given size, one line per server start, oldest first
+
+    Args:
+        filepath (str): Path of file to write
+        size (int): File size (bytes)
+    """
+    start, written, port = datetime.now() - timedelta(days = 365), 0, 0
+
+    with open(filepath, "w") as file:
+        while written < size:
+            lines = "".join(f"0.0.0.0 {1024 + (port + i) % 64511} 8 15.62 Linux-6.5.0-x86_64-with-glibc2.35 {start + timedelta(seconds = port + i)}\n" for i in range(10000))
+            file.write(lines)
+            written, port = written + len(lines), port + 10000
+
+def scan_time(reader: Callable[[str], Iterator[str]], filepath: str) -> float:
+    """
+    Time reading every line of file
+
+    Args:
+        reader (Callable[[str], Iterator[str]]): Reverse reader to benchmark
+        filepath (str): Path of file to read from
+
+    Returns:
+        float: Time (seconds)
+    """
+    start = perf_counter()
+    for _ in reader(filepath): pass
+
+    return perf_counter() - start
+
+def benchmark(sizes: list[int] = SIZES) -> None:
+    """
+    Print time taken by original and block-buffered read_file_reverse to read each file size, and by the latter to read only the most recent lines
+
+    Args:
+        sizes (list[int], optional): File sizes (bytes); defaults to SIZES
+    """
+    with TemporaryDirectory() as directory:
+        filepath = path.join(directory, "server_info.txt")
+
+        for size in sizes:
+            write_server_info(filepath, size)
+
+            for name, reader in (("legacy", legacy_read_file_reverse), ("block", read_file_reverse)):
+                if reader is legacy_read_file_reverse and size > LEGACY_MAX_SIZE:
+                    print(f"{name:>12} | {size / 1000000:>7} MB | skipped")
+                    continue
+
+                print(f"{name:>12} | {size / 1000000:>7} MB | {round(scan_time(reader, filepath), SIG_FIGS)} seconds")
+
+            print(f"{f'block ({RECENT_LINES})':>12} | {size / 1000000:>7} MB | "
+                  f"{round(scan_time(lambda filepath: read_file_reverse(filepath, max_lines = RECENT_LINES), filepath), SIG_FIGS)} seconds")
+
+if __name__ == "__main__":
+    # Optionally pass sizes (bytes) on the command line, e.g. python -m project.test.benchmark_read_reverse 1000000 100000000
+    benchmark([int(size) for size in argv[1:]] or SIZES)
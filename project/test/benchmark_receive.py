@@ -0,0 +1,96 @@
+# This file is used to benchmark project.src.Shared.receive against the original (i.e. data += packet) implementation
+from sys import argv
+from socket import socket, socketpair
+from threading import Thread
+from time import perf_counter
+from collections.abc import Callable
+from project.src.Shared import send, receive, receive_stream, BUFFER, HEADERSIZE, SIG_FIGS
+
+SIZES = [ 1000000, 100000000, 1000000000 ]
+"""Message sizes (bytes) to benchmark; 1 MB, 100 MB, and 1 GB"""
+
+LEGACY_MAX_SIZE = 100000000
+"""Largest message size (bytes) to benchmark legacy_receive with, since its copying is quadratic (i.e. 1 GB takes hours)"""
+
+def legacy_receive(sock: socket) -> bytes:
+    """
+    Original receive (i.e. grows message by BUFFER-sized packets)
+
+    Args:
+        sock (socket): Connected socket
+
+    Returns:
+        bytes: Received data
+    """
+    data, new_data, msg_length = b"", True, 0
+
+    while True:
+        packet = sock.recv(BUFFER)
+
+        if not packet:
+            break
+        data += packet
+
+        if new_data:
+            msg_length = int(data[:HEADERSIZE])
+            new_data = False
+
+        if len(data) - HEADERSIZE >= msg_length:
+            break
+
+    return (data[HEADERSIZE:HEADERSIZE + msg_length])
+
+def stream_receive(sock: socket) -> int:
+    """
+    Consume message via receive_stream
+
+    Args:
+        sock (socket): Connected socket
+
+    Returns:
+        int: Number of bytes received
+    """
+    return sum(chunk.nbytes for chunk in receive_stream(sock))
+
+def throughput(receiver: Callable[[socket], object], size: int) -> float:
+    """
+    Time receiving a message of given size over a local socket pair
+
+    Args:
+        receiver (Callable[[socket], object]): Receive function to benchmark
+        size (int): Message size (bytes)
+
+    Returns:
+        float: Throughput (MB/s)
+    """
+    data = bytes(size)
+    sender_socket, receiver_socket = socketpair()
+
+    with sender_socket, receiver_socket:
+        sender = Thread(target = send, args = (sender_socket, data))
+        start = perf_counter()
+        sender.start()
+        receiver(receiver_socket)
+        end = perf_counter()
+        sender.join()
+
+    return size / 1000000 / (end - start)
+
+def benchmark(sizes: list[int] = SIZES) -> None:
+    """
+    Print throughput of original, preallocated, and streaming receive for each size
+
+    Args:
+        sizes (list[int], optional): Message sizes (bytes); defaults to SIZES
+    """
+    for size in sizes:
+        for name, receiver in (("legacy_receive", legacy_receive), ("receive", receive), ("receive_stream", stream_receive)):
+            if receiver is legacy_receive and size > LEGACY_MAX_SIZE:
+                print(f"{name:>15} | {size / 1000000:>7} MB | skipped")
+                continue
+
+            print(f"{name:>15} | {size / 1000000:>7} MB | {round(throughput(receiver, size), SIG_FIGS)} MB/s")
+
+if __name__ == "__main__":
+    # Optionally pass sizes (bytes) on the command line, e.g. python -m project.test.benchmark_receive 1000000 100000000
+    benchmark([int(size) for size in argv[1:]] or SIZES)
@@ -0,0 +1,148 @@
+# This file is used to measure the crossovers (i.e. project.src.client.StrassenPlanner.STRASSEN_CROSSOVERS) from which each Strassen-Winograd level
+# beats one level fewer for integer matrices, and to record them where StrassenPlanner reads them from
+from datetime import datetime
+from json import dump
+from os import cpu_count, makedirs, path
+from platform import machine, processor
+from sys import argv
+from time import perf_counter
+from numpy import array_equal, int32, random
+from psutil import virtual_memory
+from project.src.client.StrassenPlanner import StrassenAssembler, strassen_operands
+from project.src.IntegerMultiply import integer_dot
+from project.src.Shared import SIG_FIGS, STRASSEN_CALIBRATION_PATH
+
+SIZES = [ 128, 256, 512, 1024, 2048, 4096, 8192, 16384 ]
+"""Matrix sizes (i.e. length and width of Matrix A and Matrix B) to benchmark (i.e. past twice the largest expected crossover, so level 2 is measured too)"""
+
+LEVELS = 2
+"""Number of Strassen-Winograd levels timed per size"""
+
+BOUND = 8
+"""Elements are drawn from [-BOUND, BOUND) (i.e. small enough that every product, and every sum of 2 levels, is exact in int32)"""
+
+BYTES_PER_ELEMENT = 44
+"""Peak memory (bytes) per element of Matrix A while benchmarking it (i.e. operands, float64 copies, products and sums; ~2.9 GB measured at 8192 x 8192)"""
+
+REPEATS = 3
+"""Number of times each multiplication is timed (fastest is kept)"""
+
+def strassen_dot(matrix_a, matrix_b, depth: int):
+    """
+    Multiply matrices with depth Strassen-Winograd levels, computing each product with integer_dot (i.e. as a server would)
+
+    Args:
+        matrix_a (ndarray): Matrix A
+        matrix_b (ndarray): Matrix B
+        depth (int): Number of levels
+
+    Returns:
+        ndarray: Product of Matrix A and Matrix B
+    """
+    result = StrassenAssembler(matrix_a.shape[0], matrix_b.shape[1], depth)
+    for i, (sub_a, sub_b) in enumerate(strassen_operands(matrix_a, matrix_b, depth)): result.add(i, integer_dot(sub_a, sub_b))
+
+    return result.matrix
+
+def best_time(multiply, *args) -> tuple[float, object]:
+    """
+    Fastest of REPEATS timings of a multiplication
+
+    Args:
+        multiply (Callable): Multiplication to time
+        *args: Its arguments
+
+    Returns:
+        tuple[float, object]: Time (seconds) and product
+    """
+    times = [ ]
+
+    for _ in range(REPEATS):
+        # Release the previous product first, so only one is held at a time
+        product = None
+
+        start = perf_counter()
+        product = multiply(*args)
+        times.append(perf_counter() - start)
+
+    return min(times), product
+
+def crossovers(results: list[dict]) -> list[int | None]:
+    """
+    Smallest size from which each level beats one level fewer at every larger size measured (None if it doesn't win at the largest size measured)
+
+    Args:
+        results (list[dict]): Timings of each size measured, smallest first
+
+    Returns:
+        list[int | None]: Crossover of each level
+    """
+    found = [ ]
+
+    for level in range(1, LEVELS + 1):
+        crossover = None
+
+        for result in reversed(results):
+            if result["seconds"][level] >= result["seconds"][level - 1]: break
+            crossover = result["size"]
+
+        found.append(crossover)
+
+    return found
+
+def benchmark(sizes: list[int] = SIZES) -> list[dict]:
+    """
+    Print time taken by a classical product and by each number of Strassen-Winograd levels for each size (skipping sizes that don't fit in memory)
+
+    Args:
+        sizes (list[int], optional): Matrix sizes; defaults to SIZES
+
+    Returns:
+        list[dict]: Size and time (seconds) of 0, 1, ... LEVELS levels, for each size measured
+    """
+    generator, results = random.default_rng(0), [ ]
+
+    for size in sorted(sizes):
+        needed, available = BYTES_PER_ELEMENT * size * size, virtual_memory().available
+        if needed > available:
+            print(f"{size:>5} x {size:<5} | skipped (needs ~{round(needed / 2 ** 30, 1)} GB, {round(available / 2 ** 30, 1)} GB available)")
+            continue
+
+        matrix_a, matrix_b = (generator.integers(-BOUND, BOUND, (size, size)).astype(int32) for _ in range(2))
+        classical_time, expected = best_time(integer_dot, matrix_a, matrix_b)
+        line, seconds = f"{size:>5} x {size:<5} | classical {round(classical_time, SIG_FIGS):>8} seconds", [ classical_time ]
+
+        for depth in range(1, LEVELS + 1):
+            strassen_time, product = best_time(strassen_dot, matrix_a, matrix_b, depth)
+            line += f" | {depth} level(s) {round(strassen_time, SIG_FIGS):>8} seconds ({round(classical_time / strassen_time, 2)}x, exact: {array_equal(product, expected)})"
+            seconds.append(strassen_time)
+
+        print(line)
+        results.append({ "size": size, "seconds": [round(time, SIG_FIGS) for time in seconds] })
+
+    return results
+
+def record(results: list[dict], filepath: str = STRASSEN_CALIBRATION_PATH) -> list[int | None]:
+    """
+    Write crossovers and the run they come from to filepath, for StrassenPlanner to read
+
+    Args:
+        results (list[dict]): Timings of each size measured
+        filepath (str, optional): Calibration file path; defaults to STRASSEN_CALIBRATION_PATH
+
+    Returns:
+        list[int | None]: Crossover of each level
+    """
+    found = crossovers(results)
+    makedirs(path.dirname(filepath), exist_ok = True)
+
+    with open(filepath, "w") as file:
+        dump({ "crossovers": found, "date": datetime.now().isoformat(timespec = "seconds"),
+               "machine": { "cores": cpu_count(), "memory_gb": round(virtual_memory().total / 2 ** 30, 1), "architecture": machine(), "processor": processor() },
+               "dtype": "int32", "bound": BOUND, "repeats": REPEATS, "results": results }, file, indent = 4)
+
+    return found
+
+if __name__ == "__main__":
+    # Optionally pass sizes on the command line, e.g. python -m project.test.benchmark_strassen 512 1024 2048
+    print(f"Crossovers: {record(benchmark([int(size) for size in argv[1:]] or SIZES))} (recorded in {STRASSEN_CALIBRATION_PATH})")
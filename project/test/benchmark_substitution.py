@@ -0,0 +1,78 @@
+# This file is used to benchmark project.src.server.SubstitutionServer.multiply_matrices against the original (i.e. sympy.Matrix.multiply) implementation
+from sys import argv
+from time import perf_counter
+from collections.abc import Callable
+from numpy import random, empty, nonzero
+from sympy import Matrix
+from project.src.server.SubstitutionServer import multiply_matrices
+from project.src.client.SubstitutionClient import X
+from project.src.Shared import SIG_FIGS
+
+SIZES = [ 20, 40, 80 ]
+"""Matrix A sizes (i.e. length and width) to benchmark"""
+
+DENSITIES = [ 0.1, 0.5, 0.9 ]
+"""Proportions of Matrix A's elements replaced with variables to benchmark"""
+
+WIDTH = 4
+"""Width of Matrix B"""
+
+SEED = 0
+"""Seed of random matrices, so every run benchmarks the same matrices"""
+
+def redacted_matrices(size: int, density: float) -> tuple[Matrix, Matrix]:
+    """
+    Build redacted Matrix A (i.e. integers, some replaced with distinct variables, as SubstitutionClient sends it) and integer Matrix B
+
+    Args:
+        size (int): Length and width of Matrix A
+        density (float): Proportion of Matrix A's elements replaced with variables
+
+    Returns:
+        tuple[Matrix, Matrix]: Matrix A and Matrix B
+    """
+    generator = random.default_rng(SEED)
+    elements = empty((size, size), dtype = object)
+    elements[:] = generator.integers(-100, 100, (size, size)).tolist()
+
+    for variable, (row, column) in enumerate(zip(*nonzero(generator.random((size, size)) < density))): elements[row, column] = X[variable]
+
+    return Matrix(elements), Matrix(generator.integers(-100, 100, (size, WIDTH)))
+
+def multiply_time(multiply: Callable[[Matrix, Matrix], Matrix], matrix_a: Matrix, matrix_b: Matrix) -> tuple[float, Matrix]:
+    """
+    Time multiplying 2 matrices
+
+    Args:
+        multiply (Callable[[Matrix, Matrix], Matrix]): Multiplication to benchmark
+        matrix_a (Matrix): Matrix A
+        matrix_b (Matrix): Matrix B
+
+    Returns:
+        tuple[float, Matrix]: Time (seconds) and product
+    """
+    start = perf_counter()
+    product = multiply(matrix_a, matrix_b)
+
+    return perf_counter() - start, product
+
+def benchmark(sizes: list[int] = SIZES, densities: list[float] = DENSITIES) -> None:
+    """
+    Print time taken by original and linear store multiplication for each size and density, and whether their products are identical
+
+    Args:
+        sizes (list[int], optional): Matrix A sizes; defaults to SIZES
+        densities (list[float], optional): Proportions of Matrix A's elements replaced with variables; defaults to DENSITIES
+    """
+    for size in sizes:
+        for density in densities:
+            matrix_a, matrix_b = redacted_matrices(size, density)
+            legacy_time, legacy_product = multiply_time(Matrix.multiply, matrix_a, matrix_b)
+            linear_time, linear_product = multiply_time(multiply_matrices, matrix_a, matrix_b)
+
+            print(f"{size:>4} x {size:<4} | density {density:<4} | legacy {round(legacy_time, SIG_FIGS):>8} seconds | "
+                  f"linear {round(linear_time, SIG_FIGS):>8} seconds | {round(legacy_time / linear_time, 1):>6}x | identical: {legacy_product == linear_product}")
+
+if __name__ == "__main__":
+    # Optionally pass sizes on the command line, e.g. python -m project.test.benchmark_substitution 20 40 80
+    benchmark([int(size) for size in argv[1:]] or SIZES)
@@ -0,0 +1,4 @@
+from project.src.server.MaskingServer import MaskingServer
+
+if __name__ == "__main__":
+    MaskingServer()
\ No newline at end of file
@@ -0,0 +1,108 @@
+# This file is used to test project.src.client.ChainScheduler with a stand-in connection pool (i.e. no servers need to be running)
+from concurrent.futures import Future
+from threading import Thread
+from time import sleep
+from numpy import random, ndarray, array_equal
+from pytest import raises, MonkeyPatch
+import project.src.client.ChainClient as chain_client_module
+import project.src.client.ChainScheduler as chain_scheduler_module
+from project.src.client.ChainClient import ChainClient
+from project.src.client.PartitionPlanner import PartitionPlanner
+from project.src.IntegerMultiply import integer_dot
+from project.src.Shared import Address, Keep, Reference
+
+SERVER = Address("0.0.0.0", 1)
+"""Address of the (stand-in) server"""
+
+LOCAL_CUTOFF = 100000
+"""Number of multiply-adds below which a product is multiplied on client (i.e. (0, 1) below is distributed, (0, 2) isn't)"""
+
+TIMEOUT = 60
+"""Time (seconds) after which answer() is considered deadlocked"""
+
+LOCAL_DELAY = 0.2
+"""Time (seconds) client takes per row band, so the stand-in server (which answers straight away) runs some row bands of every distributed product"""
+
+class FakePool():
+    def __init__(self, failing: bool = False):
+        # Results kept on the stand-in server (i.e. Key = digest they're kept under)
+        self._kept: dict[bytes, ndarray] = { }
+
+        # Raise an unexpected error on every job, rather than multiplying it
+        self._failing = failing
+
+    def submit_cached(self, server_address: Address, matrix_a: tuple, matrix_b: ndarray, digest: bytes, keep: Keep | None = None) -> Future:
+        """
+        Multiply job straight away, keeping its result if asked to (as a server would)
+
+        Returns:
+            Future: Result, or keep request if result was kept
+        """
+        if self._failing: raise RuntimeError("Stand-in server failed")
+
+        left = self._kept[matrix_a[0].digest] if isinstance(matrix_a[0], Reference) else matrix_a[0]
+        product, future = integer_dot(left, matrix_b), Future()
+
+        if keep is not None: self._kept[keep.digest] = product
+        future.set_result([keep if keep is not None else product])
+
+        return future
+
+    def cancel(self, server_address: Address, future: Future) -> bool:
+        return False
+
+    def close(self) -> None:
+        pass
+
+def answer(matrices: list[ndarray], pool: FakePool, monkeypatch: MonkeyPatch) -> list:
+    """
+    Multiply chain with a single stand-in server, in a separate thread so a deadlock is reported as a failure (its scheduler threads still keep the interpreter from exiting)
+
+    Returns:
+        list: Product of chain, or exception raised by answer(); empty if answer() is still running after TIMEOUT seconds
+    """
+    monkeypatch.setattr(chain_client_module, "select_servers", lambda logger: { SERVER: (4, 16.0) })
+    client = ChainClient(matrices, planner = PartitionPlanner(local_cutoff = LOCAL_CUTOFF))
+    client._connection_pool = pool
+    outcome = [ ]
+
+    def run() -> None:
+        try: outcome.append(client.answer())
+        except Exception as exception: outcome.append(exception)
+
+    thread = Thread(target = run, daemon = True)
+    thread.start()
+    thread.join(TIMEOUT)
+
+    return outcome
+
+def mixed_chain() -> list[ndarray]:
+    """
+    Chain whose first product (0, 1) is distributed and is the left operand of a product (0, 2) multiplied on client
+
+    Returns:
+        list[ndarray]: Matrices
+    """
+    rng = random.default_rng(0)
+    return [rng.integers(-100, 100, shape) for shape in [(300, 300), (300, 10), (10, 30)]]
+
+def slow_dot(matrix_a: ndarray, matrix_b: ndarray) -> ndarray:
+    sleep(LOCAL_DELAY)
+    return integer_dot(matrix_a, matrix_b)
+
+def test_mixed_local_and_distributed_plans(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(chain_scheduler_module, "integer_dot", slow_dot)
+    matrices = mixed_chain()
+    outcome = answer(matrices, FakePool(), monkeypatch)
+
+    assert outcome, "Chain deadlocked"
+    assert array_equal(outcome[0], matrices[0] @ matrices[1] @ matrices[2])
+
+def test_failed_worker_stops_others(monkeypatch: MonkeyPatch) -> None:
+    # Server fails while running a row band, which client would otherwise wait for forever
+    monkeypatch.setattr(chain_scheduler_module, "integer_dot", slow_dot)
+    outcome = answer(mixed_chain(), FakePool(failing = True), monkeypatch)
+
+    assert outcome, "Chain deadlocked"
+
+    with raises(RuntimeError): raise outcome[0]
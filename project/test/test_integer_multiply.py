@@ -0,0 +1,56 @@
+# This file is used to test project.src.IntegerMultiply against exact (Python int) products
+from numpy import random, ndarray, array_equal, int16, int32, int64, uint32
+from pytest import mark
+from project.src.IntegerMultiply import integer_dot, modular_dot
+
+SHAPES = [(64, 512), (512, 64)]
+"""Shapes of Matrix A and Matrix B"""
+
+def matrices(bound: int, dtype: type = int64, signed: bool = True) -> tuple[ndarray, ndarray]:
+    """
+    Random Matrix A and Matrix B with elements below bound in magnitude
+
+    Returns:
+        tuple[ndarray, ndarray]: Matrix A and Matrix B
+    """
+    rng = random.default_rng(bound)
+    return tuple(rng.integers(-bound + 1 if signed else 0, bound, shape).astype(dtype) for shape in SHAPES)
+
+def exact(matrix_a: ndarray, matrix_b: ndarray) -> ndarray:
+    return matrix_a.astype(object) @ matrix_b.astype(object)
+
+@mark.filterwarnings("error")
+@mark.parametrize("bound", [1 << 10, 1 << 21])
+def test_single_pass(bound: int) -> None:
+    # 512 * (2 ** 21) ** 2 = 2 ** 51, so one float64 product is exact
+    matrix_a, matrix_b = matrices(bound)
+    assert array_equal(integer_dot(matrix_a, matrix_b), exact(matrix_a, matrix_b))
+
+@mark.filterwarnings("error")
+@mark.parametrize("bound", [1 << 25, 1 << 26])
+def test_bit_sliced(bound: int) -> None:
+    # Beyond 2 ** 53, but the exact result still fits in int64
+    matrix_a, matrix_b = matrices(bound)
+    assert array_equal(integer_dot(matrix_a, matrix_b), exact(matrix_a, matrix_b))
+
+@mark.filterwarnings("error")
+@mark.parametrize("dtype, signed, bound", [(int32, True, 1 << 10), (uint32, False, 1 << 10), (int16, True, 1 << 2)])
+def test_narrow_dtype(dtype: type, signed: bool, bound: int) -> None:
+    # Exact result fits in dtype, so it's returned in dtype
+    matrix_a, matrix_b = matrices(bound, dtype, signed)
+    product = integer_dot(matrix_a, matrix_b)
+
+    assert product.dtype == dtype
+    assert array_equal(product, exact(matrix_a, matrix_b))
+
+@mark.filterwarnings("error")
+@mark.parametrize("dtype, signed", [(int32, True), (uint32, False), (int16, True)])
+def test_narrow_dtype_overflow(dtype: type, signed: bool) -> None:
+    # Exact result doesn't fit in dtype, so it wraps around exactly as numpy.dot does (rather than casting an out-of-range float)
+    matrix_a, matrix_b = matrices(1 << 14, dtype, signed)
+    assert array_equal(integer_dot(matrix_a, matrix_b), matrix_a @ matrix_b)
+
+@mark.parametrize("bound, modulus", [(1 << 10, 2 ** 31 - 1), (1 << 62, 2 ** 31 - 1), (1 << 62, 3)])
+def test_modular_dot(bound: int, modulus: int) -> None:
+    matrix_a, matrix_b = matrices(bound)
+    assert array_equal(modular_dot(matrix_a, matrix_b, modulus), exact(matrix_a, matrix_b) % modulus)
@@ -0,0 +1,51 @@
+# This file is used to test project.src.server.LinearMatrix against sympy.Matrix.multiply
+from numpy import random, ndarray, array_equal
+from pytest import mark
+from sympy import IndexedBase, Matrix, Symbol
+from project.src.server.LinearMatrix import to_linear, to_integers, multiply_linear
+
+X = IndexedBase("x")
+"""Variables redacted elements are replaced with (as project.src.client.SubstitutionClient does)"""
+
+def redact(matrix: ndarray, density: float, seed: int, variable = lambda i: X[i]) -> Matrix:
+    """
+    Replace random elements of matrix with distinct variables, numbered in row-major order
+
+    Returns:
+        Matrix: Redacted matrix
+    """
+    mask, redacted, count = random.default_rng(seed).random(matrix.shape) < density, Matrix(matrix.tolist()), 0
+
+    for row, column in zip(*mask.nonzero()):
+        redacted[row, column] = variable(count)
+        count += 1
+
+    return redacted
+
+@mark.parametrize("seed, density", [(0, 0.1), (1, 0.5), (2, 1.0)])
+def test_multiply_linear_matches_sympy(seed: int, density: float) -> None:
+    # Small elements, so products have zero, unit and negative coefficients, and zero constants
+    rng = random.default_rng(seed)
+    matrix_a, matrix_b = rng.integers(-2, 3, (12, 9)), rng.integers(-2, 3, (9, 5))
+    redacted = redact(matrix_a, density, seed)
+
+    product = multiply_linear(to_linear(redacted), matrix_b)
+    expected = redacted.multiply(Matrix(matrix_b.tolist()))
+
+    assert product == expected
+    assert all(element.args == other.args for element, other in zip(product, expected))
+
+def test_multiply_linear_with_symbols() -> None:
+    rng = random.default_rng(3)
+    matrix_a, matrix_b = rng.integers(-9, 10, (6, 6)), rng.integers(-9, 10, (6, 3))
+    redacted = redact(matrix_a, 0.5, 3, lambda i: Symbol(f"y{i}"))
+
+    assert multiply_linear(to_linear(redacted), matrix_b) == redacted.multiply(Matrix(matrix_b.tolist()))
+
+def test_to_linear_rejects_non_linear_elements() -> None:
+    assert to_linear(Matrix([[X[0], 1], [X[0], 2]])) is None
+    assert to_linear(Matrix([[2 * X[0], 1], [X[1], 2]])) is None
+
+def test_to_integers() -> None:
+    assert array_equal(to_integers(Matrix([[1, -2], [3, 4]])), [[1, -2], [3, 4]])
+    assert to_integers(Matrix([[1, X[0]]])) is None